@@ -21,10 +21,10 @@ def upgrade() -> None:
     op.create_table('users',
         sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('phone_number', sa.String(length=15), nullable=False),
-        sa.Column('preferred_language', sa.Enum('HINDI', 'ENGLISH', 'TAMIL', 'TELUGU', 'BENGALI', 'MARATHI', 'GUJARATI', 'KANNADA', 'MALAYALAM', 'PUNJABI', name='languagecode'), nullable=False),
+        sa.Column('preferred_language', sa.String(length=32), nullable=False),
         sa.Column('location', sa.Text(), nullable=False),
-        sa.Column('tech_literacy_level', sa.Enum('BEGINNER', 'INTERMEDIATE', 'ADVANCED', name='techliteracylevel'), nullable=False),
-        sa.Column('verification_status', sa.Enum('UNVERIFIED', 'PHONE_VERIFIED', 'DOCUMENT_VERIFIED', 'FULLY_VERIFIED', name='verificationstatus'), nullable=False),
+        sa.Column('tech_literacy_level', sa.String(length=32), nullable=False),
+        sa.Column('verification_status', sa.String(length=32), nullable=False),
         sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
         sa.Column('last_active', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
         sa.Column('user_type', sa.String(length=20), nullable=False),
@@ -36,10 +36,10 @@ def upgrade() -> None:
     op.create_table('vendors',
         sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('business_name', sa.String(length=255), nullable=False),
-        sa.Column('business_type', sa.Enum('INDIVIDUAL_TRADER', 'SMALL_BUSINESS', 'COOPERATIVE', 'WHOLESALER', 'RETAILER', 'FARMER', 'MANUFACTURER', name='businesstype'), nullable=False),
+        sa.Column('business_type', sa.String(length=32), nullable=False),
         sa.Column('rating', sa.Numeric(precision=3, scale=2), nullable=False),
         sa.Column('total_transactions', sa.Integer(), nullable=False),
-        sa.Column('market_reputation', sa.Enum('NEW', 'DEVELOPING', 'ESTABLISHED', 'TRUSTED', 'PREMIUM', name='marketreputation'), nullable=False),
+        sa.Column('market_reputation', sa.String(length=32), nullable=False),
         sa.Column('is_verified_business', sa.Boolean(), nullable=False),
         sa.Column('business_registration_number', sa.String(length=50), nullable=True),
         sa.Column('specializations', sa.JSON(), nullable=False),
@@ -53,10 +53,3 @@ def downgrade() -> None:
     op.drop_table('vendors')
     op.drop_index(op.f('ix_users_phone_number'), table_name='users')
     op.drop_table('users')
-    
-    # Drop enums
-    op.execute('DROP TYPE IF EXISTS languagecode')
-    op.execute('DROP TYPE IF EXISTS techliteracylevel')
-    op.execute('DROP TYPE IF EXISTS verificationstatus')
-    op.execute('DROP TYPE IF EXISTS businesstype')
-    op.execute('DROP TYPE IF EXISTS marketreputation')
\ No newline at end of file
@@ -5,6 +5,8 @@ Revises: 002_add_user_models
 Create Date: 2026-01-26 12:00:00.000000
 
 """
+from datetime import date
+
 from alembic import op
 import sqlalchemy as sa
 from sqlalchemy.dialects import postgresql
@@ -15,12 +17,21 @@ down_revision = '002_add_user_models'
 branch_labels = None
 depends_on = None
 
+# price_history is range-partitioned by month on recorded_at. Partitions start
+# at the month the migration runs in; mandi_platform.partitions creates later
+# months while the application runs.
+PRICE_HISTORY_INITIAL_PARTITIONS = 12
+
 
 def upgrade() -> None:
+    # Trigram matching backs fuzzy product search for scripts without a
+    # text search stemmer
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    
     # Create product_categories table
     op.create_table('product_categories',
         sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
-        sa.Column('category_enum', sa.Enum('GRAINS', 'VEGETABLES', 'FRUITS', 'SPICES', 'DAIRY', 'MEAT', 'SEAFOOD', 'PULSES', 'OILS', 'TEXTILES', 'HANDICRAFTS', 'ELECTRONICS', 'TOOLS', 'HOUSEHOLD', 'OTHER', name='productcategory'), nullable=False),
+        sa.Column('category_enum', sa.String(length=32), nullable=False),
         sa.Column('names', sa.JSON(), nullable=False),
         sa.Column('descriptions', sa.JSON(), nullable=False),
         sa.Column('parent_id', postgresql.UUID(as_uuid=True), nullable=True),
@@ -39,30 +50,55 @@ def upgrade() -> None:
         sa.Column('vendor_id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('category_id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('sku', sa.String(length=100), nullable=True),
-        sa.Column('names', sa.JSON(), nullable=False),
+        sa.Column('names', postgresql.JSONB(), nullable=False),
         sa.Column('descriptions', sa.JSON(), nullable=False),
         sa.Column('base_price', sa.Numeric(precision=10, scale=2), nullable=False),
         sa.Column('currency', sa.String(length=3), nullable=False),
-        sa.Column('unit', sa.Enum('KILOGRAM', 'GRAM', 'QUINTAL', 'TON', 'LITER', 'MILLILITER', 'PIECE', 'DOZEN', 'BUNDLE', 'BAG', 'BOX', 'MAUND', 'SER', 'TOLA', 'BIGHA', 'ACRE', name='measurementunit'), nullable=False),
+        sa.Column('unit', sa.String(length=32), nullable=False),
         sa.Column('minimum_order_quantity', sa.Numeric(precision=10, scale=2), nullable=False),
         sa.Column('maximum_order_quantity', sa.Numeric(precision=10, scale=2), nullable=True),
-        sa.Column('quality_grade', sa.Enum('PREMIUM', 'STANDARD', 'ECONOMY', 'ORGANIC', 'FAIR_TRADE', name='qualitygrade'), nullable=False),
-        sa.Column('condition', sa.Enum('NEW', 'LIKE_NEW', 'GOOD', 'FAIR', 'REFURBISHED', name='productcondition'), nullable=False),
-        sa.Column('availability_status', sa.Enum('AVAILABLE', 'LIMITED_STOCK', 'OUT_OF_STOCK', 'SEASONAL', 'DISCONTINUED', 'PRE_ORDER', name='availabilitystatus'), nullable=False),
+        sa.Column('quality_grade', sa.String(length=32), nullable=False),
+        sa.Column('condition', sa.String(length=32), nullable=False),
+        sa.Column('availability_status', sa.String(length=32), nullable=False),
         sa.Column('stock_quantity', sa.Numeric(precision=10, scale=2), nullable=True),
-        sa.Column('seasonal_pattern', sa.Enum('YEAR_ROUND', 'SUMMER', 'MONSOON', 'WINTER', 'SPRING', 'HARVEST_SEASON', 'FESTIVAL_SEASON', name='seasonalpattern'), nullable=False),
-        sa.Column('location', sa.JSON(), nullable=False),
+        sa.Column('seasonal_pattern', sa.String(length=32), nullable=False),
+        sa.Column('location', postgresql.JSONB(), nullable=False),
         sa.Column('images', sa.JSON(), nullable=False),
         sa.Column('videos', sa.JSON(), nullable=False),
         sa.Column('attributes', sa.JSON(), nullable=False),
-        sa.Column('search_keywords', sa.JSON(), nullable=False),
-        sa.Column('tags', sa.JSON(), nullable=False),
-        sa.Column('is_active', sa.Boolean(), nullable=False),
-        sa.Column('is_featured', sa.Boolean(), nullable=False),
+        sa.Column('search_keywords', postgresql.JSONB(), nullable=False),
+        sa.Column('tags', postgresql.JSONB(), nullable=False),
+        # Bit 1 = active, bit 2 = featured (see models.product.PRODUCT_FLAG_*)
+        sa.Column('flags', sa.SmallInteger(), server_default='0', nullable=False),
         sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
         sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
         sa.Column('elasticsearch_synced_at', sa.DateTime(timezone=True), nullable=True),
         sa.Column('elasticsearch_sync_version', sa.Integer(), nullable=False),
+        sa.Column(
+            'search_tsv',
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('simple', "
+                "jsonb_path_query_array(names, '$.*')::text), 'A') || "
+                "setweight(to_tsvector('simple', "
+                "jsonb_path_query_array(search_keywords, '$.*')::text), 'B')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+        # English is the only supported language PostgreSQL ships a stemmer
+        # for; the others are searched through the 'simple' column above.
+        sa.Column(
+            'search_tsv_en',
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('english', coalesce(names->>'en', '')), 'A') || "
+                "setweight(to_tsvector('english', "
+                "jsonb_path_query_array(search_keywords, '$.*')::text), 'B')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
         sa.ForeignKeyConstraint(['category_id'], ['product_categories.id'], ),
         sa.ForeignKeyConstraint(['vendor_id'], ['vendors.id'], ),
         sa.PrimaryKeyConstraint('id'),
@@ -75,54 +111,141 @@ def upgrade() -> None:
         sa.Column('product_id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('price', sa.Numeric(precision=10, scale=2), nullable=False),
         sa.Column('currency', sa.String(length=3), nullable=False),
-        sa.Column('quality_grade', sa.Enum('PREMIUM', 'STANDARD', 'ECONOMY', 'ORGANIC', 'FAIR_TRADE', name='qualitygrade'), nullable=False),
+        sa.Column('quality_grade', sa.String(length=32), nullable=False),
         sa.Column('location', sa.JSON(), nullable=False),
-        sa.Column('source', sa.Enum('VENDOR_LISTED', 'MARKET_API', 'GOVERNMENT_DATA', 'HISTORICAL_AVERAGE', 'ML_PREDICTION', name='pricesource'), nullable=False),
-        sa.Column('market_conditions', sa.Enum('NORMAL', 'HIGH_DEMAND', 'LOW_DEMAND', 'SUPPLY_SHORTAGE', 'OVERSUPPLY', 'SEASONAL_PEAK', 'FESTIVAL_RUSH', name='marketconditions'), nullable=False),
+        sa.Column('source', sa.String(length=32), nullable=False),
+        sa.Column('market_conditions', sa.String(length=32), nullable=False),
         sa.Column('quantity_range', sa.String(length=50), nullable=True),
         sa.Column('notes', sa.Text(), nullable=True),
         sa.Column('recorded_at', sa.DateTime(timezone=True), nullable=False),
         sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
         sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
-        sa.PrimaryKeyConstraint('id')
+        # The partition key must be part of the primary key
+        sa.PrimaryKeyConstraint('id', 'recorded_at'),
+        postgresql_partition_by='RANGE (recorded_at)',
     )
 
-    # Create indexes
-    op.create_index('idx_product_vendor_category', 'products', ['vendor_id', 'category_id'])
-    op.create_index('idx_product_availability', 'products', ['availability_status', 'is_active'])
-    op.create_index('idx_product_price_range', 'products', ['base_price', 'quality_grade'])
-    op.create_index('idx_product_location', 'products', ['location'], postgresql_using='gin')
-    op.create_index('idx_product_search', 'products', ['search_keywords'], postgresql_using='gin')
-    op.create_index(op.f('ix_products_sku'), 'products', ['sku'])
-    
-    op.create_index('idx_price_history_product_date', 'price_history', ['product_id', 'recorded_at'])
-    op.create_index('idx_price_history_location_date', 'price_history', ['location', 'recorded_at'], postgresql_using='gin')
+    # Monthly partitions, plus a default partition for rows outside them
+    # (older backfilled prices, or a month maintenance has not reached)
+    today = date.today()
+    year, month = today.year, today.month
+    for _ in range(PRICE_HISTORY_INITIAL_PARTITIONS):
+        next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+        op.execute(
+            f"CREATE TABLE price_history_{year:04d}_{month:02d} PARTITION OF price_history "
+            f"FOR VALUES FROM ('{year:04d}-{month:02d}-01') TO ('{next_year:04d}-{next_month:02d}-01')"
+        )
+        year, month = next_year, next_month
+    op.execute("CREATE TABLE price_history_default PARTITION OF price_history DEFAULT")
+
+    # Indexes on a partitioned table cannot be built CONCURRENTLY; the table
+    # is empty here, so build them directly. BRIN on recorded_at stays tiny
+    # for append-mostly time series, and partition pruning handles most of
+    # the time filtering; product lookups use a plain B-tree on product_id.
+    op.create_index(
+        'idx_price_history_recorded_at', 'price_history', ['recorded_at'],
+        postgresql_using='brin',
+        postgresql_with={'pages_per_range': 32},
+    )
+    op.create_index('idx_price_history_product', 'price_history', ['product_id'])
     op.create_index('idx_price_history_source', 'price_history', ['source', 'recorded_at'])
 
+    # Create products indexes. CONCURRENTLY builds each index without holding a lock
+    # that blocks writes on populated tables; it cannot run inside a
+    # transaction, hence the autocommit block.
+    with op.get_context().autocommit_block():
+        # Covers every vendor_id lookup and lets a vendor page through all of
+        # their listings, inactive ones included, by keyset.
+        op.create_index(
+            'idx_products_vendor_created', 'products',
+            ['vendor_id', sa.text('created_at DESC'), sa.text('id DESC')],
+            postgresql_concurrently=True,
+        )
+        # Partial indexes limited to live listings, which is what the browse
+        # and vendor pages query; inactive or unavailable rows are left out.
+        op.create_index(
+            'idx_products_live', 'products', ['category_id', 'base_price'],
+            postgresql_where=sa.text("(flags & 1) = 1 AND availability_status = 'AVAILABLE'"),
+            postgresql_concurrently=True,
+        )
+        # (created_at, id) trails the filter column so keyset pagination on
+        # the vendor and category listings is a single index range scan.
+        op.create_index(
+            'idx_products_vendor_live', 'products',
+            ['vendor_id', sa.text('created_at DESC'), sa.text('id DESC')],
+            postgresql_where=sa.text('(flags & 1) = 1'),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'idx_products_active_category', 'products',
+            ['category_id', sa.text('created_at DESC'), sa.text('id DESC')],
+            postgresql_where=sa.text('(flags & 1) = 1'),
+            postgresql_concurrently=True,
+        )
+        # Featured rows are a small slice of the table; the predicate matches
+        # the is_active / is_featured hybrid expressions used by
+        # ProductCRUD.get_featured_products so the planner can use it.
+        op.create_index(
+            'idx_products_featured', 'products',
+            ['category_id', sa.text('created_at DESC')],
+            postgresql_where=sa.text('(flags & 1) = 1 AND (flags & 2) = 2'),
+            postgresql_concurrently=True,
+        )
+        # Low-stock listings are also a small slice. The predicate matches
+        # the literal bound ProductCRUD adds for thresholds up to 10, and
+        # (vendor_id, stock_quantity) is the order the per-vendor low-stock
+        # query reads in.
+        op.create_index(
+            'idx_products_low_stock', 'products',
+            ['vendor_id', 'stock_quantity'],
+            postgresql_where=sa.text('(flags & 1) = 1 AND stock_quantity > 0 AND stock_quantity <= 10'),
+            postgresql_concurrently=True,
+        )
+        # One multicolumn GIN index covers the JSONB filter columns, so a row
+        # write touches a single GIN index. jsonb_path_ops only supports @>
+        # containment, which is all these filters use, and is much smaller
+        # than the default jsonb_ops.
+        op.create_index(
+            'idx_product_jsonb', 'products', ['location', 'tags'],
+            postgresql_using='gin',
+            postgresql_ops={
+                'location': 'jsonb_path_ops',
+                'tags': 'jsonb_path_ops',
+            },
+            postgresql_concurrently=True,
+        )
+        # Keyword lookups go through the generated search_tsv column instead
+        # of JSONB containment on search_keywords.
+        op.create_index('idx_products_fts', 'products', ['search_tsv'], postgresql_using='gin', postgresql_concurrently=True)
+        op.create_index('idx_products_fts_en', 'products', ['search_tsv_en'], postgresql_using='gin', postgresql_concurrently=True)
+        # Fuzzy fallback when the tsvector match finds nothing; the expression
+        # must match _PRODUCT_NAMES_TEXT in crud/product.py.
+        op.execute(
+            "CREATE INDEX CONCURRENTLY idx_products_names_trgm ON products "
+            "USING gin ((jsonb_path_query_array(names, '$.*')::text) gin_trgm_ops)"
+        )
+        op.create_index(op.f('ix_products_sku'), 'products', ['sku'], postgresql_concurrently=True)
+
 
 def downgrade() -> None:
     # Drop indexes
     op.drop_index('idx_price_history_source', table_name='price_history')
-    op.drop_index('idx_price_history_location_date', table_name='price_history')
-    op.drop_index('idx_price_history_product_date', table_name='price_history')
+    op.drop_index('idx_price_history_product', table_name='price_history')
+    op.drop_index('idx_price_history_recorded_at', table_name='price_history')
     
     op.drop_index(op.f('ix_products_sku'), table_name='products')
-    op.drop_index('idx_product_search', table_name='products')
-    op.drop_index('idx_product_location', table_name='products')
-    op.drop_index('idx_product_price_range', table_name='products')
-    op.drop_index('idx_product_availability', table_name='products')
-    op.drop_index('idx_product_vendor_category', table_name='products')
+    op.drop_index('idx_products_names_trgm', table_name='products')
+    op.drop_index('idx_products_fts_en', table_name='products')
+    op.drop_index('idx_products_fts', table_name='products')
+    op.drop_index('idx_product_jsonb', table_name='products')
+    op.drop_index('idx_products_low_stock', table_name='products')
+    op.drop_index('idx_products_featured', table_name='products')
+    op.drop_index('idx_products_active_category', table_name='products')
+    op.drop_index('idx_products_vendor_live', table_name='products')
+    op.drop_index('idx_products_live', table_name='products')
+    op.drop_index('idx_products_vendor_created', table_name='products')
 
     # Drop tables
     op.drop_table('price_history')
     op.drop_table('products')
     op.drop_table('product_categories')
-
-    # Drop enums
-    op.execute('DROP TYPE IF EXISTS marketconditions')
-    op.execute('DROP TYPE IF EXISTS pricesource')
-    op.execute('DROP TYPE IF EXISTS seasonalpattern')
-    op.execute('DROP TYPE IF EXISTS availabilitystatus')
-    op.execute('DROP TYPE IF EXISTS productcondition')
-    op.execute('DROP TYPE IF EXISTS measurementunit')
-    op.execute('DROP TYPE IF EXISTS productcategory')
\ No newline at end of file
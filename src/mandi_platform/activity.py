@@ -0,0 +1,104 @@
+"""
+User activity tracking.
+
+Login and other activity signals are recorded in Redis instead of writing
+``users.last_active`` on every request. A background task periodically
+flushes the recorded timestamps to PostgreSQL in batched UPDATEs.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Dict
+from uuid import UUID
+
+import structlog
+
+from .config import settings
+from .crud.user import user_crud
+from .database import get_database_manager
+from .redis_client import get_redis_manager
+
+logger = structlog.get_logger(__name__)
+
+LAST_ACTIVE_KEY_PREFIX = "last_active:"
+LAST_ACTIVE_KEY_TTL = 3600
+
+# Users per UPDATE; each costs about three bind parameters, well within the
+# driver's 32767 limit
+LAST_ACTIVE_FLUSH_BATCH_SIZE = 1000
+
+
+async def record_last_active(user_id: UUID) -> bool:
+    """
+    Record that a user was just active.
+    
+    Returns False if Redis is unavailable so the caller can fall back to
+    writing the database directly.
+    """
+    try:
+        redis_manager = get_redis_manager()
+        await redis_manager.set(
+            f"{LAST_ACTIVE_KEY_PREFIX}{user_id}",
+            str(time.time()),
+            ttl=LAST_ACTIVE_KEY_TTL,
+        )
+        return True
+    except Exception as e:
+        logger.warning("Failed to record last_active", user_id=user_id, error=str(e))
+        return False
+
+
+async def flush_last_active() -> int:
+    """
+    Move recorded last_active timestamps from Redis into the users table.
+    
+    Entries are flushed in batches. A batch's Redis keys are deleted only
+    after its UPDATE commits, and only if no newer activity overwrote them
+    meanwhile. If a batch fails, its entries and all later ones stay in
+    Redis for the next flush.
+    
+    Returns:
+        Number of user rows updated
+    """
+    redis_manager = get_redis_manager()
+    client = await redis_manager.connect()
+    
+    keys = [key async for key in client.scan_iter(match=f"{LAST_ACTIVE_KEY_PREFIX}*", count=500)]
+    if not keys:
+        return 0
+    
+    updated = 0
+    async with get_database_manager().async_session() as db:
+        for start in range(0, len(keys), LAST_ACTIVE_FLUSH_BATCH_SIZE):
+            batch_keys = keys[start:start + LAST_ACTIVE_FLUSH_BATCH_SIZE]
+            values = await client.mget(batch_keys)
+            entries = {key: value for key, value in zip(batch_keys, values) if value is not None}
+            
+            timestamps: Dict[UUID, datetime] = {}
+            for key, value in entries.items():
+                try:
+                    user_id = UUID(key[len(LAST_ACTIVE_KEY_PREFIX):])
+                    timestamps[user_id] = datetime.fromtimestamp(float(value), tz=timezone.utc)
+                except ValueError:
+                    logger.warning("Skipping malformed last_active entry", key=key)
+            
+            updated += await user_crud.bulk_update_last_active(db, timestamps)
+            # Malformed entries are dropped along with the flushed ones
+            await redis_manager.delete_if_unchanged(entries)
+    
+    return updated
+
+
+async def last_active_flush_loop(interval: int | None = None):
+    """Flush last_active timestamps every ``interval`` seconds until cancelled."""
+    interval = interval or settings.last_active_flush_interval
+    
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            updated = await flush_last_active()
+            if updated:
+                logger.debug("Flushed last_active timestamps", users=updated)
+        except Exception as e:
+            logger.error("last_active flush failed", error=str(e))
@@ -10,9 +10,11 @@ from typing import Dict, Any
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status, Response
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 import structlog
 
+from ..activity import record_last_active
 from ..database import get_db_session
 from ..models.user import User, Vendor
 from ..models.enums import LanguageCode, TechLiteracyLevel, VerificationStatus, BusinessType
@@ -31,7 +33,28 @@ from ..config import settings
 
 logger = structlog.get_logger(__name__)
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Token lifetime is fixed by configuration, so compute it once
+_EXPIRES_IN = get_token_expires_in()
+
+
+def _build_login_response(user: User, access_token: str) -> LoginResponse:
+    """
+    Build a LoginResponse from a freshly loaded user.
+    
+    All fields come from the database and our own token, so validation is
+    skipped with model_construct.
+    """
+    return LoginResponse.model_construct(
+        access_token=access_token,
+        token_type="bearer",
+        expires_in=_EXPIRES_IN,
+        user_id=user.id,
+        user_type=user.user_type,
+        phone_number=user.phone_number,
+        preferred_language=user.preferred_language.value,
+    )
 
 
 @router.post("/login", response_model=LoginResponse)
@@ -78,25 +101,19 @@ async def login(
     token_data = create_user_token(user)
     access_token = create_access_token(token_data)
     
-    # Update last active timestamp
-    await user_crud.update_last_active(db, user.id)
+    # Record activity in Redis; a background task batches it into the
+    # database. Fall back to a direct write if Redis is unavailable.
+    if not await record_last_active(user.id):
+        await user_crud.update_last_active(db, user.id)
     
     logger.info(
         "Login successful",
-        user_id=str(user.id),
-        user_type=user.user_type,
-        phone_number=user.phone_number,
-    )
-    
-    return LoginResponse(
-        access_token=access_token,
-        token_type="bearer",
-        expires_in=get_token_expires_in(),
         user_id=user.id,
         user_type=user.user_type,
         phone_number=user.phone_number,
-        preferred_language=user.preferred_language.value,
     )
+    
+    return _build_login_response(user, access_token)
 
 
 @router.post("/register", response_model=LoginResponse)
@@ -122,18 +139,6 @@ async def register_user(
         phone_number=registration_request.phone_number,
     )
     
-    # Check if user already exists
-    existing_user = await user_crud.get_by_phone(db, registration_request.phone_number)
-    if existing_user:
-        logger.warning(
-            "Registration failed - user already exists",
-            phone_number=registration_request.phone_number,
-        )
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="User with this phone number already exists. Please login instead.",
-        )
-    
     # Create new user
     user_data = {
         "phone_number": registration_request.phone_number,
@@ -144,7 +149,18 @@ async def register_user(
         "user_type": "user",
     }
     
-    user = await user_crud.create(db, user_data)
+    # A single INSERT ... ON CONFLICT both creates the user and detects an
+    # existing registration
+    user = await user_crud.create_if_not_exists(db, user_data)
+    if user is None:
+        logger.warning(
+            "Registration failed - user already exists",
+            phone_number=registration_request.phone_number,
+        )
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="User with this phone number already exists. Please login instead.",
+        )
     
     # Create JWT token
     token_data = create_user_token(user)
@@ -152,19 +168,11 @@ async def register_user(
     
     logger.info(
         "User registration successful",
-        user_id=str(user.id),
-        phone_number=user.phone_number,
-    )
-    
-    return LoginResponse(
-        access_token=access_token,
-        token_type="bearer",
-        expires_in=get_token_expires_in(),
         user_id=user.id,
-        user_type=user.user_type,
         phone_number=user.phone_number,
-        preferred_language=user.preferred_language.value,
     )
+    
+    return _build_login_response(user, access_token)
 
 
 @router.post("/register-vendor", response_model=LoginResponse)
@@ -191,18 +199,6 @@ async def register_vendor(
         business_name=registration_request.business_name,
     )
     
-    # Check if user already exists
-    existing_user = await user_crud.get_by_phone(db, registration_request.phone_number)
-    if existing_user:
-        logger.warning(
-            "Vendor registration failed - user already exists",
-            phone_number=registration_request.phone_number,
-        )
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="User with this phone number already exists. Please login instead.",
-        )
-    
     # Check if business name is already taken
     existing_vendor = await vendor_crud.get_by_business_name(db, registration_request.business_name)
     if existing_vendor:
@@ -227,7 +223,18 @@ async def register_vendor(
         "business_type": BusinessType(registration_request.business_type),
     }
     
-    vendor = await vendor_crud.create(db, vendor_data)
+    # The users and vendors rows are inserted by one statement that skips
+    # both when the phone number is already registered
+    vendor = await vendor_crud.create_if_not_exists(db, vendor_data)
+    if vendor is None:
+        logger.warning(
+            "Vendor registration failed - user already exists",
+            phone_number=registration_request.phone_number,
+        )
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="User with this phone number already exists. Please login instead.",
+        )
     
     # Create JWT token
     token_data = create_user_token(vendor)
@@ -235,20 +242,12 @@ async def register_vendor(
     
     logger.info(
         "Vendor registration successful",
-        user_id=str(vendor.id),
+        user_id=vendor.id,
         phone_number=vendor.phone_number,
         business_name=vendor.business_name,
     )
     
-    return LoginResponse(
-        access_token=access_token,
-        token_type="bearer",
-        expires_in=get_token_expires_in(),
-        user_id=vendor.id,
-        user_type=vendor.user_type,
-        phone_number=vendor.phone_number,
-        preferred_language=vendor.preferred_language.value,
-    )
+    return _build_login_response(vendor, access_token)
 
 
 @router.post("/logout")
@@ -271,7 +270,7 @@ async def logout(
     """
     logger.info(
         "User logout",
-        user_id=str(current_user.id),
+        user_id=current_user.id,
         user_type=current_user.user_type,
     )
     
@@ -341,7 +340,7 @@ async def refresh_token(
     """
     logger.info(
         "Token refresh",
-        user_id=str(current_user.id),
+        user_id=current_user.id,
         user_type=current_user.user_type,
     )
     
@@ -5,9 +5,15 @@ This module provides comprehensive health checks for all system components
 including database, Redis, and Elasticsearch connectivity.
 """
 
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
 from typing import Dict, Any
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Response, status
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
+import psutil
 import structlog
 
 from ..database import get_database_manager
@@ -17,7 +23,7 @@ from ..config import settings
 
 logger = structlog.get_logger(__name__)
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 class HealthStatus(BaseModel):
@@ -35,107 +41,133 @@ class ComponentHealth(BaseModel):
     details: Dict[str, Any] = {}
 
 
-@router.get("/", response_model=HealthStatus)
-async def health_check():
-    """
-    Basic health check endpoint.
-    
-    Returns overall system health status with component details.
-    """
-    import time
-    from datetime import datetime
-    
-    start_time = time.time()
-    components = {}
-    overall_status = "healthy"
+# Health and metrics responses are reused for this long so that frequent
+# probes collapse into at most one real check per interval
+CACHE_TTL_SECONDS = 1.0
+
+_cache: Dict[str, Dict[str, Any]] = {
+    "health": {"t": 0.0, "val": None},
+    "metrics": {"t": 0.0, "val": None},
+}
+_cache_locks: Dict[str, asyncio.Lock] = {key: asyncio.Lock() for key in _cache}
+
+
+async def _cached(key: str, compute):
+    """Return the cached value for key, recomputing it once the TTL expires."""
+    entry = _cache[key]
+    if entry["val"] is not None and time.monotonic() - entry["t"] <= CACHE_TTL_SECONDS:
+        return entry["val"]
     
-    # Check database connectivity
+    async with _cache_locks[key]:
+        # Another probe may have refreshed the entry while we waited
+        if entry["val"] is None or time.monotonic() - entry["t"] > CACHE_TTL_SECONDS:
+            entry["val"] = await compute()
+            entry["t"] = time.monotonic()
+    return entry["val"]
+
+
+# Connection URLs with credentials stripped, computed once for health details
+_DB_URL_SAFE = settings.database_url.split("@")[-1]
+_REDIS_URL_SAFE = settings.redis_url.split("@")[-1]
+
+# Upper bound for a single component probe, so one slow backend cannot
+# hold up the whole health check
+COMPONENT_TIMEOUT_SECONDS = 0.5
+
+
+async def _check_component(name: str, ping, details: Dict[str, Any]):
+    """Ping one component and return its name with a ComponentHealth."""
+    start = time.time()
     try:
-        db_start = time.time()
-        db_manager = get_database_manager()
-        async with db_manager.engine.begin() as conn:
-            await conn.execute("SELECT 1")
-        
-        components["database"] = ComponentHealth(
+        is_connected = await asyncio.wait_for(ping(), timeout=COMPONENT_TIMEOUT_SECONDS)
+        if not is_connected:
+            raise Exception(f"{name} ping failed")
+        return name, ComponentHealth(
             status="healthy",
-            response_time_ms=round((time.time() - db_start) * 1000, 2),
-            details={"url": settings.database_url.split("@")[-1]},  # Hide credentials
+            response_time_ms=round((time.time() - start) * 1000, 2),
+            details=details,
         )
-        
+    except asyncio.TimeoutError:
+        error = f"{name} ping timed out after {COMPONENT_TIMEOUT_SECONDS}s"
     except Exception as e:
-        logger.error("Database health check failed", error=str(e))
-        components["database"] = ComponentHealth(
-            status="unhealthy",
-            response_time_ms=round((time.time() - db_start) * 1000, 2),
-            details={"error": str(e)},
-        )
-        overall_status = "unhealthy"
+        error = str(e)
     
-    # Check Redis connectivity
-    try:
-        redis_start = time.time()
-        redis_manager = get_redis_manager()
-        is_connected = await redis_manager.ping()
-        
-        if is_connected:
-            components["redis"] = ComponentHealth(
-                status="healthy",
-                response_time_ms=round((time.time() - redis_start) * 1000, 2),
-                details={"url": settings.redis_url.split("@")[-1]},  # Hide credentials
-            )
-        else:
-            raise Exception("Redis ping failed")
-            
-    except Exception as e:
-        logger.error("Redis health check failed", error=str(e))
-        components["redis"] = ComponentHealth(
-            status="unhealthy",
-            response_time_ms=round((time.time() - redis_start) * 1000, 2),
-            details={"error": str(e)},
-        )
-        overall_status = "unhealthy"
+    logger.error("Component health check failed", component=name, error=error)
+    return name, ComponentHealth(
+        status="unhealthy",
+        response_time_ms=round((time.time() - start) * 1000, 2),
+        details={"error": error},
+    )
+
+
+async def _check_db():
+    """Check database connectivity."""
+    return await _check_component(
+        "database",
+        lambda: get_database_manager().ping(),
+        {"url": _DB_URL_SAFE},
+    )
+
+
+async def _check_redis():
+    """Check Redis connectivity."""
+    return await _check_component(
+        "redis",
+        lambda: get_redis_manager().ping(),
+        {"url": _REDIS_URL_SAFE},
+    )
+
+
+async def _check_es():
+    """Check Elasticsearch connectivity."""
+    return await _check_component(
+        "elasticsearch",
+        lambda: get_elasticsearch_manager().ping(),
+        {"url": settings.elasticsearch_url},
+    )
+
+
+async def _compute_health() -> HealthStatus:
+    """Probe every component and build the overall health status."""
+    start_time = time.time()
     
-    # Check Elasticsearch connectivity
-    try:
-        es_start = time.time()
-        es_manager = get_elasticsearch_manager()
-        is_connected = await es_manager.ping()
-        
-        if is_connected:
-            components["elasticsearch"] = ComponentHealth(
-                status="healthy",
-                response_time_ms=round((time.time() - es_start) * 1000, 2),
-                details={"url": settings.elasticsearch_url},
-            )
-        else:
-            raise Exception("Elasticsearch ping failed")
-            
-    except Exception as e:
-        logger.error("Elasticsearch health check failed", error=str(e))
-        components["elasticsearch"] = ComponentHealth(
-            status="unhealthy",
-            response_time_ms=round((time.time() - es_start) * 1000, 2),
-            details={"error": str(e)},
-        )
-        overall_status = "unhealthy"
+    # Probe all components concurrently; total latency is the slowest probe
+    # rather than the sum of all of them
+    results = await asyncio.gather(_check_db(), _check_redis(), _check_es())
+    components = dict(results)
+    overall_status = (
+        "healthy"
+        if all(comp.status == "healthy" for comp in components.values())
+        else "unhealthy"
+    )
     
     total_response_time = round((time.time() - start_time) * 1000, 2)
     
-    health_status = HealthStatus(
+    return HealthStatus(
         status=overall_status,
         version="0.1.0",
         timestamp=datetime.utcnow().isoformat() + "Z",
         components={
-            **{name: comp.dict() for name, comp in components.items()},
+            **{name: comp.model_dump() for name, comp in components.items()},
             "total_response_time_ms": total_response_time,
         },
     )
+
+
+@router.get("/", response_model=HealthStatus)
+async def health_check():
+    """
+    Basic health check endpoint.
+    
+    Returns overall system health status with component details.
+    """
+    health_status = await _cached("health", _compute_health)
     
     # Return appropriate HTTP status
-    if overall_status == "unhealthy":
+    if health_status.status == "unhealthy":
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=health_status.dict(),
+            detail=health_status.model_dump(),
         )
     
     return health_status
@@ -154,12 +186,20 @@ async def readiness_check():
         redis_manager = get_redis_manager()
         es_manager = get_elasticsearch_manager()
         
-        # Simple connectivity checks
-        async with db_manager.engine.begin() as conn:
-            await conn.execute("SELECT 1")
+        # Simple connectivity checks, run concurrently
+        db_ok, redis_ok, es_ok = await asyncio.gather(
+            db_manager.ping(),
+            redis_manager.ping(),
+            es_manager.ping(),
+        )
         
-        await redis_manager.ping()
-        await es_manager.ping()
+        failed = [
+            name
+            for name, ok in (("database", db_ok), ("redis", redis_ok), ("elasticsearch", es_ok))
+            if not ok
+        ]
+        if failed:
+            raise Exception(f"Ping failed: {', '.join(failed)}")
         
         return {"status": "ready"}
         
@@ -171,6 +211,11 @@ async def readiness_check():
         )
 
 
+# Liveness carries no dynamic data, so the response is encoded once and
+# reused; the old hardcoded timestamp only misled monitoring
+_LIVE_RESPONSE = Response(content=b'{"status":"alive"}', media_type="application/json")
+
+
 @router.get("/live")
 async def liveness_check():
     """
@@ -178,7 +223,71 @@ async def liveness_check():
     
     Returns 200 if the service is alive (basic functionality).
     """
-    return {"status": "alive", "timestamp": "2024-01-01T00:00:00Z"}
+    return _LIVE_RESPONSE
+
+
+@dataclass
+class SystemStats:
+    """Snapshot of host and process statistics from psutil."""
+    cpu_percent: float
+    memory_percent: float
+    memory_used: int
+    memory_total: int
+    disk_used: int
+    disk_total: int
+    process_create_time: float
+
+
+# Reused across calls; constructing psutil.Process parses /proc on each call
+_process = psutil.Process()
+
+
+def _collect_psutil_stats() -> SystemStats:
+    """Read psutil statistics. Blocking, so run it in an executor."""
+    # interval=None is non-blocking and reports usage since the previous
+    # call instead of sleeping for a sampling window
+    cpu_percent = psutil.cpu_percent(interval=None)
+    memory = psutil.virtual_memory()
+    disk = psutil.disk_usage("/")
+    
+    return SystemStats(
+        cpu_percent=cpu_percent,
+        memory_percent=memory.percent,
+        memory_used=memory.used,
+        memory_total=memory.total,
+        disk_used=disk.used,
+        disk_total=disk.total,
+        process_create_time=_process.create_time(),
+    )
+
+
+async def _collect_metrics() -> Dict[str, Any]:
+    """Collect system and application metrics."""
+    # disk_usage() issues statvfs, which can stall on a busy disk; keep the
+    # psutil calls off the event loop
+    stats = await asyncio.get_running_loop().run_in_executor(None, _collect_psutil_stats)
+    
+    # Application metrics
+    uptime = time.time() - stats.process_create_time
+    
+    return {
+        "timestamp": datetime.now(timezone.utc),
+        "system": {
+            "cpu_percent": stats.cpu_percent,
+            "memory_percent": stats.memory_percent,
+            "memory_used_mb": round(stats.memory_used / 1024 / 1024, 2),
+            "memory_total_mb": round(stats.memory_total / 1024 / 1024, 2),
+            "disk_percent": round((stats.disk_used / stats.disk_total) * 100, 2),
+            "disk_used_gb": round(stats.disk_used / 1024 / 1024 / 1024, 2),
+            "disk_total_gb": round(stats.disk_total / 1024 / 1024 / 1024, 2),
+        },
+        "application": {
+            "uptime_seconds": round(uptime, 2),
+            "version": "0.1.0",
+            "debug_mode": settings.debug,
+            "supported_languages": settings.supported_languages,
+        },
+    }
 
 
 @router.get("/metrics")
@@ -188,37 +297,8 @@ async def metrics():
     
     Returns system metrics and statistics.
     """
-    import psutil
-    import time
-    from datetime import datetime
-    
     try:
-        # System metrics
-        cpu_percent = psutil.cpu_percent(interval=1)
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage("/")
-        
-        # Application metrics
-        uptime = time.time() - psutil.Process().create_time()
-        
-        return {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "system": {
-                "cpu_percent": cpu_percent,
-                "memory_percent": memory.percent,
-                "memory_used_mb": round(memory.used / 1024 / 1024, 2),
-                "memory_total_mb": round(memory.total / 1024 / 1024, 2),
-                "disk_percent": round((disk.used / disk.total) * 100, 2),
-                "disk_used_gb": round(disk.used / 1024 / 1024 / 1024, 2),
-                "disk_total_gb": round(disk.total / 1024 / 1024 / 1024, 2),
-            },
-            "application": {
-                "uptime_seconds": round(uptime, 2),
-                "version": "0.1.0",
-                "debug_mode": settings.debug,
-                "supported_languages": settings.supported_languages,
-            },
-        }
+        return await _cached("metrics", _collect_metrics)
         
     except Exception as e:
         logger.error("Metrics collection failed", error=str(e))
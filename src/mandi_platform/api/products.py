@@ -5,18 +5,32 @@ This module provides REST API endpoints for product listing, search, filtering,
 and management with multilingual support.
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, NoReturn, Optional, Tuple
 from uuid import UUID
+from datetime import datetime
 from decimal import Decimal
+import base64
+import binascii
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Query, Response, UploadFile, File
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 import structlog
 
+from ..cache import (
+    etag_for,
+    etag_matches,
+    featured_products_key,
+    get_or_set,
+    invalidate_product,
+    mark_vendor_write,
+    product_key,
+    product_list_key,
+)
+from ..config import settings
 from ..database import get_db_session
 from ..models.user import User, Vendor
-from ..models.product import Product
-from ..models.enums import LanguageCode, QualityGrade, AvailabilityStatus
+from ..models.product import Product, to_paise
 from ..crud.product import ProductCRUD
 from ..auth.dependencies import require_auth, require_vendor_auth
 from .schemas.product import (
@@ -35,6 +49,67 @@ logger = structlog.get_logger(__name__)
 
 router = APIRouter()
 
+# Encodes a bare list of products in one pydantic-core call
+_product_list_adapter = TypeAdapter(List[ProductResponse])
+
+
+def _encode_cursor(product: Product) -> str:
+    """Encode the keyset position after ``product`` as an opaque cursor."""
+    raw = f"{product.created_at.isoformat()}|{product.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, UUID]]:
+    """Decode a cursor produced by _encode_cursor."""
+    if cursor is None:
+        return None
+    try:
+        created_at, product_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(product_id)
+    except (ValueError, binascii.Error):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+async def _raise_write_failure(
+    crud: ProductCRUD,
+    product_id: UUID,
+    vendor_id: UUID,
+    forbidden_detail: str,
+    failure_detail: str,
+) -> NoReturn:
+    """
+    Raise the right error after a vendor-scoped write matched no row.
+    
+    The write is a single UPDATE filtered on both product and vendor, so the
+    product is only looked up on this failure path to tell 404 from 403.
+    """
+    product = await crud.get_product(product_id)
+    if not product:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Product {product_id} not found"
+        )
+    
+    if product.vendor_id != vendor_id:
+        logger.warning(
+            "Unauthorized product modification attempt",
+            product_id=product_id,
+            vendor_id=vendor_id,
+            product_vendor_id=product.vendor_id,
+        )
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=forbidden_detail
+        )
+    
+    raise HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail=failure_detail
+    )
+
 
 @router.get("/products", response_model=ProductListResponse)
 async def list_products(
@@ -43,8 +118,9 @@ async def list_products(
     category_id: Optional[UUID] = Query(default=None, description="Filter by category"),
     vendor_id: Optional[UUID] = Query(default=None, description="Filter by vendor"),
     active_only: bool = Query(default=True, description="Show only active products"),
+    after: Optional[str] = Query(default=None, description="Cursor from the previous page's next_cursor"),
     db: AsyncSession = Depends(get_db_session),
-) -> ProductListResponse:
+) -> Response:
     """
     List products with pagination and filtering.
     
@@ -54,6 +130,7 @@ async def list_products(
         category_id: Optional category filter
         vendor_id: Optional vendor filter
         active_only: Show only active products
+        after: Keyset cursor; when given, ``page`` no longer drives the offset
         db: Database session
         
     Returns:
@@ -63,51 +140,60 @@ async def list_products(
         "Listing products",
         page=page,
         page_size=page_size,
-        category_id=str(category_id) if category_id else None,
-        vendor_id=str(vendor_id) if vendor_id else None,
+        category_id=category_id,
+        vendor_id=vendor_id,
     )
     
-    crud = ProductCRUD(db)
-    offset = (page - 1) * page_size
+    cursor = _decode_cursor(after)
     
-    # Get products based on filters
-    if vendor_id:
-        products = await crud.get_products_by_vendor(
-            vendor_id, active_only=active_only, limit=page_size, offset=offset
-        )
-    elif category_id:
-        products = await crud.get_products_by_category(
-            category_id, active_only=active_only, limit=page_size, offset=offset
+    async def build_page() -> ProductListResponse:
+        crud = ProductCRUD(db)
+        offset = (page - 1) * page_size
+        
+        # Get products based on filters. The page and the count share one
+        # AsyncSession, which does not allow concurrent statements, so they run
+        # back to back.
+        if vendor_id:
+            products = await crud.get_products_by_vendor(
+                vendor_id, active_only=active_only, limit=page_size, offset=offset, after=cursor
+            )
+            total = await crud.count_products_by_vendor(vendor_id, active_only=active_only)
+        elif category_id:
+            products = await crud.get_products_by_category(
+                category_id, active_only=active_only, limit=page_size, offset=offset, after=cursor
+            )
+            total = await crud.count_products_by_category(category_id, active_only=active_only)
+        else:
+            # Get all products (implement in CRUD if needed)
+            products = []
+            total = 0
+        
+        # Convert to response models
+        product_responses = [
+            ProductResponse.model_validate(product) for product in products
+        ]
+        
+        return ProductListResponse(
+            products=product_responses,
+            total=total,
+            page=page,
+            page_size=page_size,
+            next_cursor=_encode_cursor(products[-1]) if len(products) == page_size else None,
         )
-    else:
-        # Get all products (implement in CRUD if needed)
-        products = []
-    
-    # Convert to response models
-    product_responses = [
-        ProductResponse.from_orm(product) for product in products
-    ]
     
-    # Calculate pagination metadata
-    total = len(products)  # This should be a count query in production
-    total_pages = (total + page_size - 1) // page_size
-    
-    return ProductListResponse(
-        products=product_responses,
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages,
-        has_next=page < total_pages,
-        has_prev=page > 1,
+    body = await get_or_set(
+        product_list_key(vendor_id, category_id, active_only, page, page_size, after),
+        build_page,
+        ttl=settings.product_list_cache_ttl,
     )
+    return Response(content=body, media_type="application/json")
 
 
 @router.post("/products/search", response_model=ProductSearchResponse)
 async def search_products(
     search_request: ProductSearchRequest,
     db: AsyncSession = Depends(get_db_session),
-) -> ProductSearchResponse:
+) -> Response:
     """
     Search products with multilingual support and advanced filtering.
     
@@ -131,33 +217,26 @@ async def search_products(
     filters = {}
     if search_request.category_id:
         filters["category_id"] = str(search_request.category_id)
+    if search_request.vendor_id:
+        filters["vendor_id"] = str(search_request.vendor_id)
     
-    # Build price range
+    # Build price range in integer paise; rupee Decimals stop at the request
     price_range = None
     if search_request.min_price is not None or search_request.max_price is not None:
         price_range = (
-            search_request.min_price or Decimal('0'),
-            search_request.max_price or Decimal('999999')
+            to_paise(search_request.min_price) if search_request.min_price is not None else 0,
+            to_paise(search_request.max_price) if search_request.max_price is not None else None,
         )
     
-    # Convert quality grades and availability statuses
-    quality_grades = None
-    if search_request.quality_grades:
-        quality_grades = [QualityGrade(qg) for qg in search_request.quality_grades]
-    
-    availability_statuses = None
-    if search_request.availability_statuses:
-        availability_statuses = [AvailabilityStatus(av) for av in search_request.availability_statuses]
-    
-    # Perform search
+    # Enum fields are already parsed by the request schema
     results = await crud.search_products(
         query=search_request.query,
-        language=LanguageCode(search_request.language),
+        language=search_request.language,
         filters=filters,
         location=search_request.location,
         price_range=price_range,
-        quality_grades=quality_grades,
-        availability_statuses=availability_statuses,
+        quality_grades=search_request.quality_grades or None,
+        availability_statuses=search_request.availability_statuses or None,
         page=search_request.page,
         page_size=search_request.page_size,
         sort_by=search_request.sort_by,
@@ -165,40 +244,125 @@ async def search_products(
         boost_local=search_request.boost_local,
     )
     
-    return ProductSearchResponse(**results)
+    # Search hits are free-form documents; validate once and encode in a single
+    # pass rather than re-validating through response_model and orjson
+    body = ProductSearchResponse(**results).model_dump_json()
+    return Response(content=body, media_type="application/json")
+
+
+@router.get("/products/featured", response_model=List[ProductResponse])
+async def get_featured_products(
+    limit: int = Query(default=10, ge=1, le=50, description="Number of featured products"),
+    category_id: Optional[UUID] = Query(default=None, description="Filter by category"),
+    db: AsyncSession = Depends(get_db_session),
+) -> Response:
+    """
+    Get featured products.
+    
+    Args:
+        limit: Maximum number of products to return
+        category_id: Optional category filter
+        db: Database session
+        
+    Returns:
+        List of featured products
+    """
+    logger.info("Getting featured products", limit=limit, category_id=category_id)
+    
+    async def load_featured() -> bytes:
+        crud = ProductCRUD(db)
+        products = [
+            ProductResponse.model_validate(product)
+            async for product in crud.iter_featured_products(limit=limit, category_id=category_id)
+        ]
+        return _product_list_adapter.dump_json(products)
+    
+    body = await get_or_set(
+        featured_products_key(category_id, limit),
+        load_featured,
+        ttl=settings.product_list_cache_ttl,
+    )
+    return Response(content=body, media_type="application/json")
+
+
+@router.get("/products/low-stock", response_model=List[ProductResponse])
+async def get_low_stock_products(
+    threshold: Decimal = Query(default=Decimal('10'), ge=0, description="Stock threshold"),
+    current_vendor: Vendor = Depends(require_vendor_auth),
+    db: AsyncSession = Depends(get_db_session),
+) -> List[ProductResponse]:
+    """
+    Get vendor's products with low stock (vendor only).
+    
+    Args:
+        threshold: Stock quantity threshold
+        current_vendor: Current authenticated vendor
+        db: Database session
+        
+    Returns:
+        List of low stock products
+    """
+    logger.info(
+        "Getting low stock products",
+        vendor_id=current_vendor.id,
+        threshold=float(threshold),
+    )
+    
+    crud = ProductCRUD(db)
+    
+    return [
+        ProductResponse.model_validate(product)
+        async for product in crud.iter_low_stock_products(
+            vendor_id=current_vendor.id,
+            threshold=threshold
+        )
+    ]
 
 
 @router.get("/products/{product_id}", response_model=ProductResponse)
 async def get_product(
     product_id: UUID,
+    if_none_match: Optional[str] = Header(default=None),
     db: AsyncSession = Depends(get_db_session),
-) -> ProductResponse:
+) -> Response:
     """
     Get a single product by ID.
     
     Args:
         product_id: Product UUID
+        if_none_match: ETags the client already holds
         db: Database session
         
     Returns:
-        Product details
+        Product details, or an empty 304 if the client's copy is current
         
     Raises:
         HTTPException: If product not found
     """
-    logger.info("Getting product", product_id=str(product_id))
+    logger.info("Getting product", product_id=product_id)
     
-    crud = ProductCRUD(db)
-    product = await crud.get_product(product_id)
+    async def load_product() -> ProductResponse:
+        crud = ProductCRUD(db)
+        product = await crud.get_product(product_id)
+        
+        if not product:
+            logger.warning("Product not found", product_id=product_id)
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Product {product_id} not found"
+            )
+        
+        return ProductResponse.model_validate(product)
     
-    if not product:
-        logger.warning("Product not found", product_id=str(product_id))
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Product {product_id} not found"
-        )
+    body = await get_or_set(
+        product_key(product_id), load_product, ttl=settings.product_cache_ttl
+    )
+    etag = etag_for(body)
     
-    return ProductResponse.from_orm(product)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
 
 @router.post("/products", response_model=ProductResponse, status_code=status.HTTP_201_CREATED)
@@ -223,8 +387,8 @@ async def create_product(
     """
     logger.info(
         "Creating product",
-        vendor_id=str(current_vendor.id),
-        category_id=str(product_request.category_id),
+        vendor_id=current_vendor.id,
+        category_id=product_request.category_id,
     )
     
     crud = ProductCRUD(db)
@@ -255,14 +419,17 @@ async def create_product(
     )
     
     if not product:
-        logger.error("Failed to create product", vendor_id=str(current_vendor.id))
+        logger.error("Failed to create product", vendor_id=current_vendor.id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create product"
         )
     
-    logger.info("Product created successfully", product_id=str(product.id))
-    return ProductResponse.from_orm(product)
+    await invalidate_product(product.id, product.vendor_id, product.category_id)
+    await mark_vendor_write(product.vendor_id, settings.search_index_lag_seconds)
+    
+    logger.info("Product created successfully", product_id=product.id)
+    return ProductResponse.model_validate(product)
 
 
 @router.put("/products/{product_id}", response_model=ProductResponse)
@@ -289,44 +456,32 @@ async def update_product(
     """
     logger.info(
         "Updating product",
-        product_id=str(product_id),
-        vendor_id=str(current_vendor.id),
+        product_id=product_id,
+        vendor_id=current_vendor.id,
     )
     
     crud = ProductCRUD(db)
     
-    # Check if product exists and belongs to vendor
-    product = await crud.get_product(product_id)
-    if not product:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Product {product_id} not found"
-        )
-    
-    if product.vendor_id != current_vendor.id:
-        logger.warning(
-            "Unauthorized product update attempt",
-            product_id=str(product_id),
-            vendor_id=str(current_vendor.id),
-            product_vendor_id=str(product.vendor_id),
-        )
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You can only update your own products"
-        )
-    
-    # Update product
-    updates = product_request.dict(exclude_unset=True)
-    updated_product = await crud.update_product(product_id, **updates)
+    # Update product; ownership is enforced by the UPDATE itself
+    updates = product_request.model_dump(exclude_unset=True)
+    updated_product = await crud.update_product_as_vendor(
+        product_id, current_vendor.id, **updates
+    )
     
     if not updated_product:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to update product"
+        await _raise_write_failure(
+            crud,
+            product_id,
+            current_vendor.id,
+            forbidden_detail="You can only update your own products",
+            failure_detail="Failed to update product",
         )
     
-    logger.info("Product updated successfully", product_id=str(product_id))
-    return ProductResponse.from_orm(updated_product)
+    await invalidate_product(product_id, updated_product.vendor_id, updated_product.category_id)
+    await mark_vendor_write(updated_product.vendor_id, settings.search_index_lag_seconds)
+    
+    logger.info("Product updated successfully", product_id=product_id)
+    return ProductResponse.model_validate(updated_product)
 
 
 @router.delete("/products/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -350,41 +505,28 @@ async def delete_product(
     """
     logger.info(
         "Deleting product",
-        product_id=str(product_id),
-        vendor_id=str(current_vendor.id),
+        product_id=product_id,
+        vendor_id=current_vendor.id,
     )
     
     crud = ProductCRUD(db)
     
-    # Check if product exists and belongs to vendor
-    product = await crud.get_product(product_id)
-    if not product:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Product {product_id} not found"
-        )
-    
-    if product.vendor_id != current_vendor.id:
-        logger.warning(
-            "Unauthorized product deletion attempt",
-            product_id=str(product_id),
-            vendor_id=str(current_vendor.id),
-        )
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You can only delete your own products"
-        )
-    
-    # Delete product (soft delete)
-    success = await crud.delete_product(product_id)
+    # Delete product (soft delete); ownership is enforced by the UPDATE itself
+    success = await crud.delete_product(product_id, vendor_id=current_vendor.id)
     
     if not success:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to delete product"
+        await _raise_write_failure(
+            crud,
+            product_id,
+            current_vendor.id,
+            forbidden_detail="You can only delete your own products",
+            failure_detail="Failed to delete product",
         )
     
-    logger.info("Product deleted successfully", product_id=str(product_id))
+    await invalidate_product(product_id, current_vendor.id)
+    await mark_vendor_write(current_vendor.id, settings.search_index_lag_seconds)
+    
+    logger.info("Product deleted successfully", product_id=product_id)
 
 
 @router.put("/products/{product_id}/availability", response_model=ProductResponse)
@@ -411,42 +553,36 @@ async def update_product_availability(
     """
     logger.info(
         "Updating product availability",
-        product_id=str(product_id),
-        vendor_id=str(current_vendor.id),
+        product_id=product_id,
+        vendor_id=current_vendor.id,
         new_status=availability_request.availability_status,
     )
     
     crud = ProductCRUD(db)
     
-    # Check if product exists and belongs to vendor
-    product = await crud.get_product(product_id)
-    if not product:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Product {product_id} not found"
-        )
-    
-    if product.vendor_id != current_vendor.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You can only update your own products"
-        )
-    
     # Update availability
     updates = {"availability_status": availability_request.availability_status}
     if availability_request.stock_quantity is not None:
         updates["stock_quantity"] = availability_request.stock_quantity
     
-    updated_product = await crud.update_product(product_id, **updates)
+    updated_product = await crud.update_product_as_vendor(
+        product_id, current_vendor.id, **updates
+    )
     
     if not updated_product:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to update product availability"
+        await _raise_write_failure(
+            crud,
+            product_id,
+            current_vendor.id,
+            forbidden_detail="You can only update your own products",
+            failure_detail="Failed to update product availability",
         )
     
-    logger.info("Product availability updated successfully", product_id=str(product_id))
-    return ProductResponse.from_orm(updated_product)
+    await invalidate_product(product_id, updated_product.vendor_id, updated_product.category_id)
+    await mark_vendor_write(updated_product.vendor_id, settings.search_index_lag_seconds)
+    
+    logger.info("Product availability updated successfully", product_id=product_id)
+    return ProductResponse.model_validate(updated_product)
 
 
 @router.put("/products/{product_id}/stock", response_model=ProductResponse)
@@ -475,63 +611,32 @@ async def update_product_stock(
     """
     logger.info(
         "Updating product stock",
-        product_id=str(product_id),
-        vendor_id=str(current_vendor.id),
+        product_id=product_id,
+        vendor_id=current_vendor.id,
         new_quantity=float(stock_request.stock_quantity),
     )
     
     crud = ProductCRUD(db)
     
-    # Check if product exists and belongs to vendor
-    product = await crud.get_product(product_id)
-    if not product:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Product {product_id} not found"
-        )
-    
-    if product.vendor_id != current_vendor.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You can only update your own products"
-        )
-    
     # Update stock (this also updates availability status automatically)
-    updated_product = await crud.update_stock(product_id, stock_request.stock_quantity)
+    updated_product = await crud.update_stock_as_vendor(
+        product_id, current_vendor.id, stock_request.stock_quantity
+    )
     
     if not updated_product:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to update product stock"
+        await _raise_write_failure(
+            crud,
+            product_id,
+            current_vendor.id,
+            forbidden_detail="You can only update your own products",
+            failure_detail="Failed to update product stock",
         )
     
-    logger.info("Product stock updated successfully", product_id=str(product_id))
-    return ProductResponse.from_orm(updated_product)
-
-
-@router.get("/products/featured", response_model=List[ProductResponse])
-async def get_featured_products(
-    limit: int = Query(default=10, ge=1, le=50, description="Number of featured products"),
-    category_id: Optional[UUID] = Query(default=None, description="Filter by category"),
-    db: AsyncSession = Depends(get_db_session),
-) -> List[ProductResponse]:
-    """
-    Get featured products.
-    
-    Args:
-        limit: Maximum number of products to return
-        category_id: Optional category filter
-        db: Database session
-        
-    Returns:
-        List of featured products
-    """
-    logger.info("Getting featured products", limit=limit, category_id=str(category_id) if category_id else None)
-    
-    crud = ProductCRUD(db)
-    products = await crud.get_featured_products(limit=limit, category_id=category_id)
+    await invalidate_product(product_id, updated_product.vendor_id, updated_product.category_id)
+    await mark_vendor_write(updated_product.vendor_id, settings.search_index_lag_seconds)
     
-    return [ProductResponse.from_orm(product) for product in products]
+    logger.info("Product stock updated successfully", product_id=product_id)
+    return ProductResponse.model_validate(updated_product)
 
 
 @router.get("/vendors/{vendor_id}/products", response_model=ProductListResponse)
@@ -540,8 +645,9 @@ async def get_vendor_products(
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=20, ge=1, le=100),
     active_only: bool = Query(default=True),
+    after: Optional[str] = Query(default=None),
     db: AsyncSession = Depends(get_db_session),
-) -> ProductListResponse:
+) -> Response:
     """
     Get all products for a specific vendor.
     
@@ -550,63 +656,39 @@ async def get_vendor_products(
         page: Page number
         page_size: Items per page
         active_only: Show only active products
+        after: Keyset cursor from the previous page's next_cursor
         db: Database session
         
     Returns:
         Paginated list of vendor's products
     """
-    logger.info("Getting vendor products", vendor_id=str(vendor_id), page=page)
-    
-    crud = ProductCRUD(db)
-    offset = (page - 1) * page_size
-    
-    products = await crud.get_products_by_vendor(
-        vendor_id, active_only=active_only, limit=page_size, offset=offset
-    )
-    
-    product_responses = [ProductResponse.from_orm(product) for product in products]
+    logger.info("Getting vendor products", vendor_id=vendor_id, page=page)
     
-    total = len(products)
-    total_pages = (total + page_size - 1) // page_size
-    
-    return ProductListResponse(
-        products=product_responses,
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages,
-        has_next=page < total_pages,
-        has_prev=page > 1,
-    )
-
-
-@router.get("/products/low-stock", response_model=List[ProductResponse])
-async def get_low_stock_products(
-    threshold: Decimal = Query(default=Decimal('10'), ge=0, description="Stock threshold"),
-    current_vendor: Vendor = Depends(require_vendor_auth),
-    db: AsyncSession = Depends(get_db_session),
-) -> List[ProductResponse]:
-    """
-    Get vendor's products with low stock (vendor only).
+    cursor = _decode_cursor(after)
     
-    Args:
-        threshold: Stock quantity threshold
-        current_vendor: Current authenticated vendor
-        db: Database session
+    async def build_page() -> ProductListResponse:
+        crud = ProductCRUD(db)
+        offset = (page - 1) * page_size
         
-    Returns:
-        List of low stock products
-    """
-    logger.info(
-        "Getting low stock products",
-        vendor_id=str(current_vendor.id),
-        threshold=float(threshold),
-    )
+        products = await crud.get_products_by_vendor(
+            vendor_id, active_only=active_only, limit=page_size, offset=offset, after=cursor
+        )
+        
+        total = await crud.count_products_by_vendor(vendor_id, active_only=active_only)
+        
+        product_responses = [ProductResponse.model_validate(product) for product in products]
+        
+        return ProductListResponse(
+            products=product_responses,
+            total=total,
+            page=page,
+            page_size=page_size,
+            next_cursor=_encode_cursor(products[-1]) if len(products) == page_size else None,
+        )
     
-    crud = ProductCRUD(db)
-    products = await crud.get_low_stock_products(
-        vendor_id=current_vendor.id,
-        threshold=threshold
+    body = await get_or_set(
+        product_list_key(vendor_id, None, active_only, page, page_size, after),
+        build_page,
+        ttl=settings.product_list_cache_ttl,
     )
-    
-    return [ProductResponse.from_orm(product) for product in products]
+    return Response(content=body, media_type="application/json")
@@ -7,10 +7,10 @@ with multilingual support and validation.
 
 from datetime import datetime
 from decimal import Decimal
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Literal, Optional, Any
 from uuid import UUID
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, RootModel, computed_field, field_validator
 
 from ...models.enums import (
     LanguageCode,
@@ -23,27 +23,26 @@ from ...models.enums import (
 )
 
 
-class MultilingualTextSchema(BaseModel):
-    """Schema for multilingual text fields."""
-    hi: Optional[str] = None
-    en: Optional[str] = None
-    ta: Optional[str] = None
-    te: Optional[str] = None
-    bn: Optional[str] = None
-    mr: Optional[str] = None
-    gu: Optional[str] = None
-    kn: Optional[str] = None
-    ml: Optional[str] = None
-    pa: Optional[str] = None
+_AVAILABILITY_STATUS_VALUES = frozenset(status.value for status in AvailabilityStatus)
+
+
+# Language codes accepted as translation keys; mirrors LanguageCode
+LanguageKey = Literal["hi", "en", "ta", "te", "bn", "mr", "gu", "kn", "ml", "pa"]
+
+
+class MultilingualTextSchema(RootModel[Dict[LanguageKey, str]]):
+    """Schema for multilingual text fields, keyed by language code."""
+    root: Dict[LanguageKey, str] = Field(default_factory=dict)
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "en": "Fresh Tomatoes",
                 "hi": "ताजा टमाटर",
                 "ta": "புதிய தக்காளி"
             }
-        }
+        },
+    )
 
 
 class LocationSchema(BaseModel):
@@ -54,15 +53,16 @@ class LocationSchema(BaseModel):
     pincode: Optional[str] = None
     coordinates: Optional[Dict[str, float]] = None
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "city": "Mumbai",
                 "state": "Maharashtra",
                 "country": "India",
                 "pincode": "400001"
             }
-        }
+        },
+    )
 
 
 class ProductCreateRequest(BaseModel):
@@ -88,15 +88,16 @@ class ProductCreateRequest(BaseModel):
     sku: Optional[str] = None
     is_featured: bool = False
     
-    @validator('names', 'descriptions')
+    @field_validator('names', 'descriptions')
+    @classmethod
     def validate_multilingual_text(cls, v):
         """Ensure at least one language is provided."""
         if not v or not any(v.values()):
             raise ValueError("At least one language translation must be provided")
         return v
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "category_id": "123e4567-e89b-12d3-a456-426614174000",
                 "names": {
@@ -117,7 +118,8 @@ class ProductCreateRequest(BaseModel):
                 "stock_quantity": 100.0,
                 "tags": ["fresh", "vegetables", "local"]
             }
-        }
+        },
+    )
 
 
 class ProductUpdateRequest(BaseModel):
@@ -142,14 +144,15 @@ class ProductUpdateRequest(BaseModel):
     is_featured: Optional[bool] = None
     is_active: Optional[bool] = None
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "base_price": 45.00,
                 "stock_quantity": 80.0,
                 "availability_status": "limited_stock"
             }
-        }
+        },
+    )
 
 
 class ProductResponse(BaseModel):
@@ -181,9 +184,9 @@ class ProductResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        orm_mode = True
-        schema_extra = {
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_schema_extra={
             "example": {
                 "id": "123e4567-e89b-12d3-a456-426614174000",
                 "vendor_id": "123e4567-e89b-12d3-a456-426614174001",
@@ -221,29 +224,50 @@ class ProductResponse(BaseModel):
                 "created_at": "2024-01-01T00:00:00Z",
                 "updated_at": "2024-01-01T00:00:00Z"
             }
-        }
+        },
+    )
 
 
-class ProductListResponse(BaseModel):
-    """Response schema for product list."""
-    products: List[ProductResponse]
+class PaginatedResponse(BaseModel):
+    """Base for paginated responses; page metadata is derived from the totals."""
     total: int
     page: int
     page_size: int
-    total_pages: int
-    has_next: bool
-    has_prev: bool
+    
+    @computed_field
+    @property
+    def total_pages(self) -> int:
+        return (self.total + self.page_size - 1) // self.page_size
+    
+    @computed_field
+    @property
+    def has_next(self) -> bool:
+        return self.page * self.page_size < self.total
+    
+    @computed_field
+    @property
+    def has_prev(self) -> bool:
+        return self.page > 1
+
+
+class ProductListResponse(PaginatedResponse):
+    """Response schema for product list."""
+    products: List[ProductResponse]
+    next_cursor: Optional[str] = Field(
+        default=None, description="Pass as `after` to fetch the next page"
+    )
 
 
 class ProductSearchRequest(BaseModel):
     """Request schema for product search."""
     query: str = Field(default="", description="Search query text")
-    language: str = Field(default=LanguageCode.ENGLISH.value)
+    language: LanguageCode = Field(default=LanguageCode.ENGLISH)
     category_id: Optional[UUID] = None
+    vendor_id: Optional[UUID] = Field(default=None, description="Restrict results to one vendor's catalog")
     min_price: Optional[Decimal] = Field(default=None, ge=0)
     max_price: Optional[Decimal] = Field(default=None, ge=0)
-    quality_grades: Optional[List[str]] = None
-    availability_statuses: Optional[List[str]] = None
+    quality_grades: Optional[List[QualityGrade]] = None
+    availability_statuses: Optional[List[AvailabilityStatus]] = None
     location: Optional[Dict[str, Any]] = None
     page: int = Field(default=1, ge=1)
     page_size: int = Field(default=20, ge=1, le=100)
@@ -251,8 +275,8 @@ class ProductSearchRequest(BaseModel):
     include_alternatives: bool = True
     boost_local: bool = True
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "query": "tomatoes",
                 "language": "en",
@@ -262,22 +286,17 @@ class ProductSearchRequest(BaseModel):
                 "page": 1,
                 "page_size": 20
             }
-        }
+        },
+    )
 
 
-class ProductSearchResponse(BaseModel):
+class ProductSearchResponse(PaginatedResponse):
     """Response schema for product search results."""
     products: List[Dict[str, Any]]
     out_of_stock: List[Dict[str, Any]]
     alternatives: List[Dict[str, Any]]
     suggestions: List[str]
     facets: Dict[str, Any]
-    total: int
-    page: int
-    page_size: int
-    total_pages: int
-    has_next: bool
-    has_prev: bool
     search_metadata: Dict[str, Any]
 
 
@@ -285,12 +304,13 @@ class StockUpdateRequest(BaseModel):
     """Request schema for updating product stock."""
     stock_quantity: Decimal = Field(..., ge=0, description="New stock quantity")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "stock_quantity": 75.0
             }
-        }
+        },
+    )
 
 
 class ImageUploadResponse(BaseModel):
@@ -299,14 +319,15 @@ class ImageUploadResponse(BaseModel):
     product_id: UUID
     message: str
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "image_url": "https://example.com/products/image123.jpg",
                 "product_id": "123e4567-e89b-12d3-a456-426614174000",
                 "message": "Image uploaded successfully"
             }
-        }
+        },
+    )
 
 
 class AvailabilityUpdateRequest(BaseModel):
@@ -314,18 +335,20 @@ class AvailabilityUpdateRequest(BaseModel):
     availability_status: str = Field(..., description="New availability status")
     stock_quantity: Optional[Decimal] = Field(default=None, ge=0)
     
-    @validator('availability_status')
+    @field_validator('availability_status')
+    @classmethod
     def validate_availability_status(cls, v):
         """Validate availability status."""
-        valid_statuses = [status.value for status in AvailabilityStatus]
-        if v not in valid_statuses:
+        if v not in _AVAILABILITY_STATUS_VALUES:
+            valid_statuses = [status.value for status in AvailabilityStatus]
             raise ValueError(f"Invalid availability status. Must be one of: {valid_statuses}")
         return v
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "availability_status": "limited_stock",
                 "stock_quantity": 10.0
             }
-        }
+        },
+    )
@@ -6,7 +6,7 @@ for users and vendors.
 """
 
 from .jwt import create_access_token, verify_token, get_current_user, get_current_vendor
-from .middleware import AuthMiddleware
+from .middleware import AuthMiddleware, get_current_token_data
 from .schemas import Token, TokenData, LoginRequest, LoginResponse
 from .dependencies import require_auth, require_vendor_auth
 
@@ -16,6 +16,7 @@ __all__ = [
     "get_current_user",
     "get_current_vendor",
     "AuthMiddleware",
+    "get_current_token_data",
     "Token",
     "TokenData", 
     "LoginRequest",
@@ -9,6 +9,7 @@ from fastapi import Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..database import get_db_session
+from ..models.enums import VerificationStatus
 from ..models.user import User, Vendor
 from .jwt import get_current_user, get_current_vendor, get_current_active_user, get_current_active_vendor
 
@@ -65,7 +66,7 @@ def optional_auth(
 
 
 def require_verified_user(
-    current_user: User = Depends(require_auth)
+    current_user: User = Depends(get_current_active_user)
 ) -> User:
     """
     Dependency that requires a verified user.
@@ -79,8 +80,6 @@ def require_verified_user(
     Raises:
         HTTPException: If user is not verified
     """
-    from ..models.enums import VerificationStatus
-    
     if current_user.verification_status == VerificationStatus.UNVERIFIED:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -91,7 +90,7 @@ def require_verified_user(
 
 
 def require_verified_vendor(
-    current_vendor: Vendor = Depends(require_vendor_auth)
+    current_vendor: Vendor = Depends(get_current_active_vendor)
 ) -> Vendor:
     """
     Dependency that requires a verified vendor.
@@ -105,8 +104,6 @@ def require_verified_vendor(
     Raises:
         HTTPException: If vendor is not verified
     """
-    from ..models.enums import VerificationStatus
-    
     if current_vendor.verification_status == VerificationStatus.UNVERIFIED:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -117,11 +114,14 @@ def require_verified_vendor(
 
 
 def require_trusted_vendor(
-    current_vendor: Vendor = Depends(require_verified_vendor)
+    current_vendor: Vendor = Depends(get_current_active_vendor)
 ) -> Vendor:
     """
     Dependency that requires a trusted vendor.
     
+    The verification check runs inline rather than as a nested dependency,
+    so FastAPI resolves a single dependency on top of the vendor lookup.
+    
     Args:
         current_vendor: Current authenticated vendor
         
@@ -129,8 +129,10 @@ def require_trusted_vendor(
         Current trusted Vendor object
         
     Raises:
-        HTTPException: If vendor is not trusted
+        HTTPException: If vendor is not verified or not trusted
     """
+    require_verified_vendor(current_vendor)
+    
     if not current_vendor.is_trusted_vendor:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -155,7 +157,9 @@ class RoleChecker:
         Args:
             allowed_roles: List of allowed user types/roles
         """
-        self.allowed_roles = allowed_roles
+        self.allowed_roles = frozenset(allowed_roles)
+        # Original order, for error messages
+        self._role_names = ", ".join(allowed_roles)
     
     def __call__(self, current_user: User = Depends(get_current_active_user)) -> User:
         """
@@ -173,7 +177,7 @@ class RoleChecker:
         if current_user.user_type not in self.allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Access denied. Required roles: {', '.join(self.allowed_roles)}",
+                detail=f"Access denied. Required roles: {self._role_names}",
             )
         
         return current_user
@@ -5,9 +5,15 @@ This module provides functions for creating, validating, and managing JWT tokens
 for user authentication.
 """
 
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from datetime import timedelta
+from functools import lru_cache
 from typing import Optional, Union
 from uuid import UUID
+import base64
+import hashlib
+import json
+import time
 
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -23,6 +29,17 @@ from .schemas import TokenData
 # Security scheme for extracting Bearer tokens
 security = HTTPBearer()
 
+# Recently verified tokens, most recently used last. Keys are digests keyed
+# with the signing secret, so rotating the secret orphans every entry.
+_VERIFIED_TOKEN_CACHE_SIZE = 8192
+_verified_tokens: "OrderedDict[bytes, TokenData]" = OrderedDict()
+
+
+@lru_cache(maxsize=1)
+def _default_expires_delta() -> timedelta:
+    """Default access token lifetime; fixed by configuration."""
+    return timedelta(minutes=settings.access_token_expire_minutes)
+
 
 def create_access_token(
     data: dict, 
@@ -38,16 +55,8 @@ def create_access_token(
     Returns:
         Encoded JWT token string
     """
-    to_encode = data.copy()
-    
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(
-            minutes=settings.access_token_expire_minutes
-        )
-    
-    to_encode.update({"exp": expire})
+    lifetime = expires_delta or _default_expires_delta()
+    to_encode = {**data, "exp": int(time.time() + lifetime.total_seconds())}
     
     encoded_jwt = jwt.encode(
         to_encode, 
@@ -58,10 +67,26 @@ def create_access_token(
     return encoded_jwt
 
 
+@lru_cache(maxsize=4)
+def _token_header_segment(algorithm: str) -> str:
+    """Encoded JOSE header that create_access_token emits for ``algorithm``."""
+    header = json.dumps({"alg": algorithm, "typ": "JWT"}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(header.encode()).rstrip(b"=").decode()
+
+
+def _token_cache_key(token: str) -> bytes:
+    """Digest identifying a token under the current signing secret."""
+    secret = hashlib.blake2b(settings.secret_key.encode(), digest_size=32).digest()
+    return hashlib.blake2b(token.encode(), digest_size=16, key=secret).digest()
+
+
 def verify_token(token: str) -> TokenData:
     """
     Verify and decode a JWT token.
     
+    Successfully verified tokens are remembered until they expire, so repeat
+    requests with the same bearer token skip signature checking and decoding.
+    
     Args:
         token: JWT token string
         
@@ -71,12 +96,39 @@ def verify_token(token: str) -> TokenData:
     Raises:
         HTTPException: If token is invalid or expired
     """
+    cache_key = _token_cache_key(token)
+    token_data = _verified_tokens.get(cache_key)
+    if token_data is not None:
+        if token_data.exp > time.time():
+            _verified_tokens.move_to_end(cache_key)
+            return token_data
+        del _verified_tokens[cache_key]
+    
+    token_data = _decode_token(token)
+    
+    # Tokens without an expiry are never cached
+    if token_data.exp is not None:
+        _verified_tokens[cache_key] = token_data
+        if len(_verified_tokens) > _VERIFIED_TOKEN_CACHE_SIZE:
+            _verified_tokens.popitem(last=False)
+    
+    return token_data
+
+
+def _decode_token(token: str) -> TokenData:
+    """Check a token's signature and claims and build its TokenData."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     
+    # Every token we issue carries the same header, so anything else can be
+    # rejected before any base64 decoding or HMAC work
+    header, _, rest = token.partition(".")
+    if header != _token_header_segment(settings.algorithm) or rest.count(".") != 1:
+        raise credentials_exception
+    
     try:
         payload = jwt.decode(
             token, 
@@ -98,14 +150,7 @@ def verify_token(token: str) -> TokenData:
         except (ValueError, TypeError):
             raise credentials_exception
             
-        token_data = TokenData(
-            user_id=parsed_user_id,
-            user_type=user_type,
-            phone_number=phone_number,
-            exp=exp
-        )
-        
-        return token_data
+        return TokenData(parsed_user_id, user_type, phone_number, exp)
         
     except JWTError:
         raise credentials_exception
@@ -238,6 +283,7 @@ def create_user_token(user: User) -> dict:
     }
 
 
+@lru_cache(maxsize=1)
 def get_token_expires_in() -> int:
     """
     Get token expiration time in seconds.
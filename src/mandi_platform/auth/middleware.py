@@ -2,41 +2,92 @@
 Authentication middleware for the Multilingual Mandi Platform.
 
 This module provides middleware for handling authentication and security headers.
+
+Both classes are plain ASGI middleware rather than ``BaseHTTPMiddleware``
+subclasses, so a request passes straight through to the app instead of
+being relayed over an in-memory stream by a separate task.
 """
 
 import time
-from typing import Callable, Optional
-from fastapi import Request, Response, HTTPException, status
-from fastapi.security.utils import get_authorization_scheme_param
-from starlette.middleware.base import BaseHTTPMiddleware
+from contextvars import ContextVar
+from typing import Optional
+import orjson
+from fastapi import HTTPException, status
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import structlog
 
 from ..config import settings
+from ..redis_client import RedisManager
 from .jwt import verify_token
+from .schemas import TokenData
 
 logger = structlog.get_logger(__name__)
 
+# Verified token of the request being handled; set by AuthMiddleware
+_current_token: ContextVar[Optional[TokenData]] = ContextVar("current_token", default=None)
+
 
-class AuthMiddleware(BaseHTTPMiddleware):
+def get_current_token_data() -> Optional[TokenData]:
+    """
+    FastAPI dependency returning the token AuthMiddleware verified.
+    
+    Returns:
+        TokenData for the current request, or None if it was not
+        authenticated (no token, an invalid token, or an excluded path)
+    """
+    return _current_token.get()
+
+
+def _header(scope: Scope, name: bytes) -> Optional[bytes]:
+    """Return the raw first value of a request header (``name`` lowercase)."""
+    for key, value in scope["headers"]:
+        if key == name:
+            return value
+    return None
+
+
+def _client_ip(scope: Scope) -> Optional[str]:
+    """Return the client host from the ASGI scope, if the server gave one."""
+    client = scope.get("client")
+    return client[0] if client else None
+
+
+class AuthMiddleware:
     """
     Authentication middleware that validates JWT tokens and adds user context.
     
     This middleware:
     1. Extracts JWT tokens from Authorization headers
-    2. Validates tokens and adds user context to request state
+    2. Validates tokens and exposes them through get_current_token_data
     3. Handles authentication errors gracefully
     4. Logs authentication events for security monitoring
     """
     
-    def __init__(self, app, exclude_paths: Optional[list[str]] = None):
+    # The 401 reply never varies, so it is encoded once
+    _UNAUTHORIZED_BODY = orjson.dumps({"detail": "Authentication required"})
+    _UNAUTHORIZED_HEADERS = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(_UNAUTHORIZED_BODY)).encode()),
+        (b"www-authenticate", b"Bearer"),
+    ]
+    
+    # Added to every response that passes through authentication
+    _SECURITY_HEADERS = [
+        (b"x-content-type-options", b"nosniff"),
+        (b"x-frame-options", b"DENY"),
+        (b"x-xss-protection", b"1; mode=block"),
+    ]
+    
+    def __init__(self, app: ASGIApp, exclude_paths: Optional[list[str]] = None):
         """
         Initialize authentication middleware.
         
         Args:
-            app: FastAPI application instance
+            app: ASGI application to wrap
             exclude_paths: List of paths to exclude from authentication
         """
-        super().__init__(app)
+        self.app = app
         self.exclude_paths = exclude_paths or [
             "/docs",
             "/redoc", 
@@ -46,43 +97,53 @@ class AuthMiddleware(BaseHTTPMiddleware):
             "/auth/register",
             "/auth/register-vendor",
         ]
+        # str.startswith checks a tuple of prefixes in a single C call
+        self._exclude_prefixes = tuple(self.exclude_paths)
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
-        Process request through authentication middleware.
+        Process a request through authentication middleware.
         
         Args:
-            request: Incoming HTTP request
-            call_next: Next middleware/handler in chain
-            
-        Returns:
-            HTTP response
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
         """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
         start_time = time.time()
+        path = scope["path"]
         
         # Skip authentication for excluded paths
-        if any(request.url.path.startswith(path) for path in self.exclude_paths):
-            return await call_next(request)
+        if path.startswith(self._exclude_prefixes):
+            await self.app(scope, receive, send)
+            return
+        
+        context_token = None
         
         # Extract token from Authorization header
-        authorization = request.headers.get("Authorization")
-        scheme, token = get_authorization_scheme_param(authorization)
+        authorization = _header(scope, b"authorization")
+        if authorization:
+            scheme, _, token = authorization.partition(b" ")
+        else:
+            scheme = token = b""
         
-        if authorization and scheme.lower() == "bearer" and token:
+        if token and scheme.lower() == b"bearer":
             try:
-                # Verify token and add user context to request state
-                token_data = verify_token(token)
-                request.state.user_id = token_data.user_id
-                request.state.user_type = token_data.user_type
-                request.state.phone_number = token_data.phone_number
-                request.state.authenticated = True
+                # Verify token and make it available to the handler
+                token_data = verify_token(token.decode("latin-1"))
+                context_token = _current_token.set(token_data)
                 
-                logger.info(
+                # Debug level: filtered out before any processor runs
+                # unless LOG_LEVEL=DEBUG, so the hot path does no log I/O
+                logger.debug(
                     "Authentication successful",
-                    user_id=str(token_data.user_id),
+                    user_id=token_data.user_id,
                     user_type=token_data.user_type,
-                    path=request.url.path,
-                    method=request.method,
+                    path=path,
+                    method=scope["method"],
                 )
                 
             except HTTPException as e:
@@ -90,86 +151,125 @@ class AuthMiddleware(BaseHTTPMiddleware):
                 logger.warning(
                     "Authentication failed",
                     error=e.detail,
-                    path=request.url.path,
-                    method=request.method,
-                    client_ip=request.client.host if request.client else None,
+                    path=path,
+                    method=scope["method"],
+                    client_ip=_client_ip(scope),
                 )
                 
                 # For API endpoints, return 401
-                if request.url.path.startswith("/api/"):
-                    return Response(
-                        content='{"detail": "Authentication required"}',
-                        status_code=status.HTTP_401_UNAUTHORIZED,
-                        headers={"WWW-Authenticate": "Bearer"},
-                        media_type="application/json",
-                    )
+                if path.startswith("/api/"):
+                    await send({
+                        "type": "http.response.start",
+                        "status": status.HTTP_401_UNAUTHORIZED,
+                        "headers": self._UNAUTHORIZED_HEADERS,
+                    })
+                    await send({"type": "http.response.body", "body": self._UNAUTHORIZED_BODY})
+                    return
                 
-                # For other endpoints, let the handler decide
-                request.state.authenticated = False
-        else:
-            request.state.authenticated = False
+                # For other endpoints, let the handler decide; it sees no
+                # token data, as for an unauthenticated request
         
-        # Process request
-        response = await call_next(request)
-        
-        # Add security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        
-        # Add processing time header in debug mode
-        if settings.debug:
-            process_time = time.time() - start_time
-            response.headers["X-Process-Time"] = str(process_time)
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Add security headers
+                headers = [*message.get("headers", ()), *self._SECURITY_HEADERS]
+                
+                # Add processing time header in debug mode
+                if settings.debug:
+                    process_time = time.time() - start_time
+                    headers.append((b"x-process-time", str(process_time).encode()))
+                message["headers"] = headers
+            await send(message)
         
-        return response
+        # Process request
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            if context_token is not None:
+                _current_token.reset(context_token)
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+class RateLimitMiddleware:
     """
     Rate limiting middleware to prevent abuse.
     
-    This is a simple in-memory rate limiter. In production, you would
-    want to use Redis or another distributed cache for rate limiting.
+    Counts are kept in Redis when a manager is given, so the limit holds
+    across worker processes. Without one, or while Redis is unreachable,
+    each process counts in memory.
     """
     
-    def __init__(self, app, requests_per_minute: int = 60):
+    _RATE_LIMITED_BODY = orjson.dumps({"detail": "Rate limit exceeded. Please try again later."})
+    
+    def __init__(
+        self,
+        app: ASGIApp,
+        requests_per_minute: int = 60,
+        redis_manager: Optional[RedisManager] = None,
+    ):
         """
         Initialize rate limiting middleware.
         
         Args:
-            app: FastAPI application instance
+            app: ASGI application to wrap
             requests_per_minute: Maximum requests per minute per IP
+            redis_manager: Shared Redis manager for cross-process counting
         """
-        super().__init__(app)
+        self.app = app
         self.requests_per_minute = requests_per_minute
-        self.request_counts = {}  # In production, use Redis
+        self.redis_manager = redis_manager
+        # The 429 reply only depends on the configured limit, so it is
+        # encoded once here rather than per rejected request
+        self._rate_limited_headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(self._RATE_LIMITED_BODY)).encode()),
+            (b"retry-after", b"60"),
+            (b"x-ratelimit-limit", str(requests_per_minute).encode()),
+            (b"x-ratelimit-remaining", b"0"),
+        ]
+        # Local request counts per client IP for the current minute only
+        self.request_counts: dict[str, int] = {}
+        self._window = 0
+    
+    async def _increment(self, client_ip: str, current_time: int) -> int:
+        """Count a request from ``client_ip`` and return its count this minute."""
+        if self.redis_manager is not None:
+            try:
+                return await self.redis_manager.increment_with_ttl(
+                    f"rl:{client_ip}:{current_time}", 60
+                )
+            except Exception as e:
+                logger.warning("Rate limit counter unavailable", error=str(e))
+        
+        # Start a fresh window when the minute rolls over; counts from earlier
+        # minutes never apply again, so they are dropped wholesale
+        if current_time != self._window:
+            self._window = current_time
+            self.request_counts = {}
+        
+        count = self.request_counts.get(client_ip, 0) + 1
+        self.request_counts[client_ip] = count
+        return count
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
-        Process request through rate limiting middleware.
+        Process a request through rate limiting middleware.
         
         Args:
-            request: Incoming HTTP request
-            call_next: Next middleware/handler in chain
-            
-        Returns:
-            HTTP response
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
         """
-        client_ip = request.client.host if request.client else "unknown"
-        current_time = int(time.time() / 60)  # Current minute
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        # Clean old entries (simple cleanup)
-        self.request_counts = {
-            key: count for key, count in self.request_counts.items()
-            if key[1] >= current_time - 1
-        }
+        client_ip = _client_ip(scope) or "unknown"
+        current_time = int(time.time() / 60)  # Current minute
         
-        # Check rate limit
-        key = (client_ip, current_time)
-        current_requests = self.request_counts.get(key, 0)
+        # Count this request, then check the limit
+        current_requests = await self._increment(client_ip, current_time)
         
-        if current_requests >= self.requests_per_minute:
+        if current_requests > self.requests_per_minute:
             logger.warning(
                 "Rate limit exceeded",
                 client_ip=client_ip,
@@ -177,26 +277,23 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 limit=self.requests_per_minute,
             )
             
-            return Response(
-                content='{"detail": "Rate limit exceeded. Please try again later."}',
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                headers={
-                    "Retry-After": "60",
-                    "X-RateLimit-Limit": str(self.requests_per_minute),
-                    "X-RateLimit-Remaining": "0",
-                },
-                media_type="application/json",
-            )
-        
-        # Increment request count
-        self.request_counts[key] = current_requests + 1
+            await send({
+                "type": "http.response.start",
+                "status": status.HTTP_429_TOO_MANY_REQUESTS,
+                "headers": self._rate_limited_headers,
+            })
+            await send({"type": "http.response.body", "body": self._RATE_LIMITED_BODY})
+            return
         
-        # Process request
-        response = await call_next(request)
+        remaining = max(0, self.requests_per_minute - current_requests)
         
-        # Add rate limit headers
-        remaining = max(0, self.requests_per_minute - self.request_counts[key])
-        response.headers["X-RateLimit-Limit"] = str(self.requests_per_minute)
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Add rate limit headers
+                headers = MutableHeaders(scope=message)
+                headers["X-RateLimit-Limit"] = str(self.requests_per_minute)
+                headers["X-RateLimit-Remaining"] = str(remaining)
+            await send(message)
         
-        return response
\ No newline at end of file
+        # Process request
+        await self.app(scope, receive, send_with_headers)
@@ -4,34 +4,47 @@ Authentication schemas for the Multilingual Mandi Platform.
 This module defines Pydantic models for authentication requests and responses.
 """
 
-from typing import Optional
+from dataclasses import dataclass
+from typing import Annotated, Any, Literal, Optional
 from uuid import UUID
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, BeforeValidator, Field, StringConstraints
 import re
 
 
+_PHONE_STRIP = re.compile(r'[^\d+]')
+
+
+def _strip_phone_number(v: Any) -> Any:
+    """Remove any spaces or special characters except + from a phone number."""
+    return _PHONE_STRIP.sub('', v) if isinstance(v, str) else v
+
+
+# Field types checked entirely by pydantic-core, so the request models need
+# no Python validator methods. Phone numbers must be in Indian format
+# (+91XXXXXXXXXX) once separators are stripped.
+PhoneNumber = Annotated[
+    str,
+    BeforeValidator(_strip_phone_number),
+    StringConstraints(pattern=r'^\+91[6-9]\d{9}$'),
+]
+PreferredLanguage = Literal["hi", "en", "ta", "te", "bn", "mr", "gu", "kn", "ml", "pa"]
+TechLiteracy = Literal["beginner", "intermediate", "advanced"]
+BusinessType = Literal[
+    "individual_trader", "small_business", "cooperative", 
+    "wholesaler", "retailer", "farmer", "manufacturer"
+]
+
+
 class LoginRequest(BaseModel):
     """Request model for user login."""
     
-    phone_number: str = Field(
+    phone_number: PhoneNumber = Field(
         ..., 
         description="User's phone number with country code",
-        example="+919876543210"
+        examples=["+919876543210"]
     )
     # For now, we'll use phone number as the primary authentication method
     # In a real system, you might want to add OTP verification
-    
-    @validator("phone_number")
-    def validate_phone_number(cls, v):
-        """Validate phone number format."""
-        # Remove any spaces or special characters except +
-        cleaned = re.sub(r'[^\d+]', '', v)
-        
-        # Check if it's a valid Indian phone number format
-        if not re.match(r'^\+91[6-9]\d{9}$', cleaned):
-            raise ValueError("Invalid Indian phone number format. Use +91XXXXXXXXXX")
-        
-        return cleaned
 
 
 class LoginResponse(BaseModel):
@@ -53,13 +66,19 @@ class Token(BaseModel):
     token_type: str = Field(default="bearer", description="Token type")
 
 
-class TokenData(BaseModel):
-    """Token payload data."""
+@dataclass(slots=True, frozen=True)
+class TokenData:
+    """
+    Token payload data.
     
-    user_id: UUID = Field(..., description="User ID")
-    user_type: str = Field(..., description="User type (user or vendor)")
-    phone_number: str = Field(..., description="User's phone number")
-    exp: Optional[int] = Field(None, description="Token expiration timestamp")
+    Only ever built from a token whose signature has just been verified, so
+    it is a plain frozen dataclass rather than a validating model. Frozen
+    also makes it safe to hand the same cached instance to many requests.
+    """
+    user_id: UUID
+    user_type: str  # "user" or "vendor"
+    phone_number: str
+    exp: Optional[int] = None  # Expiration timestamp
 
 
 class RefreshTokenRequest(BaseModel):
@@ -79,54 +98,26 @@ class LogoutRequest(BaseModel):
 class UserRegistrationRequest(BaseModel):
     """Request model for user registration."""
     
-    phone_number: str = Field(
+    phone_number: PhoneNumber = Field(
         ..., 
         description="User's phone number with country code",
-        example="+919876543210"
+        examples=["+919876543210"]
     )
-    preferred_language: str = Field(
+    preferred_language: PreferredLanguage = Field(
         default="hi",
         description="User's preferred language code",
-        example="hi"
+        examples=["hi"]
     )
     location: str = Field(
         ...,
         description="User's location",
-        example="Mumbai, Maharashtra, India"
+        examples=["Mumbai, Maharashtra, India"]
     )
-    tech_literacy_level: str = Field(
+    tech_literacy_level: TechLiteracy = Field(
         default="beginner",
         description="User's technology literacy level",
-        example="beginner"
+        examples=["beginner"]
     )
-    
-    @validator("phone_number")
-    def validate_phone_number(cls, v):
-        """Validate phone number format."""
-        # Remove any spaces or special characters except +
-        cleaned = re.sub(r'[^\d+]', '', v)
-        
-        # Check if it's a valid Indian phone number format
-        if not re.match(r'^\+91[6-9]\d{9}$', cleaned):
-            raise ValueError("Invalid Indian phone number format. Use +91XXXXXXXXXX")
-        
-        return cleaned
-    
-    @validator("preferred_language")
-    def validate_language(cls, v):
-        """Validate language code."""
-        valid_languages = ["hi", "en", "ta", "te", "bn", "mr", "gu", "kn", "ml", "pa"]
-        if v not in valid_languages:
-            raise ValueError(f"Language must be one of: {', '.join(valid_languages)}")
-        return v
-    
-    @validator("tech_literacy_level")
-    def validate_tech_literacy(cls, v):
-        """Validate tech literacy level."""
-        valid_levels = ["beginner", "intermediate", "advanced"]
-        if v not in valid_levels:
-            raise ValueError(f"Tech literacy level must be one of: {', '.join(valid_levels)}")
-        return v
 
 
 class VendorRegistrationRequest(UserRegistrationRequest):
@@ -135,21 +126,10 @@ class VendorRegistrationRequest(UserRegistrationRequest):
     business_name: str = Field(
         ...,
         description="Business name",
-        example="Sharma Vegetables"
+        examples=["Sharma Vegetables"]
     )
-    business_type: str = Field(
+    business_type: BusinessType = Field(
         ...,
         description="Type of business",
-        example="retailer"
-    )
-    
-    @validator("business_type")
-    def validate_business_type(cls, v):
-        """Validate business type."""
-        valid_types = [
-            "individual_trader", "small_business", "cooperative", 
-            "wholesaler", "retailer", "farmer", "manufacturer"
-        ]
-        if v not in valid_types:
-            raise ValueError(f"Business type must be one of: {', '.join(valid_types)}")
-        return v
\ No newline at end of file
+        examples=["retailer"]
+    )
\ No newline at end of file
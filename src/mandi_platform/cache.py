@@ -0,0 +1,186 @@
+"""
+Response caching backed by Redis.
+
+Cached values are stored as serialized JSON response bodies so a hit can be
+returned to the client without touching the database or re-validating
+models. Concurrent misses for the same key are coalesced into a single load
+per process. Redis failures never fail a request: reads fall through to the
+database and invalidations are logged.
+"""
+
+import asyncio
+import hashlib
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import orjson
+import structlog
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+from .redis_client import get_redis_manager
+
+logger = structlog.get_logger(__name__)
+
+# Loads currently running in this process, keyed by cache key
+_in_flight: Dict[str, "asyncio.Future[str]"] = {}
+
+
+async def get_or_set(
+    key: str,
+    compute: Callable[[], Awaitable[Any]],
+    ttl: int,
+) -> str:
+    """
+    Return the cached JSON body for ``key``, computing and storing it on a miss.
+    
+    Args:
+        key: Cache key
+        compute: Coroutine factory producing the response payload, or its
+            already-encoded JSON bytes
+        ttl: Time to live in seconds
+    
+    Returns:
+        JSON-encoded response body
+    """
+    redis_manager = get_redis_manager()
+    
+    try:
+        cached = await redis_manager.get(key)
+    except Exception as e:
+        logger.warning("Cache read failed", key=key, error=str(e))
+        cached = None
+    
+    if cached is not None:
+        return cached
+    
+    # Concurrent misses for the same key in this process share one load
+    in_flight = _in_flight.get(key)
+    if in_flight is not None:
+        return await asyncio.shield(in_flight)
+    
+    future = asyncio.get_running_loop().create_future()
+    _in_flight[key] = future
+    try:
+        payload = await compute()
+        if isinstance(payload, BaseModel):
+            body = payload.model_dump_json()
+        elif isinstance(payload, bytes):
+            body = payload.decode()
+        else:
+            body = orjson.dumps(jsonable_encoder(payload)).decode()
+        future.set_result(body)
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        # Mark as retrieved; waiters, if any, still receive it
+        future.exception()
+        raise
+    finally:
+        _in_flight.pop(key, None)
+    
+    try:
+        await redis_manager.set(key, body, ttl=ttl)
+    except Exception as e:
+        logger.warning("Cache write failed", key=key, error=str(e))
+    
+    return body
+
+
+async def delete(key: str) -> None:
+    """Remove a single cache entry."""
+    try:
+        await get_redis_manager().delete(key)
+    except Exception as e:
+        logger.warning("Cache delete failed", key=key, error=str(e))
+
+
+async def delete_pattern(pattern: str) -> None:
+    """Remove every cache entry matching a glob pattern."""
+    try:
+        await get_redis_manager().delete_pattern(pattern)
+    except Exception as e:
+        logger.warning("Cache pattern delete failed", pattern=pattern, error=str(e))
+
+
+def etag_for(body: str) -> str:
+    """Weak ETag for a cached JSON body."""
+    return f'W/"{hashlib.blake2b(body.encode(), digest_size=12).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag using weak comparison."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def product_key(product_id: Any) -> str:
+    """Cache key for a single product response."""
+    return f"product:{product_id}:v1"
+
+
+def product_list_key(
+    vendor_id: Optional[Any],
+    category_id: Optional[Any],
+    active_only: bool,
+    page: int,
+    page_size: int,
+    after: Optional[str] = None,
+) -> str:
+    """Cache key for a paginated product listing."""
+    return f"products:list:{vendor_id}:{category_id}:{active_only}:{page}:{page_size}:{after}"
+
+
+def featured_products_key(category_id: Optional[Any], limit: int) -> str:
+    """Cache key for the featured products listing."""
+    return f"products:featured:{category_id}:{limit}"
+
+
+def vendor_write_key(vendor_id: Any) -> str:
+    """Key marking a recent product write by a vendor."""
+    return f"search:vendor_write:{vendor_id}"
+
+
+async def mark_vendor_write(vendor_id: Any, ttl: int) -> None:
+    """Record that a vendor's products changed within the last ``ttl`` seconds."""
+    try:
+        await get_redis_manager().set(vendor_write_key(vendor_id), "1", ttl=ttl)
+    except Exception as e:
+        logger.warning("Vendor write marker failed", vendor_id=vendor_id, error=str(e))
+
+
+async def has_recent_vendor_write(vendor_id: Any) -> bool:
+    """Check whether the search index may not yet reflect a vendor's writes."""
+    try:
+        return await get_redis_manager().exists(vendor_write_key(vendor_id))
+    except Exception as e:
+        logger.warning("Vendor write marker read failed", vendor_id=vendor_id, error=str(e))
+        return False
+
+
+async def invalidate_product(
+    product_id: Any,
+    vendor_id: Any,
+    category_id: Optional[Any] = None,
+) -> None:
+    """
+    Drop every cached response that may contain the given product.
+    
+    When the category is not known, all category listings are dropped.
+    """
+    await delete(product_key(product_id))
+    await delete_pattern(f"products:list:*{vendor_id}*")
+    if category_id is not None:
+        await delete_pattern(f"products:list:*{category_id}*")
+    else:
+        await delete_pattern("products:list:None:*")
+    await delete_pattern("products:featured:*")
@@ -7,16 +7,25 @@ This module provides CLI commands for development, deployment, and maintenance.
 import asyncio
 from typing import Optional
 import typer
-import uvicorn
 from rich.console import Console
 from rich.table import Table
 
 from .config import settings
-from .database import init_database, close_database, get_database_manager
-from .redis_client import get_redis_manager, close_redis
-from .elasticsearch_client import get_elasticsearch_manager, close_elasticsearch
 from .cli.translation import app as translation_app
 
+# uvicorn and the database, Redis and Elasticsearch clients are imported by
+# the commands that use them, so `--help` and `config` start quickly
+
+# Per-language text fields for multilingual product attributes; English
+# gets stemming, the Indic languages use the standard analyzer
+_MULTILINGUAL_TEXT_MAPPING = {
+    "type": "object",
+    "properties": {
+        code: {"type": "text", "analyzer": "english" if code == "en" else "standard"}
+        for code in ("hi", "en", "ta", "te", "bn", "mr", "gu", "kn", "ml", "pa")
+    },
+}
+
 app = typer.Typer(
     name="mandi-server",
     help="Multilingual Mandi Platform CLI",
@@ -50,6 +59,8 @@ def dev(
     console.print(f"API documentation: http://{host}:{port}/docs")
     console.print(f"Alternative docs: http://{host}:{port}/redoc")
     
+    import uvicorn
+    
     uvicorn.run(
         "mandi_platform.main:app",
         host=host,
@@ -78,6 +89,8 @@ def serve(
     """Start the production server."""
     console.print("[bold blue]Starting Multilingual Mandi Platform (Production)[/bold blue]")
     
+    import uvicorn
+    
     uvicorn.run(
         "mandi_platform.main:app",
         host=host,
@@ -85,6 +98,11 @@ def serve(
         workers=workers,
         log_level=log_level,
         access_log=True,
+        # uvloop and httptools ship with uvicorn[standard]; request them
+        # explicitly so a missing extra fails loudly instead of silently
+        # falling back to the slower pure-Python implementations
+        loop="uvloop",
+        http="httptools",
     )
 
 
@@ -93,6 +111,8 @@ def init_db():
     """Initialize the database with tables."""
     console.print("[bold yellow]Initializing database...[/bold yellow]")
     
+    from .database import init_database, close_database
+    
     async def _init():
         try:
             await init_database()
@@ -111,49 +131,55 @@ def check_health():
     """Check the health of all system components."""
     console.print("[bold yellow]Checking system health...[/bold yellow]")
     
-    async def _check():
-        table = Table(title="System Health Check")
-        table.add_column("Component", style="cyan")
-        table.add_column("Status", style="magenta")
-        table.add_column("Details", style="green")
-        
-        # Check database
+    from .database import close_database, get_database_manager
+    from .redis_client import get_redis_manager, close_redis
+    from .elasticsearch_client import get_elasticsearch_manager, close_elasticsearch
+    
+    async def _check_database() -> tuple[str, str, str]:
         try:
-            db_manager = get_database_manager()
-            async with db_manager.engine.begin() as conn:
-                await conn.execute("SELECT 1")
-            table.add_row("Database", "✓ Healthy", f"Connected to {settings.database_url.split('@')[-1]}")
+            await get_database_manager().ping()
+            return ("Database", "✓ Healthy", f"Connected to {settings.database_url.split('@')[-1]}")
         except Exception as e:
-            table.add_row("Database", "✗ Unhealthy", str(e))
-        
-        # Check Redis
+            return ("Database", "✗ Unhealthy", str(e))
+    
+    async def _check_redis() -> tuple[str, str, str]:
         try:
             redis_manager = get_redis_manager()
             is_connected = await redis_manager.ping()
             if is_connected:
-                table.add_row("Redis", "✓ Healthy", f"Connected to {settings.redis_url.split('@')[-1]}")
-            else:
-                table.add_row("Redis", "✗ Unhealthy", "Ping failed")
+                return ("Redis", "✓ Healthy", f"Connected to {settings.redis_url.split('@')[-1]}")
+            return ("Redis", "✗ Unhealthy", "Ping failed")
         except Exception as e:
-            table.add_row("Redis", "✗ Unhealthy", str(e))
-        
-        # Check Elasticsearch
+            return ("Redis", "✗ Unhealthy", str(e))
+    
+    async def _check_elasticsearch() -> tuple[str, str, str]:
         try:
             es_manager = get_elasticsearch_manager()
             is_connected = await es_manager.ping()
             if is_connected:
-                table.add_row("Elasticsearch", "✓ Healthy", f"Connected to {settings.elasticsearch_url}")
-            else:
-                table.add_row("Elasticsearch", "✗ Unhealthy", "Ping failed")
+                return ("Elasticsearch", "✓ Healthy", f"Connected to {settings.elasticsearch_url}")
+            return ("Elasticsearch", "✗ Unhealthy", "Ping failed")
         except Exception as e:
-            table.add_row("Elasticsearch", "✗ Unhealthy", str(e))
+            return ("Elasticsearch", "✗ Unhealthy", str(e))
+    
+    async def _check():
+        table = Table(title="System Health Check")
+        table.add_column("Component", style="cyan")
+        table.add_column("Status", style="magenta")
+        table.add_column("Details", style="green")
+        
+        # The probes are independent, so they run concurrently and the
+        # check takes as long as the slowest one
+        rows = await asyncio.gather(
+            _check_database(), _check_redis(), _check_elasticsearch()
+        )
+        for row in rows:
+            table.add_row(*row)
         
         console.print(table)
         
         # Cleanup
-        await close_database()
-        await close_redis()
-        await close_elasticsearch()
+        await asyncio.gather(close_database(), close_redis(), close_elasticsearch())
     
     asyncio.run(_check())
 
@@ -192,6 +218,8 @@ def create_indices():
     """Create Elasticsearch indices for the application."""
     console.print("[bold yellow]Creating Elasticsearch indices...[/bold yellow]")
     
+    from .elasticsearch_client import get_elasticsearch_manager, close_elasticsearch
+    
     async def _create():
         try:
             es_manager = get_elasticsearch_manager()
@@ -201,36 +229,8 @@ def create_indices():
                 "properties": {
                     "id": {"type": "keyword"},
                     "vendor_id": {"type": "keyword"},
-                    "name": {
-                        "type": "object",
-                        "properties": {
-                            "hi": {"type": "text", "analyzer": "standard"},
-                            "en": {"type": "text", "analyzer": "english"},
-                            "ta": {"type": "text", "analyzer": "standard"},
-                            "te": {"type": "text", "analyzer": "standard"},
-                            "bn": {"type": "text", "analyzer": "standard"},
-                            "mr": {"type": "text", "analyzer": "standard"},
-                            "gu": {"type": "text", "analyzer": "standard"},
-                            "kn": {"type": "text", "analyzer": "standard"},
-                            "ml": {"type": "text", "analyzer": "standard"},
-                            "pa": {"type": "text", "analyzer": "standard"},
-                        }
-                    },
-                    "description": {
-                        "type": "object",
-                        "properties": {
-                            "hi": {"type": "text", "analyzer": "standard"},
-                            "en": {"type": "text", "analyzer": "english"},
-                            "ta": {"type": "text", "analyzer": "standard"},
-                            "te": {"type": "text", "analyzer": "standard"},
-                            "bn": {"type": "text", "analyzer": "standard"},
-                            "mr": {"type": "text", "analyzer": "standard"},
-                            "gu": {"type": "text", "analyzer": "standard"},
-                            "kn": {"type": "text", "analyzer": "standard"},
-                            "ml": {"type": "text", "analyzer": "standard"},
-                            "pa": {"type": "text", "analyzer": "standard"},
-                        }
-                    },
+                    "name": _MULTILINGUAL_TEXT_MAPPING,
+                    "description": _MULTILINGUAL_TEXT_MAPPING,
                     "category": {"type": "keyword"},
                     "base_price": {"type": "float"},
                     "unit": {"type": "keyword"},
@@ -249,10 +249,6 @@ def create_indices():
                 }
             }
             
-            # Create product index
-            await es_manager.create_index("products", product_mapping)
-            console.print("[bold green]✓ Products index created[/bold green]")
-            
             # User index mapping (for search and analytics)
             user_mapping = {
                 "properties": {
@@ -273,8 +269,12 @@ def create_indices():
                 }
             }
             
-            # Create user index
-            await es_manager.create_index("users", user_mapping)
+            # The indices are independent, so create them concurrently
+            await asyncio.gather(
+                es_manager.create_index("products", product_mapping),
+                es_manager.create_index("users", user_mapping),
+            )
+            console.print("[bold green]✓ Products index created[/bold green]")
             console.print("[bold green]✓ Users index created[/bold green]")
             
         except Exception as e:
@@ -5,9 +5,10 @@ This module handles all application configuration using Pydantic Settings
 for type safety and validation.
 """
 
-from typing import List, Optional
-from pydantic import Field, validator
-from pydantic_settings import BaseSettings
+from functools import lru_cache
+from typing import Annotated, List, Optional
+from pydantic import Field, field_validator
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
 
 
 class Settings(BaseSettings):
@@ -33,6 +34,15 @@ class Settings(BaseSettings):
     test_database_url: Optional[str] = Field(
         default=None, description="Test database URL"
     )
+    # Each worker process owns its own pool, so size it to the concurrency
+    # ceiling divided by the number of workers.
+    sqlalchemy_pool_size: int = Field(default=25, description="Persistent pool connections")
+    sqlalchemy_max_overflow: int = Field(
+        default=25, description="Extra connections allowed above the pool size"
+    )
+    sqlalchemy_pool_recycle: int = Field(
+        default=1800, description="Seconds before a pooled connection is replaced"
+    )
     
     # Redis
     redis_url: str = Field(..., description="Redis connection URL")
@@ -42,12 +52,26 @@ class Settings(BaseSettings):
         default=86400, description="Translation cache TTL"
     )
     price_cache_ttl: int = Field(default=900, description="Price cache TTL")
+    product_cache_ttl: int = Field(default=300, description="Product detail cache TTL")
+    product_list_cache_ttl: int = Field(
+        default=120, description="Product listing cache TTL"
+    )
+    last_active_flush_interval: int = Field(
+        default=60, description="Seconds between last_active flushes to the database"
+    )
+    price_history_partitions_ahead: int = Field(
+        default=3, description="Months of price_history partitions created ahead of time"
+    )
     
     # Elasticsearch
     elasticsearch_url: str = Field(..., description="Elasticsearch cluster URL")
     elasticsearch_index_prefix: str = Field(
         default="mandi_platform", description="Index prefix"
     )
+    search_index_lag_seconds: int = Field(
+        default=2,
+        description="Seconds after a vendor's product write during which their searches read from PostgreSQL",
+    )
     
     # External APIs
     google_translate_api_key: Optional[str] = Field(
@@ -58,13 +82,14 @@ class Settings(BaseSettings):
     )
     
     # Languages
-    supported_languages: List[str] = Field(
+    # NoDecode: read as comma-separated strings, not JSON (see _split_csv)
+    supported_languages: Annotated[List[str], NoDecode] = Field(
         default=["hi", "en", "ta", "te", "bn", "mr", "gu", "kn", "ml", "pa"],
         description="Supported language codes"
     )
     
     # CORS
-    cors_origins: List[str] = Field(
+    cors_origins: Annotated[List[str], NoDecode] = Field(
         default=["http://localhost:3000", "http://localhost:8080"],
         description="Allowed CORS origins"
     )
@@ -80,32 +105,34 @@ class Settings(BaseSettings):
     email_username: Optional[str] = Field(default=None, description="Email username")
     email_password: Optional[str] = Field(default=None, description="Email password")
     
-    @validator("supported_languages", pre=True)
-    def parse_languages(cls, v):
-        """Parse comma-separated language string into list."""
-        if isinstance(v, str):
-            return [lang.strip() for lang in v.split(",") if lang.strip()]
-        return v
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+    )
     
-    @validator("cors_origins", pre=True)
-    def parse_cors_origins(cls, v):
-        """Parse comma-separated CORS origins string into list."""
+    @field_validator("supported_languages", "cors_origins", mode="before")
+    @classmethod
+    def _split_csv(cls, v):
+        """Parse a comma-separated string into a list."""
         if isinstance(v, str):
-            return [origin.strip() for origin in v.split(",") if origin.strip()]
+            return [item.strip() for item in v.split(",") if item.strip()]
         return v
-    
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = False
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get the application settings, reading the environment only once."""
+    return Settings()
 
 
 # Global settings instance
-settings = Settings()
+settings = get_settings()
 
 
 def get_database_url(test: bool = False) -> str:
     """Get the appropriate database URL."""
+    settings = get_settings()
     if test and settings.test_database_url:
         return settings.test_database_url
     return settings.database_url
@@ -113,6 +140,7 @@ def get_database_url(test: bool = False) -> str:
 
 def get_redis_url(test: bool = False) -> str:
     """Get the appropriate Redis URL."""
+    settings = get_settings()
     if test and settings.test_redis_url:
         return settings.test_redis_url
     return settings.redis_url
\ No newline at end of file
@@ -7,7 +7,7 @@ This module provides a generic base class for common database operations.
 from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
 from uuid import UUID
 
-from sqlalchemy import select, update, delete, func
+from sqlalchemy import bindparam, exists, select, update, delete, func, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -17,6 +17,9 @@ ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType")
 UpdateSchemaType = TypeVar("UpdateSchemaType")
 
+# Planner row estimate kept by autovacuum / ANALYZE; -1 if never analyzed
+_ESTIMATED_COUNT = text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)")
+
 
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """Base class for CRUD operations."""
@@ -24,11 +27,20 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: Type[ModelType]):
         """Initialize with SQLAlchemy model."""
         self.model = model
+        self._table_name = model.__tablename__
+        # Statements are built once per model; each call only binds parameters
+        self._get_multi_stmt = select(model).offset(bindparam("skip")).limit(bindparam("limit"))
+        self._count_stmt = select(func.count(model.id))
+        self._exists_stmt = select(exists().where(model.id == bindparam("id")))
     
     async def get(self, db: AsyncSession, id: UUID) -> Optional[ModelType]:
-        """Get a single record by ID."""
-        result = await db.execute(select(self.model).where(self.model.id == id))
-        return result.scalar_one_or_none()
+        """
+        Get a single record by ID.
+        
+        Objects already loaded in this session are returned from its identity
+        map without another round trip.
+        """
+        return await db.get(self.model, id)
     
     async def get_multi(
         self, 
@@ -38,15 +50,13 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         limit: int = 100
     ) -> List[ModelType]:
         """Get multiple records with pagination."""
-        result = await db.execute(
-            select(self.model).offset(skip).limit(limit)
-        )
+        result = await db.execute(self._get_multi_stmt, {"skip": skip, "limit": limit})
         return result.scalars().all()
     
     async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
         """Create a new record."""
-        if hasattr(obj_in, 'dict'):
-            obj_in_data = obj_in.dict()
+        if hasattr(obj_in, 'model_dump'):
+            obj_in_data = obj_in.model_dump()
         else:
             obj_in_data = obj_in
         
@@ -64,8 +74,8 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         obj_in: Union[UpdateSchemaType, Dict[str, Any]]
     ) -> ModelType:
         """Update an existing record."""
-        if hasattr(obj_in, 'dict'):
-            update_data = obj_in.dict(exclude_unset=True)
+        if hasattr(obj_in, 'model_dump'):
+            update_data = obj_in.model_dump(exclude_unset=True)
         else:
             update_data = obj_in
         
@@ -86,14 +96,31 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             await db.commit()
         return db_obj
     
-    async def count(self, db: AsyncSession) -> int:
-        """Count total records."""
-        result = await db.execute(select(func.count(self.model.id)))
+    async def count(self, db: AsyncSession, exact: bool = False) -> int:
+        """
+        Count total records.
+        
+        On PostgreSQL this returns the planner's estimate from pg_class
+        instead of scanning the table, which is O(1) but can trail recent
+        writes until the next autovacuum/ANALYZE. It suits dashboards and
+        page counts; pass ``exact=True`` when the precise number matters.
+        Other databases and never-analyzed tables always count exactly.
+        """
+        if not exact and db.get_bind().dialect.name == "postgresql":
+            result = await db.execute(_ESTIMATED_COUNT, {"table": self._table_name})
+            estimate = result.scalar()
+            if estimate is not None and estimate >= 0:
+                return estimate
+        
+        result = await db.execute(self._count_stmt)
         return result.scalar()
     
     async def exists(self, db: AsyncSession, id: UUID) -> bool:
-        """Check if a record exists by ID."""
-        result = await db.execute(
-            select(self.model.id).where(self.model.id == id)
-        )
-        return result.scalar_one_or_none() is not None
\ No newline at end of file
+        """
+        Check if a record exists by ID.
+        
+        Runs ``SELECT EXISTS (...)`` so the database stops at the first
+        index match and sends back a single boolean.
+        """
+        result = await db.execute(self._exists_stmt, {"id": id})
+        return bool(result.scalar())
@@ -5,16 +5,23 @@ This module provides database operations for product management
 with Elasticsearch synchronization.
 """
 
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any, Tuple
+from datetime import datetime, timedelta
 from decimal import Decimal
 from uuid import UUID
 import logging
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete, and_, or_, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, insert, update, delete, and_, or_, bindparam, func, literal, literal_column, tuple_
+from sqlalchemy.orm import joinedload, raiseload
 
-from ..models.product import Product, ProductCategoryModel, PriceHistory
+from ..models.product import (
+    Product,
+    ProductCategoryModel,
+    PriceHistory,
+    PRODUCT_FLAG_ACTIVE,
+    PRODUCT_FLAG_FEATURED,
+)
 from ..models.enums import (
     LanguageCode,
     ProductCategory,
@@ -25,11 +32,117 @@ from ..models.enums import (
     PriceSource,
     MarketConditions,
 )
+from ..cache import has_recent_vendor_write
 from ..search.product_search import ProductSearchService
 
 logger = logging.getLogger(__name__)
 
 
+# ProductResponse only reads column attributes, so list queries need no eager
+# loading; refuse lazy relationship loads outright so serialising a page can
+# never fan out into one query per row.
+_LIST_LOAD_OPTIONS = (raiseload("*"),)
+
+# Hot lookups are built once at import; each call only binds its parameters.
+_GET_PRODUCT = select(Product).where(Product.id == bindparam("product_id"))
+
+
+def _newest_first_pages(column) -> Dict[Tuple[bool, bool], Any]:
+    """
+    Prebuild the newest-first page queries for rows where ``column == :key``.
+    
+    Keyed by ``(active_only, keyset)``. Keyset pages continue after
+    ``(:after_created_at, :after_id)``; the others skip ``:offset`` rows.
+    All of them take ``:limit``.
+    """
+    pages = {}
+    for active_only in (True, False):
+        for keyset in (True, False):
+            stmt = select(Product).options(*_LIST_LOAD_OPTIONS).where(column == bindparam("key"))
+            if active_only:
+                stmt = stmt.where(Product.is_active)
+            if keyset:
+                stmt = stmt.where(tuple_(Product.created_at, Product.id) < tuple_(
+                    bindparam("after_created_at", type_=Product.created_at.type),
+                    bindparam("after_id", type_=Product.id.type),
+                ))
+            else:
+                stmt = stmt.offset(bindparam("offset"))
+            pages[active_only, keyset] = (
+                stmt.order_by(Product.created_at.desc(), Product.id.desc()).limit(bindparam("limit"))
+            )
+    return pages
+
+
+_PRODUCTS_BY_VENDOR = _newest_first_pages(Product.vendor_id)
+_PRODUCTS_BY_CATEGORY = _newest_first_pages(Product.category_id)
+
+
+async def _fetch_newest_first(
+    db: AsyncSession,
+    pages: Dict[Tuple[bool, bool], Any],
+    key: UUID,
+    active_only: bool,
+    limit: int,
+    offset: int,
+    after: Optional[Tuple[datetime, UUID]],
+) -> List[Product]:
+    """Run the prebuilt page query matching the arguments."""
+    params = {"key": key, "limit": limit}
+    if after is not None:
+        params["after_created_at"], params["after_id"] = after
+    else:
+        params["offset"] = offset
+    result = await db.execute(pages[active_only, after is not None], params)
+    return result.scalars().all()
+
+
+# PostgreSQL text search configuration and generated tsvector column per
+# language. Only English has a built-in stemmer; every other language is
+# matched through the language-agnostic 'simple' column.
+_TEXT_SEARCH_COLUMNS = {
+    LanguageCode.ENGLISH: ("english", "products.search_tsv_en"),
+}
+_DEFAULT_TEXT_SEARCH_COLUMN = ("simple", "products.search_tsv")
+
+# All name translations flattened to text; indexed by idx_products_names_trgm
+# for trigram matching, so the expression must stay in sync with migration 003.
+_PRODUCT_NAMES_TEXT = "jsonb_path_query_array(products.names, '$.*')::text"
+
+
+# Columns update_product may set directly; is_active / is_featured go through
+# the flags bitmask instead. Vendors cannot move a product to another vendor.
+_UPDATABLE_COLUMNS = frozenset(Product.__table__.c.keys()) - {"id", "flags"}
+_VENDOR_UPDATABLE_COLUMNS = _UPDATABLE_COLUMNS - {"vendor_id"}
+
+# Stock bound of the partial idx_products_low_stock index (migration 003)
+_LOW_STOCK_INDEX_LIMIT = 10
+
+
+def _search_conditions(match, vendor_id: Optional[UUID]):
+    """Combine a text match with the active filter and an optional vendor scope."""
+    conditions = [Product.is_active, match]
+    if vendor_id:
+        conditions.append(Product.vendor_id == vendor_id)
+    return and_(*conditions)
+
+
+def _recent_prices(product_id: UUID, days: int, quality_grade: Optional[QualityGrade] = None):
+    """Limit price history to one product's last ``days`` days, optionally one grade."""
+    conditions = [
+        PriceHistory.product_id == product_id,
+        PriceHistory.recorded_at >= datetime.utcnow() - timedelta(days=days),
+    ]
+    if quality_grade:
+        conditions.append(PriceHistory.quality_grade == quality_grade)
+    return and_(*conditions)
+
+
+def _as_decimal(value: Any) -> Optional[Decimal]:
+    """Normalize an aggregate result, which SQLite returns as float, to Decimal."""
+    return Decimal(str(value)) if value is not None else None
+
+
 class ProductCRUD:
     """CRUD operations for Product model."""
     
@@ -65,15 +178,16 @@ class ProductCRUD:
             }
             
             product = Product(**product_data)
+            # Stamped in the same commit; cleared again if indexing fails
+            product.elasticsearch_synced_at = func.now()
             self.db.add(product)
-            await self.db.flush()  # Get the ID without committing
-            
-            # Index in Elasticsearch
-            await self._sync_to_elasticsearch(product)
             
             await self.db.commit()
             await self.db.refresh(product)
             
+            # Index in Elasticsearch
+            await self._sync_to_elasticsearch(product)
+            
             logger.info(f"Created product {product.id}")
             return product
         
@@ -85,19 +199,23 @@ class ProductCRUD:
     async def get_product(self, product_id: UUID) -> Optional[Product]:
         """Get a product by ID."""
         try:
-            stmt = select(Product).where(Product.id == product_id)
-            result = await self.db.execute(stmt)
+            result = await self.db.execute(_GET_PRODUCT, {"product_id": product_id})
             return result.scalar_one_or_none()
         except Exception as e:
             logger.error(f"Error getting product {product_id}: {e}")
             return None
     
     async def get_product_with_vendor(self, product_id: UUID) -> Optional[Product]:
-        """Get a product with vendor information."""
+        """
+        Get a product with vendor information.
+        
+        The vendor is joined into the same query; for a single row that is
+        one round trip instead of selectinload's two.
+        """
         try:
             stmt = (
                 select(Product)
-                .options(selectinload(Product.vendor))
+                .options(joinedload(Product.vendor))
                 .where(Product.id == product_id)
             )
             result = await self.db.execute(stmt)
@@ -111,19 +229,19 @@ class ProductCRUD:
         vendor_id: UUID,
         active_only: bool = True,
         limit: int = 50,
-        offset: int = 0
+        offset: int = 0,
+        after: Optional[Tuple[datetime, UUID]] = None
     ) -> List[Product]:
-        """Get products by vendor ID."""
+        """
+        Get products by vendor ID, newest first.
+        
+        ``after`` is the ``(created_at, id)`` of the last row of the previous
+        page; when given it replaces ``offset`` with a keyset condition.
+        """
         try:
-            stmt = select(Product).where(Product.vendor_id == vendor_id)
-            
-            if active_only:
-                stmt = stmt.where(Product.is_active == True)
-            
-            stmt = stmt.limit(limit).offset(offset).order_by(Product.created_at.desc())
-            
-            result = await self.db.execute(stmt)
-            return result.scalars().all()
+            return await _fetch_newest_first(
+                self.db, _PRODUCTS_BY_VENDOR, vendor_id, active_only, limit, offset, after
+            )
         except Exception as e:
             logger.error(f"Error getting products for vendor {vendor_id}: {e}")
             return []
@@ -133,45 +251,127 @@ class ProductCRUD:
         category_id: UUID,
         active_only: bool = True,
         limit: int = 50,
-        offset: int = 0
+        offset: int = 0,
+        after: Optional[Tuple[datetime, UUID]] = None
     ) -> List[Product]:
-        """Get products by category ID."""
+        """
+        Get products by category ID, newest first.
+        
+        ``after`` works as in get_products_by_vendor.
+        """
+        try:
+            return await _fetch_newest_first(
+                self.db, _PRODUCTS_BY_CATEGORY, category_id, active_only, limit, offset, after
+            )
+        except Exception as e:
+            logger.error(f"Error getting products for category {category_id}: {e}")
+            return []
+    
+    async def count_products_by_vendor(
+        self,
+        vendor_id: UUID,
+        active_only: bool = True
+    ) -> int:
+        """Count products by vendor ID, using the same filters as get_products_by_vendor."""
         try:
-            stmt = select(Product).where(Product.category_id == category_id)
+            stmt = select(func.count()).select_from(Product).where(Product.vendor_id == vendor_id)
             
             if active_only:
-                stmt = stmt.where(Product.is_active == True)
+                stmt = stmt.where(Product.is_active)
             
-            stmt = stmt.limit(limit).offset(offset).order_by(Product.created_at.desc())
+            result = await self.db.execute(stmt)
+            return result.scalar_one()
+        except Exception as e:
+            logger.error(f"Error counting products for vendor {vendor_id}: {e}")
+            return 0
+    
+    async def count_products_by_category(
+        self,
+        category_id: UUID,
+        active_only: bool = True
+    ) -> int:
+        """Count products by category ID, using the same filters as get_products_by_category."""
+        try:
+            stmt = select(func.count()).select_from(Product).where(Product.category_id == category_id)
+            
+            if active_only:
+                stmt = stmt.where(Product.is_active)
             
             result = await self.db.execute(stmt)
-            return result.scalars().all()
+            return result.scalar_one()
         except Exception as e:
-            logger.error(f"Error getting products for category {category_id}: {e}")
-            return []
+            logger.error(f"Error counting products for category {category_id}: {e}")
+            return 0
     
     async def update_product(
         self,
         product_id: UUID,
         **updates
     ) -> Optional[Product]:
-        """Update a product."""
+        """Update a product in one UPDATE ... RETURNING."""
+        return await self._update_returning(product_id, None, updates)
+    
+    async def update_product_as_vendor(
+        self,
+        product_id: UUID,
+        vendor_id: UUID,
+        **updates
+    ) -> Optional[Product]:
+        """
+        Update a product owned by ``vendor_id`` in one UPDATE ... RETURNING.
+        
+        Returns None when the product does not exist, belongs to another
+        vendor, or the update fails; callers that need to tell these apart
+        look the product up afterwards.
+        """
+        return await self._update_returning(product_id, vendor_id, updates)
+    
+    async def _update_returning(
+        self,
+        product_id: UUID,
+        vendor_id: Optional[UUID],
+        updates: Dict[str, Any]
+    ) -> Optional[Product]:
+        """Apply ``updates`` to a product, optionally scoped to its vendor."""
         try:
-            # Get the existing product
-            product = await self.get_product(product_id)
-            if not product:
-                return None
+            # Only the owner-independent columns may change through a vendor
+            columns = _UPDATABLE_COLUMNS if vendor_id is None else _VENDOR_UPDATABLE_COLUMNS
+            values = {key: value for key, value in updates.items() if key in columns}
             
-            # Update fields
-            for key, value in updates.items():
-                if hasattr(product, key):
-                    setattr(product, key, value)
+            # is_active / is_featured are bits of the flags column
+            flags = Product.flags
+            flags_changed = False
+            for name, flag in (("is_active", PRODUCT_FLAG_ACTIVE), ("is_featured", PRODUCT_FLAG_FEATURED)):
+                if name in updates:
+                    flags = flags.op('|')(flag) if updates[name] else flags.op('&')(~flag)
+                    flags_changed = True
+            if flags_changed:
+                values["flags"] = flags
+            
+            # Mark for Elasticsearch sync, stamped in the same commit
+            values["elasticsearch_sync_version"] = Product.elasticsearch_sync_version + 1
+            values["elasticsearch_synced_at"] = func.now()
             
-            # Mark for Elasticsearch sync
-            product._mark_for_elasticsearch_sync()
+            condition = Product.id == product_id
+            if vendor_id is not None:
+                condition = and_(condition, Product.vendor_id == vendor_id)
+            
+            # The RETURNING row overwrites any copy the session already holds,
+            # so there is no need to synchronize the session separately
+            stmt = (
+                update(Product)
+                .where(condition)
+                .values(**values)
+                .returning(Product)
+                .execution_options(synchronize_session=False, populate_existing=True)
+            )
+            
+            result = await self.db.execute(stmt)
+            product = result.scalar_one_or_none()
+            if product is None:
+                return None
             
             await self.db.commit()
-            await self.db.refresh(product)
             
             # Sync to Elasticsearch
             await self._sync_to_elasticsearch(product)
@@ -184,15 +384,18 @@ class ProductCRUD:
             logger.error(f"Error updating product {product_id}: {e}")
             return None
     
-    async def delete_product(self, product_id: UUID) -> bool:
-        """Soft delete a product (mark as inactive)."""
+    async def delete_product(self, product_id: UUID, vendor_id: Optional[UUID] = None) -> bool:
+        """Soft delete a product (mark as inactive), optionally only if owned by ``vendor_id``."""
         try:
             stmt = (
                 update(Product)
                 .where(Product.id == product_id)
-                .values(is_active=False)
+                .values(flags=Product.flags.op('&')(~PRODUCT_FLAG_ACTIVE))
             )
             
+            if vendor_id is not None:
+                stmt = stmt.where(Product.vendor_id == vendor_id)
+            
             result = await self.db.execute(stmt)
             
             if result.rowcount > 0:
@@ -216,27 +419,26 @@ class ProductCRUD:
         product_id: UUID,
         new_quantity: Decimal
     ) -> Optional[Product]:
-        """Update product stock quantity."""
-        try:
-            product = await self.get_product(product_id)
-            if not product:
-                return None
-            
-            product.update_stock(new_quantity)
-            
-            await self.db.commit()
-            await self.db.refresh(product)
-            
-            # Sync to Elasticsearch
-            await self._sync_to_elasticsearch(product)
-            
-            logger.info(f"Updated stock for product {product_id} to {new_quantity}")
-            return product
-        
-        except Exception as e:
-            await self.db.rollback()
-            logger.error(f"Error updating stock for product {product_id}: {e}")
-            return None
+        """Update stock and the availability it implies."""
+        return await self.update_product(
+            product_id,
+            stock_quantity=new_quantity,
+            availability_status=Product.availability_for_stock(new_quantity),
+        )
+    
+    async def update_stock_as_vendor(
+        self,
+        product_id: UUID,
+        vendor_id: UUID,
+        new_quantity: Decimal
+    ) -> Optional[Product]:
+        """Update stock and the availability it implies for a product owned by ``vendor_id``."""
+        return await self.update_product_as_vendor(
+            product_id,
+            vendor_id,
+            stock_quantity=new_quantity,
+            availability_status=Product.availability_for_stock(new_quantity),
+        )
     
     async def search_products(
         self,
@@ -245,9 +447,25 @@ class ProductCRUD:
         filters: Optional[Dict[str, Any]] = None,
         **search_params
     ) -> Dict[str, Any]:
-        """Search products using Elasticsearch."""
+        """
+        Search products using Elasticsearch.
+        
+        Falls back to PostgreSQL full-text search when Elasticsearch is
+        unavailable, and for searches within a vendor's catalog that the
+        vendor changed too recently for the index to have caught up.
+        """
+        vendor_id = (filters or {}).get("vendor_id")
+        if vendor_id and await has_recent_vendor_write(vendor_id):
+            return await self._search_products_fallback(
+                query,
+                language,
+                page=search_params.get("page", 1),
+                page_size=search_params.get("page_size", 20),
+                vendor_id=UUID(str(vendor_id)),
+            )
+        
         try:
-            return await self.search_service.search_products(
+            results = await self.search_service.search_products(
                 query=query,
                 language=language,
                 filters=filters,
@@ -255,42 +473,244 @@ class ProductCRUD:
             )
         except Exception as e:
             logger.error(f"Error searching products: {e}")
-            return {
-                "products": [],
-                "total": 0,
-                "page": 1,
-                "page_size": 20,
-                "total_pages": 0,
-                "has_next": False,
-                "has_prev": False,
-                "error": str(e)
+            results = {"error": str(e)}
+        
+        if "error" in results and (query or vendor_id):
+            return await self._search_products_fallback(
+                query,
+                language,
+                page=search_params.get("page", 1),
+                page_size=search_params.get("page_size", 20),
+                vendor_id=UUID(str(vendor_id)) if vendor_id else None,
+            )
+        return results
+    
+    async def _search_products_fallback(
+        self,
+        query: str,
+        language: LanguageCode,
+        page: int,
+        page_size: int,
+        vendor_id: Optional[UUID] = None
+    ) -> Dict[str, Any]:
+        """Serve a search request from PostgreSQL in the Elasticsearch result format."""
+        offset = (page - 1) * page_size
+        if not query:
+            total = await self.count_products_by_vendor(vendor_id)
+            products = await self.get_products_by_vendor(
+                vendor_id, limit=page_size, offset=offset
+            )
+        else:
+            total = await self.count_full_text_search(
+                query, language=language, vendor_id=vendor_id
+            )
+            if total:
+                products = await self.full_text_search(
+                    query, language=language, limit=page_size, offset=offset, vendor_id=vendor_id
+                )
+            else:
+                # Nothing matched the tsvector, which is common for scripts without
+                # a stemmer; retry with trigram similarity on the product names.
+                total = await self.count_fuzzy_search(query, vendor_id=vendor_id)
+                products = await self.fuzzy_search(
+                    query, limit=page_size, offset=offset, vendor_id=vendor_id
+                )
+        documents = [product.to_elasticsearch_document() for product in products]
+        
+        return {
+            "products": [
+                doc for doc in documents
+                if doc["availability_status"] != AvailabilityStatus.OUT_OF_STOCK.value
+            ],
+            "out_of_stock": [
+                doc for doc in documents
+                if doc["availability_status"] == AvailabilityStatus.OUT_OF_STOCK.value
+            ],
+            "alternatives": [],
+            "suggestions": [],
+            "facets": {},
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "total_pages": (total + page_size - 1) // page_size,
+            "has_next": page * page_size < total,
+            "has_prev": page > 1,
+            "search_metadata": {
+                "query": query,
+                "language": language.value,
+                "backend": "postgresql",
             }
+        }
     
-    async def get_featured_products(
+    def _full_text_clause(self, query: str, language: Optional[LanguageCode]):
+        """Return the match condition and rank expression for a text query."""
+        config, column = _TEXT_SEARCH_COLUMNS.get(language, _DEFAULT_TEXT_SEARCH_COLUMN)
+        search_tsv = literal_column(column)
+        ts_query = func.plainto_tsquery(config, query)
+        return search_tsv.op("@@")(ts_query), func.ts_rank_cd(search_tsv, ts_query)
+    
+    async def full_text_search(
         self,
-        limit: int = 10,
-        category_id: Optional[UUID] = None
+        query: str,
+        language: Optional[LanguageCode] = None,
+        limit: int = 20,
+        offset: int = 0,
+        vendor_id: Optional[UUID] = None
     ) -> List[Product]:
-        """Get featured products."""
+        """Search active products in PostgreSQL via the tsvector GIN indexes."""
         try:
-            stmt = select(Product).where(
-                and_(
-                    Product.is_active == True,
-                    Product.is_featured == True
-                )
+            match, rank = self._full_text_clause(query, language)
+            stmt = (
+                select(Product)
+                .options(*_LIST_LOAD_OPTIONS)
+                .where(_search_conditions(match, vendor_id))
+                .order_by(rank.desc())
+                .offset(offset)
+                .limit(limit)
+            )
+            
+            result = await self.db.execute(stmt)
+            return result.scalars().all()
+        except Exception as e:
+            logger.error(f"Error running full-text search for '{query}': {e}")
+            return []
+    
+    async def count_full_text_search(
+        self,
+        query: str,
+        language: Optional[LanguageCode] = None,
+        vendor_id: Optional[UUID] = None
+    ) -> int:
+        """Count active products matching a full-text query."""
+        try:
+            match, _ = self._full_text_clause(query, language)
+            stmt = (
+                select(func.count())
+                .select_from(Product)
+                .where(_search_conditions(match, vendor_id))
             )
             
-            if category_id:
-                stmt = stmt.where(Product.category_id == category_id)
+            result = await self.db.execute(stmt)
+            return result.scalar_one()
+        except Exception as e:
+            logger.error(f"Error counting full-text search for '{query}': {e}")
+            return 0
+    
+    def _trigram_clause(self, query: str):
+        """Return the match condition and rank expression for a fuzzy name query."""
+        names_text = literal_column(_PRODUCT_NAMES_TEXT)
+        return (
+            literal(query).op("<%")(names_text),
+            func.word_similarity(query, names_text),
+        )
+    
+    async def fuzzy_search(
+        self,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+        vendor_id: Optional[UUID] = None
+    ) -> List[Product]:
+        """Search active products by trigram word similarity on their names."""
+        try:
+            match, rank = self._trigram_clause(query)
+            stmt = (
+                select(Product)
+                .options(*_LIST_LOAD_OPTIONS)
+                .where(_search_conditions(match, vendor_id))
+                .order_by(rank.desc())
+                .offset(offset)
+                .limit(limit)
+            )
             
-            stmt = stmt.limit(limit).order_by(Product.created_at.desc())
+            result = await self.db.execute(stmt)
+            return result.scalars().all()
+        except Exception as e:
+            logger.error(f"Error running fuzzy search for '{query}': {e}")
+            return []
+    
+    async def count_fuzzy_search(self, query: str, vendor_id: Optional[UUID] = None) -> int:
+        """Count active products matching a fuzzy name query."""
+        try:
+            match, _ = self._trigram_clause(query)
+            stmt = (
+                select(func.count())
+                .select_from(Product)
+                .where(_search_conditions(match, vendor_id))
+            )
             
             result = await self.db.execute(stmt)
+            return result.scalar_one()
+        except Exception as e:
+            logger.error(f"Error counting fuzzy search for '{query}': {e}")
+            return 0
+    
+    def _featured_products_stmt(self, limit: int, category_id: Optional[UUID]):
+        """Build the featured products query."""
+        stmt = select(Product).options(*_LIST_LOAD_OPTIONS).where(
+            and_(
+                Product.is_active,
+                Product.is_featured
+            )
+        )
+        
+        if category_id:
+            stmt = stmt.where(Product.category_id == category_id)
+        
+        return stmt.limit(limit).order_by(Product.created_at.desc())
+    
+    async def get_featured_products(
+        self,
+        limit: int = 10,
+        category_id: Optional[UUID] = None
+    ) -> List[Product]:
+        """Get featured products."""
+        try:
+            result = await self.db.execute(self._featured_products_stmt(limit, category_id))
             return result.scalars().all()
         except Exception as e:
             logger.error(f"Error getting featured products: {e}")
             return []
     
+    async def iter_featured_products(
+        self,
+        limit: int = 10,
+        category_id: Optional[UUID] = None
+    ) -> AsyncIterator[Product]:
+        """
+        Stream featured products from a server-side cursor.
+        
+        Errors are logged and re-raised rather than ending the stream, so a
+        caller never takes a truncated result for the complete one.
+        """
+        try:
+            result = await self.db.stream_scalars(self._featured_products_stmt(limit, category_id))
+            async for product in result:
+                yield product
+        except Exception as e:
+            logger.error(f"Error streaming featured products: {e}")
+            raise
+    
+    def _low_stock_products_stmt(self, vendor_id: Optional[UUID], threshold: Decimal):
+        """Build the low stock products query."""
+        stmt = select(Product).options(*_LIST_LOAD_OPTIONS).where(
+            and_(
+                Product.is_active,
+                Product.stock_quantity <= threshold,
+                Product.stock_quantity > literal_column("0")
+            )
+        )
+        
+        # Restate the idx_products_low_stock bound as a literal so even a
+        # generic prepared plan, which cannot see ``threshold``, can use it
+        if threshold <= _LOW_STOCK_INDEX_LIMIT:
+            stmt = stmt.where(Product.stock_quantity <= literal_column(str(_LOW_STOCK_INDEX_LIMIT)))
+        
+        if vendor_id:
+            stmt = stmt.where(Product.vendor_id == vendor_id)
+        
+        return stmt.order_by(Product.stock_quantity.asc())
+    
     async def get_low_stock_products(
         self,
         vendor_id: Optional[UUID] = None,
@@ -298,40 +718,64 @@ class ProductCRUD:
     ) -> List[Product]:
         """Get products with low stock."""
         try:
-            stmt = select(Product).where(
-                and_(
-                    Product.is_active == True,
-                    Product.stock_quantity <= threshold,
-                    Product.stock_quantity > 0
-                )
-            )
-            
-            if vendor_id:
-                stmt = stmt.where(Product.vendor_id == vendor_id)
-            
-            stmt = stmt.order_by(Product.stock_quantity.asc())
-            
-            result = await self.db.execute(stmt)
+            result = await self.db.execute(self._low_stock_products_stmt(vendor_id, threshold))
             return result.scalars().all()
         except Exception as e:
             logger.error(f"Error getting low stock products: {e}")
             return []
     
+    async def iter_low_stock_products(
+        self,
+        vendor_id: Optional[UUID] = None,
+        threshold: Decimal = Decimal('10')
+    ) -> AsyncIterator[Product]:
+        """
+        Stream products with low stock from a server-side cursor.
+        
+        The query has no limit, so rows are fetched as they are consumed
+        instead of being materialized up front. Errors propagate as in
+        iter_featured_products.
+        """
+        try:
+            result = await self.db.stream_scalars(self._low_stock_products_stmt(vendor_id, threshold))
+            async for product in result:
+                yield product
+        except Exception as e:
+            logger.error(f"Error streaming low stock products: {e}")
+            raise
+    
     async def _sync_to_elasticsearch(self, product: Product) -> bool:
-        """Sync product to Elasticsearch."""
+        """
+        Sync a committed product to Elasticsearch.
+        
+        Writers stamp ``elasticsearch_synced_at`` in the same commit as the
+        change itself, so a successful sync needs no further database work.
+        If indexing fails the stamp is cleared, unless a newer write has
+        already replaced this version.
+        """
         try:
             doc = product.to_elasticsearch_document()
             success = await self.search_service.index_product(doc)
-            
-            if success:
-                # Update sync timestamp
-                product.elasticsearch_synced_at = func.now()
-                await self.db.commit()
-            
-            return success
         except Exception as e:
             logger.error(f"Error syncing product {product.id} to Elasticsearch: {e}")
-            return False
+            success = False
+        
+        if not success:
+            try:
+                await self.db.execute(
+                    update(Product)
+                    .where(and_(
+                        Product.id == product.id,
+                        Product.elasticsearch_sync_version == product.elasticsearch_sync_version,
+                    ))
+                    .values(elasticsearch_synced_at=None)
+                )
+                await self.db.commit()
+            except Exception as e:
+                await self.db.rollback()
+                logger.error(f"Error clearing sync timestamp for product {product.id}: {e}")
+        
+        return success
 
 
 class ProductCategoryCRUD:
@@ -487,6 +931,38 @@ class PriceHistoryCRUD:
             logger.error(f"Error recording price history: {e}")
             return None
     
+    async def record_prices(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Record many price points in one statement and one commit.
+        
+        Each row takes the same keys as record_price's arguments. Rows go in
+        as a single batched INSERT rather than one flush and refresh per
+        row, so bulk market-data ingestion costs a handful of round trips
+        instead of one per price. Nothing is refreshed, so the rows are not
+        returned.
+        
+        Returns:
+            Number of rows recorded, or 0 if the batch was rolled back
+        """
+        if not rows:
+            return 0
+        
+        try:
+            # Same fallback as PriceHistory.__init__, which a bulk insert skips
+            recorded_at = datetime.utcnow()
+            rows = [{"recorded_at": recorded_at, **row} for row in rows]
+            
+            await self.db.execute(insert(PriceHistory), rows)
+            await self.db.commit()
+            
+            logger.debug(f"Recorded {len(rows)} price history rows")
+            return len(rows)
+        
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error recording price history batch: {e}")
+            return 0
+    
     async def get_price_history(
         self,
         product_id: UUID,
@@ -495,18 +971,9 @@ class PriceHistoryCRUD:
     ) -> List[PriceHistory]:
         """Get price history for a product."""
         try:
-            from datetime import datetime, timedelta
-            
-            cutoff_date = datetime.utcnow() - timedelta(days=days)
-            
             stmt = (
                 select(PriceHistory)
-                .where(
-                    and_(
-                        PriceHistory.product_id == product_id,
-                        PriceHistory.recorded_at >= cutoff_date
-                    )
-                )
+                .where(_recent_prices(product_id, days))
                 .order_by(PriceHistory.recorded_at.desc())
                 .limit(limit)
             )
@@ -525,24 +992,58 @@ class PriceHistoryCRUD:
     ) -> Optional[Decimal]:
         """Get average price for a product over specified days."""
         try:
-            from datetime import datetime, timedelta
-            
-            cutoff_date = datetime.utcnow() - timedelta(days=days)
-            
             stmt = select(func.avg(PriceHistory.price)).where(
-                and_(
-                    PriceHistory.product_id == product_id,
-                    PriceHistory.recorded_at >= cutoff_date
-                )
+                _recent_prices(product_id, days, quality_grade)
             )
             
-            if quality_grade:
-                stmt = stmt.where(PriceHistory.quality_grade == quality_grade)
-            
             result = await self.db.execute(stmt)
             avg_price = result.scalar()
             
             return Decimal(str(avg_price)) if avg_price else None
         except Exception as e:
             logger.error(f"Error getting average price for product {product_id}: {e}")
+            return None
+    
+    async def get_price_stats(
+        self,
+        product_id: UUID,
+        days: int = 7,
+        quality_grade: Optional[QualityGrade] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get price statistics for a product over specified days.
+        
+        All aggregates come from one pass over the same index range, instead
+        of one query per figure.
+        
+        Returns:
+            Dict with average, minimum, maximum, stddev (None outside
+            PostgreSQL, or with fewer than two prices) and count
+        """
+        try:
+            if self.db.get_bind().dialect.name == "postgresql":
+                stddev = func.stddev_samp(PriceHistory.price)
+            else:
+                stddev = literal(None)
+            
+            stmt = select(
+                func.avg(PriceHistory.price),
+                func.min(PriceHistory.price),
+                func.max(PriceHistory.price),
+                stddev,
+                func.count(),
+            ).where(_recent_prices(product_id, days, quality_grade))
+            
+            result = await self.db.execute(stmt)
+            average, minimum, maximum, deviation, count = result.one()
+            
+            return {
+                "average": _as_decimal(average),
+                "minimum": _as_decimal(minimum),
+                "maximum": _as_decimal(maximum),
+                "stddev": _as_decimal(deviation),
+                "count": count,
+            }
+        except Exception as e:
+            logger.error(f"Error getting price stats for product {product_id}: {e}")
             return None
\ No newline at end of file
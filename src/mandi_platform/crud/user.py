@@ -5,11 +5,13 @@ This module provides database operations for user management including
 creation, retrieval, updates, and specialized vendor operations.
 """
 
+from datetime import datetime
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 from decimal import Decimal
 
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import select, update, case, func, and_, or_, insert, literal
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -68,6 +70,32 @@ class UserCRUD(CRUDBase[User, Dict[str, Any], Dict[str, Any]]):
         )
         return result.scalars().all()
     
+    async def create_if_not_exists(
+        self,
+        db: AsyncSession,
+        obj_in: Dict[str, Any]
+    ) -> Optional[User]:
+        """
+        Create a user unless the phone number is already registered.
+        
+        The existence check and the insert are one atomic
+        INSERT ... ON CONFLICT (phone_number) DO NOTHING statement.
+        
+        Returns:
+            The new user, or None if the phone number is taken
+        """
+        users = User.__table__
+        stmt = (
+            pg_insert(users)
+            .values(**obj_in)
+            .on_conflict_do_nothing(index_elements=[users.c.phone_number])
+            .returning(*users.c)
+        )
+        result = await db.execute(select(User).from_statement(stmt))
+        user = result.scalar_one_or_none()
+        await db.commit()
+        return user
+    
     async def update_last_active(self, db: AsyncSession, user_id: UUID) -> Optional[User]:
         """Update user's last active timestamp."""
         user = await self.get(db, user_id)
@@ -78,6 +106,29 @@ class UserCRUD(CRUDBase[User, Dict[str, Any], Dict[str, Any]]):
             await db.refresh(user)
         return user
     
+    async def bulk_update_last_active(
+        self,
+        db: AsyncSession,
+        timestamps: Dict[UUID, datetime]
+    ) -> int:
+        """
+        Set last_active for many users in a single UPDATE statement.
+        
+        The statement binds about three parameters per user, so callers keep
+        batches well under the driver's limit (see activity.flush_last_active).
+        """
+        if not timestamps:
+            return 0
+        
+        result = await db.execute(
+            update(User)
+            .where(User.id.in_(list(timestamps)))
+            .values(last_active=case(timestamps, value=User.id))
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        return result.rowcount
+    
     async def search_by_location(
         self,
         db: AsyncSession,
@@ -98,6 +149,65 @@ class UserCRUD(CRUDBase[User, Dict[str, Any], Dict[str, Any]]):
 class VendorCRUD(CRUDBase[Vendor, Dict[str, Any], Dict[str, Any]]):
     """CRUD operations for Vendor model."""
     
+    async def create_if_not_exists(
+        self,
+        db: AsyncSession,
+        obj_in: Dict[str, Any]
+    ) -> Optional[Vendor]:
+        """
+        Create a vendor unless the phone number is already registered.
+        
+        The users and vendors rows are written by a single statement: a
+        data-modifying CTE inserts the users row with ON CONFLICT DO NOTHING,
+        and the vendors row is selected from its RETURNING id, so nothing is
+        inserted when the phone number is taken.
+        
+        Returns:
+            The new vendor, or None if the phone number is taken
+        """
+        users = User.__table__
+        vendors = Vendor.__table__
+        user_values = {k: v for k, v in obj_in.items() if k in users.c}
+        vendor_values = {k: v for k, v in obj_in.items() if k not in users.c}
+        
+        # Compiling the users CTE discards the outer INSERT's prefetched
+        # Python-side defaults, so evaluate the vendors ones here instead
+        for column in vendors.c:
+            if column.default is not None and column.name not in vendor_values:
+                default = column.default
+                vendor_values[column.name] = default.arg(None) if default.is_callable else default.arg
+        
+        new_user = (
+            pg_insert(users)
+            .values(**user_values)
+            .on_conflict_do_nothing(index_elements=[users.c.phone_number])
+            .returning(users.c.id)
+            .cte("new_user")
+        )
+        vendor_columns = list(vendor_values)
+        stmt = (
+            insert(vendors)
+            .from_select(
+                ["id", *vendor_columns],
+                select(
+                    new_user.c.id,
+                    *[
+                        literal(vendor_values[name], type_=vendors.c[name].type)
+                        for name in vendor_columns
+                    ],
+                ),
+            )
+            .returning(vendors.c.id)
+        )
+        
+        result = await db.execute(stmt)
+        vendor_id = result.scalar_one_or_none()
+        await db.commit()
+        
+        if vendor_id is None:
+            return None
+        return await self.get(db, vendor_id)
+    
     async def get_by_business_name(
         self, 
         db: AsyncSession, 
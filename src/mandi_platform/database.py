@@ -6,20 +6,29 @@ database session management for the application.
 """
 
 from typing import AsyncGenerator
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.pool import NullPool
 
-from .config import get_database_url
+from .config import get_database_url, settings
 from .models.base import Base
 
 
+def get_async_database_url(database_url: str) -> str:
+    """Select the asyncpg driver for plain ``postgresql://`` URLs."""
+    url = make_url(database_url)
+    if url.drivername in ("postgresql", "postgres"):
+        return url.set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+    return database_url
+
+
 class DatabaseManager:
     """Manages database connections and sessions."""
     
     def __init__(self, database_url: str, test_mode: bool = False):
         """Initialize database manager with connection URL."""
-        self.database_url = database_url
+        self.database_url = get_async_database_url(database_url)
         self.test_mode = test_mode
         
         # Create async engine
@@ -31,8 +40,15 @@ class DatabaseManager:
         # Use NullPool for testing to avoid connection issues
         if test_mode:
             engine_kwargs["poolclass"] = NullPool
+        elif make_url(self.database_url).get_backend_name() == "postgresql":
+            engine_kwargs.update(
+                pool_size=settings.sqlalchemy_pool_size,
+                max_overflow=settings.sqlalchemy_max_overflow,
+                pool_recycle=settings.sqlalchemy_pool_recycle,
+                pool_pre_ping=True,
+            )
         
-        self.engine = create_async_engine(database_url, **engine_kwargs)
+        self.engine = create_async_engine(self.database_url, **engine_kwargs)
         
         # Create session factory
         self.async_session = async_sessionmaker(
@@ -53,6 +69,24 @@ class DatabaseManager:
             finally:
                 await session.close()
     
+    async def ping(self) -> bool:
+        """
+        Ping the database with a driver-level round trip.
+        
+        Connection and query errors propagate so callers such as the health
+        checks can report why the database is unreachable.
+        """
+        async with self.engine.connect() as conn:
+            raw_connection = await conn.get_raw_connection()
+            driver_connection = raw_connection.driver_connection
+            if hasattr(driver_connection, "fetchval"):
+                # asyncpg: skip SQLAlchemy statement compilation and
+                # result-set construction entirely
+                await driver_connection.fetchval("SELECT 1")
+            else:
+                await conn.exec_driver_sql("SELECT 1")
+        return True
+    
     async def close(self):
         """Close the database engine."""
         await self.engine.dispose()
@@ -5,19 +5,24 @@ This module sets up the FastAPI application with all necessary middleware,
 routers, and lifecycle event handlers.
 """
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
+from uuid import UUID
 
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 import structlog
 
+from .activity import flush_last_active, last_active_flush_loop
 from .config import settings
 from .database import close_database, init_database, get_db_session
-from .redis_client import close_redis
+from .partitions import partition_maintenance_loop
+from .redis_client import close_redis, get_redis_manager
 from .elasticsearch_client import close_elasticsearch
 from .api.health import router as health_router
 from .api.auth import router as auth_router
@@ -27,6 +32,14 @@ from .auth.middleware import AuthMiddleware, RateLimitMiddleware
 
 
 # Configure structured logging
+def _stringify_uuids(_, __, event_dict):
+    """Render UUID values only for log lines that are actually emitted."""
+    for key, value in event_dict.items():
+        if isinstance(value, UUID):
+            event_dict[key] = str(value)
+    return event_dict
+
+
 structlog.configure(
     processors=[
         structlog.stdlib.filter_by_level,
@@ -37,11 +50,15 @@ structlog.configure(
         structlog.processors.StackInfoRenderer(),
         structlog.processors.format_exc_info,
         structlog.processors.UnicodeDecoder(),
+        _stringify_uuids,
         structlog.processors.JSONRenderer(),
     ],
     context_class=dict,
     logger_factory=structlog.stdlib.LoggerFactory(),
-    wrapper_class=structlog.stdlib.BoundLogger,
+    # Calls below the configured level return before any processor runs
+    wrapper_class=structlog.make_filtering_bound_logger(
+        getattr(logging, settings.log_level.upper(), logging.INFO)
+    ),
     cache_logger_on_first_use=True,
 )
 
@@ -53,6 +70,8 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan manager for startup and shutdown events."""
     # Startup
     logger.info("Starting Multilingual Mandi Platform")
+    flush_task = None
+    partition_task = None
     
     try:
         # Initialize database tables (in development)
@@ -60,6 +79,12 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
             await init_database()
             logger.info("Database initialized")
         
+        # Batch last_active updates recorded in Redis into the database
+        flush_task = asyncio.create_task(last_active_flush_loop())
+        
+        # Keep upcoming monthly price_history partitions created
+        partition_task = asyncio.create_task(partition_maintenance_loop())
+        
         logger.info("Application startup complete")
         yield
         
@@ -67,6 +92,25 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         # Shutdown
         logger.info("Shutting down Multilingual Mandi Platform")
         
+        if partition_task is not None:
+            partition_task.cancel()
+            try:
+                await partition_task
+            except asyncio.CancelledError:
+                pass
+        
+        # Stop the last_active flusher and write out anything still pending
+        if flush_task is not None:
+            flush_task.cancel()
+            try:
+                await flush_task
+            except asyncio.CancelledError:
+                pass
+            try:
+                await flush_last_active()
+            except Exception as e:
+                logger.error("Final last_active flush failed", error=str(e))
+        
         # Close database connections
         await close_database()
         logger.info("Database connections closed")
@@ -96,6 +140,7 @@ def create_app() -> FastAPI:
         docs_url="/docs" if settings.debug else None,
         redoc_url="/redoc" if settings.debug else None,
         openapi_url="/openapi.json" if settings.debug else None,
+        default_response_class=ORJSONResponse,
         lifespan=lifespan,
     )
     
@@ -110,7 +155,15 @@ def create_app() -> FastAPI:
     app.add_middleware(AuthMiddleware)
     
     # Add rate limiting middleware
-    app.add_middleware(RateLimitMiddleware, requests_per_minute=60)
+    app.add_middleware(
+        RateLimitMiddleware,
+        requests_per_minute=60,
+        redis_manager=get_redis_manager(),
+    )
+    
+    # Compress larger responses such as product listings; a mid-range level
+    # keeps CPU per response low while still shrinking verbose JSON several-fold
+    app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
     
     # Add CORS middleware
     app.add_middleware(
@@ -206,4 +259,6 @@ if __name__ == "__main__":
         reload=settings.reload,
         log_level=settings.log_level.lower(),
         workers=settings.workers if not settings.reload else 1,
+        loop="uvloop",
+        http="httptools",
     )
\ No newline at end of file
@@ -4,7 +4,7 @@ Data models for the Multilingual Mandi Platform.
 This package contains all SQLAlchemy models for the application.
 """
 
-from .base import Base
+from .base import Base, uuid7
 from .user import User, Vendor
 from .product import Product, ProductCategoryModel, PriceHistory, MultilingualText
 from .enums import (
@@ -26,6 +26,7 @@ from .enums import (
 
 __all__ = [
     "Base",
+    "uuid7",
     "User",
     "Vendor",
     "Product",
@@ -5,9 +5,8 @@ This module defines the product catalog models including Product, ProductCategor
 and related entities with multilingual support and Elasticsearch integration.
 """
 
-import uuid
 from datetime import datetime
-from decimal import Decimal
+from decimal import ROUND_HALF_UP, Decimal
 from typing import Dict, List, Optional, Any
 
 from sqlalchemy import (
@@ -22,12 +21,18 @@ from sqlalchemy import (
     Boolean,
     JSON,
     Index,
+    SmallInteger,
+    literal_column,
+    text,
+    DDL,
+    event,
 )
-from sqlalchemy.dialects.postgresql import UUID, ARRAY
+from sqlalchemy.dialects.postgresql import UUID, ARRAY, JSONB
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
-from .base import Base
+from .base import Base, uuid7
 from .enums import (
     LanguageCode,
     ProductCategory as ProductCategoryEnum,
@@ -40,6 +45,19 @@ from .enums import (
     MarketConditions,
 )
 
+# JSON columns that are filtered with containment queries are stored as JSONB
+# on PostgreSQL so they can be GIN-indexed; other backends use plain JSON.
+JSONBType = JSON().with_variant(JSONB(), "postgresql")
+
+# Bits of Product.flags
+PRODUCT_FLAG_ACTIVE = 1
+PRODUCT_FLAG_FEATURED = 2
+
+
+def to_paise(amount: Decimal) -> int:
+    """Convert a rupee amount to integer paise, rounding half up."""
+    return int(Decimal(amount).scaleb(2).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
 
 class MultilingualText:
     """Helper class for multilingual text fields."""
@@ -76,10 +94,10 @@ class ProductCategoryModel(Base):
     __tablename__ = 'product_categories'
     
     # Primary key
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     
     # Category information
-    category_enum = Column(Enum(ProductCategoryEnum), nullable=False, unique=True)
+    category_enum = Column(Enum(ProductCategoryEnum, native_enum=False, length=32), nullable=False, unique=True)
     
     # Multilingual names and descriptions (stored as JSON)
     names = Column(JSON, nullable=False, default=dict)
@@ -149,7 +167,7 @@ class Product(Base):
     __tablename__ = 'products'
     
     # Primary key
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     
     # Vendor relationship
     vendor_id = Column(UUID(as_uuid=True), ForeignKey('vendors.id'), nullable=False)
@@ -163,7 +181,7 @@ class Product(Base):
     sku = Column(String(100), unique=True, nullable=True, index=True)  # Stock Keeping Unit
     
     # Multilingual product information (stored as JSON)
-    names = Column(JSON, nullable=False, default=dict)
+    names = Column(JSONBType, nullable=False, default=dict)
     descriptions = Column(JSON, nullable=False, default=dict)
     
     # Pricing information
@@ -171,21 +189,21 @@ class Product(Base):
     currency = Column(String(3), default="INR", nullable=False)
     
     # Product specifications
-    unit = Column(Enum(MeasurementUnit), nullable=False)
+    unit = Column(Enum(MeasurementUnit, native_enum=False, length=32), nullable=False)
     minimum_order_quantity = Column(Numeric(10, 2), default=Decimal('1'), nullable=False)
     maximum_order_quantity = Column(Numeric(10, 2), nullable=True)
     
     # Quality and condition
-    quality_grade = Column(Enum(QualityGrade), nullable=False, default=QualityGrade.STANDARD)
-    condition = Column(Enum(ProductCondition), nullable=False, default=ProductCondition.NEW)
+    quality_grade = Column(Enum(QualityGrade, native_enum=False, length=32), nullable=False, default=QualityGrade.STANDARD)
+    condition = Column(Enum(ProductCondition, native_enum=False, length=32), nullable=False, default=ProductCondition.NEW)
     
     # Availability
-    availability_status = Column(Enum(AvailabilityStatus), nullable=False, default=AvailabilityStatus.AVAILABLE)
+    availability_status = Column(Enum(AvailabilityStatus, native_enum=False, length=32), nullable=False, default=AvailabilityStatus.AVAILABLE)
     stock_quantity = Column(Numeric(10, 2), nullable=True)
-    seasonal_pattern = Column(Enum(SeasonalPattern), nullable=False, default=SeasonalPattern.YEAR_ROUND)
+    seasonal_pattern = Column(Enum(SeasonalPattern, native_enum=False, length=32), nullable=False, default=SeasonalPattern.YEAR_ROUND)
     
     # Location information (stored as JSON for flexibility)
-    location = Column(JSON, nullable=False)
+    location = Column(JSONBType, nullable=False)
     
     # Product media
     images = Column(JSON, default=list, nullable=False)  # List of image URLs
@@ -195,12 +213,12 @@ class Product(Base):
     attributes = Column(JSON, default=dict, nullable=False)
     
     # SEO and search optimization
-    search_keywords = Column(JSON, default=list, nullable=False)  # List of keywords
-    tags = Column(JSON, default=list, nullable=False)  # List of tags
+    search_keywords = Column(JSONBType, default=list, nullable=False)  # List of keywords
+    tags = Column(JSONBType, default=list, nullable=False)  # List of tags
     
-    # Product status
-    is_active = Column(Boolean, default=True, nullable=False)
-    is_featured = Column(Boolean, default=False, nullable=False)
+    # Product status, packed as PRODUCT_FLAG_* bits; exposed through the
+    # is_active / is_featured hybrid properties below
+    flags = Column(SmallInteger, default=PRODUCT_FLAG_ACTIVE, server_default='0', nullable=False)
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -210,13 +228,60 @@ class Product(Base):
     elasticsearch_synced_at = Column(DateTime(timezone=True), nullable=True)
     elasticsearch_sync_version = Column(Integer, default=1, nullable=False)
     
+    # The PostgreSQL-only ``search_tsv`` and ``search_tsv_en`` generated
+    # columns and their GIN indexes are created by migration 003 and are not
+    # mapped here; see ProductCRUD.full_text_search.
+    
     # Indexes for performance
     __table_args__ = (
-        Index('idx_product_vendor_category', 'vendor_id', 'category_id'),
-        Index('idx_product_availability', 'availability_status', 'is_active'),
-        Index('idx_product_price_range', 'base_price', 'quality_grade'),
-        Index('idx_product_location', 'location'),  # GIN index for JSON
-        Index('idx_product_search', 'search_keywords'),  # GIN index for JSON
+        Index(
+            'idx_products_vendor_created',
+            'vendor_id',
+            created_at.desc(),
+            id.desc(),
+        ),  # Keyset pagination over all of a vendor's listings
+        Index(
+            'idx_products_live',
+            'category_id',
+            'base_price',
+            postgresql_where=text("(flags & 1) = 1 AND availability_status = 'AVAILABLE'"),
+        ),  # Partial index over live listings only
+        Index(
+            'idx_products_vendor_live',
+            'vendor_id',
+            created_at.desc(),
+            id.desc(),
+            postgresql_where=text('(flags & 1) = 1'),
+        ),  # Keyset pagination over a vendor's live listings
+        Index(
+            'idx_products_active_category',
+            'category_id',
+            created_at.desc(),
+            id.desc(),
+            postgresql_where=text('(flags & 1) = 1'),
+        ),
+        Index(
+            'idx_products_featured',
+            'category_id',
+            created_at.desc(),
+            postgresql_where=text('(flags & 1) = 1 AND (flags & 2) = 2'),
+        ),  # Featured listings only
+        Index(
+            'idx_products_low_stock',
+            'vendor_id',
+            'stock_quantity',
+            postgresql_where=text('(flags & 1) = 1 AND stock_quantity > 0 AND stock_quantity <= 10'),
+        ),  # Live listings running low on stock
+        Index(
+            'idx_product_jsonb',
+            'location',
+            'tags',
+            postgresql_using='gin',
+            postgresql_ops={
+                'location': 'jsonb_path_ops',
+                'tags': 'jsonb_path_ops',
+            },
+        ),  # Single GIN index for JSONB containment filters
     )
     
     def __init__(self, **kwargs):
@@ -249,15 +314,52 @@ class Product(Base):
             kwargs['availability_status'] = AvailabilityStatus.AVAILABLE
         if 'seasonal_pattern' not in kwargs:
             kwargs['seasonal_pattern'] = SeasonalPattern.YEAR_ROUND
-        if 'is_active' not in kwargs:
-            kwargs['is_active'] = True
-        if 'is_featured' not in kwargs:
-            kwargs['is_featured'] = False
+        is_active = kwargs.pop('is_active', True)
+        is_featured = kwargs.pop('is_featured', False)
+        if 'flags' not in kwargs:
+            kwargs['flags'] = (
+                (PRODUCT_FLAG_ACTIVE if is_active else 0)
+                | (PRODUCT_FLAG_FEATURED if is_featured else 0)
+            )
         if 'elasticsearch_sync_version' not in kwargs:
             kwargs['elasticsearch_sync_version'] = 1
         
         super().__init__(**kwargs)
     
+    def _set_flag(self, flag: int, value: bool) -> None:
+        """Set or clear a PRODUCT_FLAG_* bit."""
+        flags = self.flags or 0
+        self.flags = (flags | flag) if value else (flags & ~flag)
+    
+    @hybrid_property
+    def is_active(self) -> bool:
+        """Whether the product is listed."""
+        return bool((self.flags or 0) & PRODUCT_FLAG_ACTIVE)
+    
+    @is_active.setter
+    def is_active(self, value: bool) -> None:
+        self._set_flag(PRODUCT_FLAG_ACTIVE, value)
+    
+    @is_active.expression
+    def is_active(cls):
+        # Literal bit values so the predicate matches the partial indexes
+        flag = literal_column(str(PRODUCT_FLAG_ACTIVE))
+        return cls.flags.op('&')(flag) == flag
+    
+    @hybrid_property
+    def is_featured(self) -> bool:
+        """Whether the product is featured."""
+        return bool((self.flags or 0) & PRODUCT_FLAG_FEATURED)
+    
+    @is_featured.setter
+    def is_featured(self, value: bool) -> None:
+        self._set_flag(PRODUCT_FLAG_FEATURED, value)
+    
+    @is_featured.expression
+    def is_featured(cls):
+        flag = literal_column(str(PRODUCT_FLAG_FEATURED))
+        return cls.flags.op('&')(flag) == flag
+    
     def get_name(self, language: LanguageCode = LanguageCode.ENGLISH) -> str:
         """Get product name in specified language."""
         multilingual_name = MultilingualText.from_dict(self.names or {})
@@ -334,17 +436,18 @@ class Product(Base):
     def update_stock(self, new_quantity: Decimal) -> None:
         """Update stock quantity and availability status."""
         self.stock_quantity = new_quantity
-        
-        # Auto-update availability based on stock
-        if new_quantity <= 0:
-            self.availability_status = AvailabilityStatus.OUT_OF_STOCK
-        elif new_quantity <= 10:  # Configurable threshold
-            self.availability_status = AvailabilityStatus.LIMITED_STOCK
-        else:
-            self.availability_status = AvailabilityStatus.AVAILABLE
-        
+        self.availability_status = self.availability_for_stock(new_quantity)
         self._mark_for_elasticsearch_sync()
     
+    @staticmethod
+    def availability_for_stock(quantity: Decimal) -> AvailabilityStatus:
+        """Availability status implied by a stock quantity."""
+        if quantity <= 0:
+            return AvailabilityStatus.OUT_OF_STOCK
+        elif quantity <= 10:  # Configurable threshold
+            return AvailabilityStatus.LIMITED_STOCK
+        return AvailabilityStatus.AVAILABLE
+    
     def _mark_for_elasticsearch_sync(self) -> None:
         """Mark product for Elasticsearch synchronization."""
         self.elasticsearch_sync_version += 1
@@ -408,7 +511,7 @@ class PriceHistory(Base):
     __tablename__ = 'price_history'
     
     # Primary key
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     
     # Product relationship
     product_id = Column(UUID(as_uuid=True), ForeignKey('products.id'), nullable=False)
@@ -419,24 +522,32 @@ class PriceHistory(Base):
     currency = Column(String(3), default="INR", nullable=False)
     
     # Context information
-    quality_grade = Column(Enum(QualityGrade), nullable=False)
+    quality_grade = Column(Enum(QualityGrade, native_enum=False, length=32), nullable=False)
     location = Column(JSON, nullable=False)  # Location where price was recorded
-    source = Column(Enum(PriceSource), nullable=False)
-    market_conditions = Column(Enum(MarketConditions), nullable=False, default=MarketConditions.NORMAL)
+    source = Column(Enum(PriceSource, native_enum=False, length=32), nullable=False)
+    market_conditions = Column(Enum(MarketConditions, native_enum=False, length=32), nullable=False, default=MarketConditions.NORMAL)
     
     # Additional context
     quantity_range = Column(String(50), nullable=True)  # e.g., "1-10 kg", "bulk"
     notes = Column(Text, nullable=True)
     
-    # Timestamps
-    recorded_at = Column(DateTime(timezone=True), nullable=False)
+    # Timestamps (recorded_at is the partition key, so it is part of the
+    # primary key)
+    recorded_at = Column(DateTime(timezone=True), primary_key=True, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
-    # Indexes for performance
+    # Indexes for performance; the table is range-partitioned by month on
+    # recorded_at (partitions are created by migration 003)
     __table_args__ = (
-        Index('idx_price_history_product_date', 'product_id', 'recorded_at'),
-        Index('idx_price_history_location_date', 'location', 'recorded_at'),
+        Index(
+            'idx_price_history_recorded_at',
+            'recorded_at',
+            postgresql_using='brin',
+            postgresql_with={'pages_per_range': 32},
+        ),
+        Index('idx_price_history_product', 'product_id'),
         Index('idx_price_history_source', 'source', 'recorded_at'),
+        {'postgresql_partition_by': 'RANGE (recorded_at)'},
     )
     
     def __init__(self, **kwargs):
@@ -451,4 +562,14 @@ class PriceHistory(Base):
         super().__init__(**kwargs)
     
     def __repr__(self) -> str:
-        return f"<PriceHistory(product_id={self.product_id}, price={self.price}, date={self.recorded_at})>"
\ No newline at end of file
+        return f"<PriceHistory(product_id={self.product_id}, price={self.price}, date={self.recorded_at})>"
+
+# Tables built with metadata.create_all (development and tests) get a single
+# default partition so inserts work without the monthly partitions that
+# migration 003 creates.
+event.listen(
+    PriceHistory.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS price_history_default PARTITION OF price_history DEFAULT")
+    .execute_if(dialect="postgresql"),
+)
@@ -5,7 +5,6 @@ This module defines the core user models including User and Vendor entities
 with all required fields and relationships.
 """
 
-import uuid
 from datetime import datetime
 from decimal import Decimal
 from typing import List, Optional
@@ -26,7 +25,7 @@ from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
-from .base import Base
+from .base import Base, uuid7
 from .enums import (
     LanguageCode,
     TechLiteracyLevel,
@@ -48,11 +47,11 @@ class User(Base):
     __tablename__ = 'users'
     
     # Primary key
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     
     # Core user information
     phone_number = Column(String(15), unique=True, nullable=False, index=True)
-    preferred_language = Column(Enum(LanguageCode), nullable=False, default=LanguageCode.HINDI)
+    preferred_language = Column(Enum(LanguageCode, native_enum=False, length=32), nullable=False, default=LanguageCode.HINDI)
     
     # Location information (stored as JSON-like string for flexibility)
     # Format: "City, State, Country" or coordinates
@@ -60,12 +59,12 @@ class User(Base):
     
     # User characteristics
     tech_literacy_level = Column(
-        Enum(TechLiteracyLevel), 
+        Enum(TechLiteracyLevel, native_enum=False, length=32), 
         nullable=False, 
         default=TechLiteracyLevel.BEGINNER
     )
     verification_status = Column(
-        Enum(VerificationStatus), 
+        Enum(VerificationStatus, native_enum=False, length=32), 
         nullable=False, 
         default=VerificationStatus.UNVERIFIED
     )
@@ -116,13 +115,13 @@ class Vendor(User):
     
     # Business information
     business_name = Column(String(255), nullable=False)
-    business_type = Column(Enum(BusinessType), nullable=False)
+    business_type = Column(Enum(BusinessType, native_enum=False, length=32), nullable=False)
     
     # Business performance metrics
     rating = Column(Numeric(3, 2), default=Decimal('0.00'), nullable=False)
     total_transactions = Column(Integer, default=0, nullable=False)
     market_reputation = Column(
-        Enum(MarketReputation), 
+        Enum(MarketReputation, native_enum=False, length=32), 
         nullable=False, 
         default=MarketReputation.NEW
     )
@@ -0,0 +1,99 @@
+"""
+Partition maintenance for the price_history table.
+
+price_history is range-partitioned by month on ``recorded_at``. Migration 003
+creates the first months; this module keeps creating upcoming months ahead
+of time so new rows always land in a monthly partition, where pruning
+applies, rather than in ``price_history_default``.
+"""
+
+import asyncio
+from datetime import date
+from typing import List, Tuple
+
+import structlog
+from sqlalchemy import text
+
+from .config import settings
+from .database import get_database_manager
+
+logger = structlog.get_logger(__name__)
+
+PARTITION_CHECK_INTERVAL = 24 * 3600
+
+# Serializes maintenance across application workers
+_PARTITION_LOCK = text("SELECT pg_advisory_xact_lock(hashtext('price_history_partitions'))")
+
+
+def _next_month(year: int, month: int) -> Tuple[int, int]:
+    """Return the (year, month) after the given one."""
+    return (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def upcoming_months(start: date, months_ahead: int) -> List[Tuple[int, int]]:
+    """List ``start``'s month and the ``months_ahead`` months after it."""
+    months = [(start.year, start.month)]
+    for _ in range(months_ahead):
+        months.append(_next_month(*months[-1]))
+    return months
+
+
+async def ensure_price_history_partitions(months_ahead: int | None = None) -> List[str]:
+    """
+    Create the monthly price_history partitions that do not exist yet.
+    
+    Covers the current month and ``months_ahead`` months after it. Rows that
+    already fell into the default partition for one of those months are
+    moved into the new partition before it is attached, since PostgreSQL
+    refuses to attach a range the default partition holds rows for.
+    
+    Returns:
+        Names of the partitions created
+    """
+    months_ahead = settings.price_history_partitions_ahead if months_ahead is None else months_ahead
+    engine = get_database_manager().engine
+    if engine.dialect.name != "postgresql":
+        return []
+    
+    created = []
+    for year, month in upcoming_months(date.today(), months_ahead):
+        next_year, next_month = _next_month(year, month)
+        name = f"price_history_{year:04d}_{month:02d}"
+        start = f"{year:04d}-{month:02d}-01"
+        end = f"{next_year:04d}-{next_month:02d}-01"
+        
+        async with engine.begin() as conn:
+            await conn.execute(_PARTITION_LOCK)
+            if await conn.scalar(text("SELECT to_regclass(:name)"), {"name": name}) is not None:
+                continue
+            
+            await conn.execute(text(
+                f"CREATE TABLE {name} (LIKE price_history INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+            ))
+            await conn.execute(
+                text(
+                    f"WITH moved AS (DELETE FROM price_history_default "
+                    f"WHERE recorded_at >= :start AND recorded_at < :end RETURNING *) "
+                    f"INSERT INTO {name} SELECT * FROM moved"
+                ),
+                {"start": date.fromisoformat(start), "end": date.fromisoformat(end)},
+            )
+            await conn.execute(text(
+                f"ALTER TABLE price_history ATTACH PARTITION {name} "
+                f"FOR VALUES FROM ('{start}') TO ('{end}')"
+            ))
+        created.append(name)
+    
+    if created:
+        logger.info("Created price_history partitions", partitions=created)
+    return created
+
+
+async def partition_maintenance_loop(interval: int = PARTITION_CHECK_INTERVAL):
+    """Ensure upcoming price_history partitions exist, then every ``interval`` seconds."""
+    while True:
+        try:
+            await ensure_price_history_partitions()
+        except Exception as e:
+            logger.error("price_history partition maintenance failed", error=str(e))
+        await asyncio.sleep(interval)
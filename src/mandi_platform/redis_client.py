@@ -4,13 +4,34 @@ Redis client configuration and management.
 This module provides Redis connection management for caching and session storage.
 """
 
-import json
 from typing import Any, Optional, Union
+import orjson
 import redis.asyncio as redis
 from redis.asyncio import Redis
 
 from .config import get_redis_url, settings
 
+# Increment a counter and start its TTL on first use, in one round trip
+_INCREMENT_WITH_TTL_SCRIPT = """
+local count = redis.call('INCR', KEYS[1])
+if count == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return count
+"""
+
+# Delete each key only if it still holds the value the caller read, so a
+# write that lands after the read survives
+_DELETE_IF_UNCHANGED_SCRIPT = """
+local deleted = 0
+for i, key in ipairs(KEYS) do
+    if redis.call('GET', key) == ARGV[i] then
+        deleted = deleted + redis.call('DEL', key)
+    end
+end
+return deleted
+"""
+
 
 class RedisManager:
     """Manages Redis connections and operations."""
@@ -19,6 +40,8 @@ class RedisManager:
         """Initialize Redis manager with connection URL."""
         self.redis_url = redis_url
         self.client: Optional[Redis] = None
+        self._increment_with_ttl = None
+        self._delete_if_unchanged = None
     
     async def connect(self) -> Redis:
         """Connect to Redis and return client."""
@@ -36,6 +59,8 @@ class RedisManager:
         if self.client:
             await self.client.close()
             self.client = None
+            self._increment_with_ttl = None
+            self._delete_if_unchanged = None
     
     async def get(self, key: str) -> Optional[str]:
         """Get a value from Redis."""
@@ -53,7 +78,7 @@ class RedisManager:
         
         # Serialize complex objects to JSON
         if isinstance(value, (dict, list)):
-            value = json.dumps(value)
+            value = orjson.dumps(value)
         
         if ttl is None:
             ttl = settings.redis_cache_ttl
@@ -67,8 +92,8 @@ class RedisManager:
             return None
         
         try:
-            return json.loads(value)
-        except json.JSONDecodeError:
+            return orjson.loads(value)
+        except orjson.JSONDecodeError:
             return None
     
     async def delete(self, key: str) -> int:
@@ -76,6 +101,31 @@ class RedisManager:
         client = await self.connect()
         return await client.delete(key)
     
+    async def delete_pattern(self, pattern: str) -> int:
+        """Delete all keys matching a glob pattern using SCAN."""
+        client = await self.connect()
+        keys = [key async for key in client.scan_iter(match=pattern, count=500)]
+        if not keys:
+            return 0
+        return await client.unlink(*keys)
+    
+    async def delete_if_unchanged(self, entries: dict[str, str]) -> int:
+        """
+        Delete keys that still hold the given values, in one round trip.
+        
+        Args:
+            entries: Mapping of key to the value it was read with
+        
+        Returns:
+            Number of keys deleted
+        """
+        if not entries:
+            return 0
+        client = await self.connect()
+        if self._delete_if_unchanged is None:
+            self._delete_if_unchanged = client.register_script(_DELETE_IF_UNCHANGED_SCRIPT)
+        return await self._delete_if_unchanged(keys=list(entries), args=list(entries.values()))
+    
     async def exists(self, key: str) -> bool:
         """Check if a key exists in Redis."""
         client = await self.connect()
@@ -91,6 +141,13 @@ class RedisManager:
         client = await self.connect()
         return await client.incr(key, amount)
     
+    async def increment_with_ttl(self, key: str, ttl: int) -> int:
+        """Atomically increment a counter, setting its TTL when it is created."""
+        client = await self.connect()
+        if self._increment_with_ttl is None:
+            self._increment_with_ttl = client.register_script(_INCREMENT_WITH_TTL_SCRIPT)
+        return await self._increment_with_ttl(keys=[key], args=[ttl])
+    
     async def hash_get(self, key: str, field: str) -> Optional[str]:
         """Get a field from a Redis hash."""
         client = await self.connect()
@@ -589,7 +589,7 @@ class ProductSearchService:
         language: LanguageCode = LanguageCode.ENGLISH,
         filters: Optional[Dict[str, Any]] = None,
         location: Optional[Dict[str, Any]] = None,
-        price_range: Optional[Tuple[Decimal, Decimal]] = None,
+        price_range: Optional[Tuple[int, Optional[int]]] = None,
         quality_grades: Optional[List[QualityGrade]] = None,
         availability_statuses: Optional[List[AvailabilityStatus]] = None,
         page: int = 1,
@@ -606,7 +606,7 @@ class ProductSearchService:
             language: Language for search
             filters: Additional filters
             location: Location-based filtering
-            price_range: Min and max price tuple
+            price_range: Min and max price in paise; either bound may be None
             quality_grades: List of quality grades to filter by
             availability_statuses: List of availability statuses
             page: Page number (1-based)
@@ -869,7 +869,7 @@ class ProductSearchService:
         language: LanguageCode,
         filters: Optional[Dict[str, Any]],
         location: Optional[Dict[str, Any]],
-        price_range: Optional[Tuple[Decimal, Decimal]],
+        price_range: Optional[Tuple[int, Optional[int]]],
         quality_grades: Optional[List[QualityGrade]],
         availability_statuses: Optional[List[AvailabilityStatus]],
         boost_local: bool = True
@@ -950,14 +950,14 @@ class ProductSearchService:
         # Filter by active products only
         es_query["bool"]["filter"].append({"term": {"is_active": True}})
         
-        # Price range filter
+        # Price range filter; bounds arrive in paise, the index stores rupees
         if price_range:
-            min_price, max_price = price_range
+            min_paise, max_paise = price_range
             price_filter = {"range": {"base_price": {}}}
-            if min_price is not None:
-                price_filter["range"]["base_price"]["gte"] = float(min_price)
-            if max_price is not None:
-                price_filter["range"]["base_price"]["lte"] = float(max_price)
+            if min_paise is not None:
+                price_filter["range"]["base_price"]["gte"] = min_paise / 100
+            if max_paise is not None:
+                price_filter["range"]["base_price"]["lte"] = max_paise / 100
             es_query["bool"]["filter"].append(price_filter)
         
         # Quality grade filter
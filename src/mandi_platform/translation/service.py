@@ -5,10 +5,11 @@ Translation service implementation using multiple NLP libraries.
 import time
 import hashlib
 import asyncio
-import json
 from typing import Optional, Dict, Any, List
 import logging
 
+import orjson
+
 # Indian language libraries
 try:
     from inltk import inltk
@@ -561,7 +562,7 @@ class TranslationService:
             cached_data = await redis.get(cache_key)
             
             if cached_data:
-                data = json.loads(cached_data)
+                data = orjson.loads(cached_data)
                 return TranslationResult(**data)
         except Exception as e:
             logger.warning(f"Failed to get cached translation: {e}")
@@ -576,7 +577,7 @@ class TranslationService:
             await redis.setex(
                 cache_key,
                 settings.translation_cache_ttl,
-                json.dumps(data)
+                orjson.dumps(data)
             )
             
             # Also increment usage count for analytics
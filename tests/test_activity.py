@@ -0,0 +1,161 @@
+"""
+Unit tests for last_active tracking and the batched Redis-to-database flush.
+"""
+
+import time
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, call, patch
+from uuid import uuid4
+
+import pytest
+
+from mandi_platform import activity
+from mandi_platform.redis_client import RedisManager
+
+
+def make_redis(entries):
+    """Mock RedisManager whose client holds ``entries`` (key -> value)."""
+    async def scan_iter(match, count):
+        for key in entries:
+            yield key
+    
+    client = MagicMock()
+    client.scan_iter = scan_iter
+    client.mget = AsyncMock(side_effect=lambda keys: [entries.get(key) for key in keys])
+    
+    redis_manager = AsyncMock()
+    redis_manager.connect.return_value = client
+    redis_manager.delete_if_unchanged.side_effect = lambda batch: len(batch)
+    return redis_manager
+
+
+def make_database():
+    """Mock DatabaseManager yielding one session."""
+    session = AsyncMock()
+    
+    @asynccontextmanager
+    async def async_session():
+        yield session
+    
+    database_manager = MagicMock()
+    database_manager.async_session = async_session
+    return database_manager
+
+
+def last_active_entries(count):
+    """Recorded timestamps for ``count`` users."""
+    now = str(time.time())
+    return {f"{activity.LAST_ACTIVE_KEY_PREFIX}{uuid4()}": now for _ in range(count)}
+
+
+@pytest.mark.unit
+class TestFlushLastActive:
+    """Test flush_last_active batching and failure handling."""
+    
+    @pytest.mark.asyncio
+    async def test_nothing_recorded(self):
+        """No keys means no database work."""
+        redis_manager = make_redis({})
+        
+        with patch.object(activity, "get_redis_manager", return_value=redis_manager), \
+             patch.object(activity, "user_crud") as crud:
+            assert await activity.flush_last_active() == 0
+        
+        crud.bulk_update_last_active.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_flushes_in_batches_and_clears_after_each(self):
+        """Each batch is updated, then exactly its keys are cleared."""
+        entries = last_active_entries(activity.LAST_ACTIVE_FLUSH_BATCH_SIZE * 2 + 5)
+        redis_manager = make_redis(entries)
+        events = []
+        
+        async def bulk_update(db, timestamps):
+            events.append(("update", len(timestamps)))
+            return len(timestamps)
+        
+        redis_manager.delete_if_unchanged.side_effect = (
+            lambda batch: events.append(("delete", len(batch))) or len(batch)
+        )
+        
+        with patch.object(activity, "get_redis_manager", return_value=redis_manager), \
+             patch.object(activity, "get_database_manager", return_value=make_database()), \
+             patch.object(activity.user_crud, "bulk_update_last_active", side_effect=bulk_update):
+            updated = await activity.flush_last_active()
+        
+        size = activity.LAST_ACTIVE_FLUSH_BATCH_SIZE
+        assert updated == len(entries)
+        assert events == [
+            ("update", size), ("delete", size),
+            ("update", size), ("delete", size),
+            ("update", 5), ("delete", 5),
+        ]
+        # Cleared with the values that were read, so newer writes survive
+        first_batch = redis_manager.delete_if_unchanged.call_args_list[0].args[0]
+        assert all(entries[key] == value for key, value in first_batch.items())
+    
+    @pytest.mark.asyncio
+    async def test_failed_batch_keeps_its_entries(self):
+        """Entries of a failed batch and later ones stay in Redis."""
+        entries = last_active_entries(activity.LAST_ACTIVE_FLUSH_BATCH_SIZE * 2 + 5)
+        redis_manager = make_redis(entries)
+        bulk_update = AsyncMock(side_effect=[activity.LAST_ACTIVE_FLUSH_BATCH_SIZE, ConnectionError("db down")])
+        
+        with patch.object(activity, "get_redis_manager", return_value=redis_manager), \
+             patch.object(activity, "get_database_manager", return_value=make_database()), \
+             patch.object(activity.user_crud, "bulk_update_last_active", bulk_update):
+            with pytest.raises(ConnectionError):
+                await activity.flush_last_active()
+        
+        assert bulk_update.await_count == 2
+        redis_manager.delete_if_unchanged.assert_called_once()
+        cleared = redis_manager.delete_if_unchanged.call_args.args[0]
+        assert len(cleared) == activity.LAST_ACTIVE_FLUSH_BATCH_SIZE
+    
+    @pytest.mark.asyncio
+    async def test_malformed_entries_are_cleared_but_not_written(self):
+        """Unparseable keys are skipped for the UPDATE and removed afterwards."""
+        user_id = uuid4()
+        entries = {
+            f"{activity.LAST_ACTIVE_KEY_PREFIX}{user_id}": str(time.time()),
+            f"{activity.LAST_ACTIVE_KEY_PREFIX}not-a-uuid": str(time.time()),
+        }
+        redis_manager = make_redis(entries)
+        bulk_update = AsyncMock(return_value=1)
+        
+        with patch.object(activity, "get_redis_manager", return_value=redis_manager), \
+             patch.object(activity, "get_database_manager", return_value=make_database()), \
+             patch.object(activity.user_crud, "bulk_update_last_active", bulk_update):
+            assert await activity.flush_last_active() == 1
+        
+        assert list(bulk_update.call_args.args[1]) == [user_id]
+        assert redis_manager.delete_if_unchanged.call_args == call(entries)
+
+
+@pytest.mark.unit
+class TestDeleteIfUnchanged:
+    """Test RedisManager.delete_if_unchanged, which the flush clears keys with."""
+    
+    @pytest.mark.asyncio
+    async def test_passes_keys_with_their_read_values(self):
+        """Keys and expected values are sent to the script in matching order."""
+        script = AsyncMock(return_value=2)
+        client = MagicMock()
+        client.register_script.return_value = script
+        redis_manager = RedisManager("redis://localhost")
+        redis_manager.client = client
+        
+        deleted = await redis_manager.delete_if_unchanged({"a": "1", "b": "2"})
+        
+        assert deleted == 2
+        script.assert_awaited_once_with(keys=["a", "b"], args=["1", "2"])
+    
+    @pytest.mark.asyncio
+    async def test_empty_batch_skips_redis(self):
+        """Nothing to delete means no script call."""
+        client = MagicMock()
+        redis_manager = RedisManager("redis://localhost")
+        redis_manager.client = client
+        
+        assert await redis_manager.delete_if_unchanged({}) == 0
+        client.register_script.assert_not_called()
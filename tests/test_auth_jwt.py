@@ -162,6 +162,42 @@ class TestJWTTokenVerification:
             verify_token(token)
         
         assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
+    
+    def test_verify_token_reuses_cached_result(self):
+        """Test that a repeated token is not decoded again."""
+        data = {"sub": str(uuid4()), "user_type": "user", "phone_number": "+919876543210"}
+        token = create_access_token(data)
+        
+        first = verify_token(token)
+        with patch("src.mandi_platform.auth.jwt.jwt.decode") as mock_decode:
+            second = verify_token(token)
+        
+        assert second == first
+        mock_decode.assert_not_called()
+    
+    def test_verify_token_cache_ignores_rotated_secret(self):
+        """Test that cached tokens are re-checked after the secret changes."""
+        data = {"sub": str(uuid4()), "user_type": "user", "phone_number": "+919876543210"}
+        token = create_access_token(data)
+        verify_token(token)
+        
+        with patch.object(settings, "secret_key", settings.secret_key + "-rotated"):
+            with pytest.raises(HTTPException) as exc_info:
+                verify_token(token)
+        
+        assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
+    
+    def test_verify_token_rejects_foreign_header_without_decoding(self):
+        """Test that tokens with an unexpected header skip signature checks."""
+        data = {"sub": str(uuid4()), "user_type": "user", "phone_number": "+919876543210"}
+        token = jwt.encode(data, settings.secret_key, algorithm="HS512")
+        
+        with patch("src.mandi_platform.auth.jwt.jwt.decode") as mock_decode:
+            with pytest.raises(HTTPException) as exc_info:
+                verify_token(token)
+        
+        assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
+        mock_decode.assert_not_called()
 
 
 class TestUserAuthentication:
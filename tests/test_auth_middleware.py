@@ -7,61 +7,85 @@ token validation, security headers, rate limiting, and request processing.
 
 import pytest
 import time
-from unittest.mock import AsyncMock, patch, MagicMock
+from unittest.mock import AsyncMock, patch
 from uuid import uuid4
 
-from fastapi import Request, Response, HTTPException, status
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import Depends, FastAPI, HTTPException, status
+from fastapi.testclient import TestClient
 
-from src.mandi_platform.auth.middleware import AuthMiddleware, RateLimitMiddleware
+from src.mandi_platform.auth.middleware import AuthMiddleware, RateLimitMiddleware, get_current_token_data
 from src.mandi_platform.auth.schemas import TokenData
-from src.mandi_platform.models.user import User
-from src.mandi_platform.models.enums import LanguageCode, TechLiteracyLevel, VerificationStatus
 
 
-class TestAuthMiddleware:
-    """Test authentication middleware functionality."""
+def make_scope(path="/api/test", method="GET", headers=None, client=("127.0.0.1", 50000)):
+    """Build a minimal ASGI HTTP scope."""
+    return {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "headers": [
+            (name.lower().encode("latin-1"), value.encode("latin-1"))
+            for name, value in (headers or {}).items()
+        ],
+        "client": client,
+    }
+
+
+async def ok_app(scope, receive, send):
+    """Downstream ASGI app that records the token data it sees and answers 200."""
+    scope["token_data"] = get_current_token_data()
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def failing_app(scope, receive, send):
+    """Downstream ASGI app that raises before responding."""
+    raise Exception("Unexpected error")
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def call(middleware, scope):
+    """Run ``middleware`` on ``scope`` and return (status, headers, body)."""
+    messages = []
     
-    @pytest.fixture
-    def mock_request(self):
-        """Create a mock request object."""
-        request = MagicMock(spec=Request)
-        request.url.path = "/api/test"
-        request.method = "GET"
-        request.headers = {}
-        request.client.host = "127.0.0.1"
-        request.state = MagicMock()
-        return request
+    async def send(message):
+        messages.append(message)
     
-    @pytest.fixture
-    def mock_response(self):
-        """Create a mock response object."""
-        response = MagicMock(spec=Response)
-        response.headers = {}
-        return response
+    await middleware(scope, receive, send)
+    
+    start = messages[0]
+    headers = {k.decode("latin-1"): v.decode("latin-1") for k, v in start["headers"]}
+    body = b"".join(m.get("body", b"") for m in messages[1:])
+    return start["status"], headers, body
+
+
+class TestAuthMiddleware:
+    """Test authentication middleware functionality."""
     
     @pytest.fixture
     def auth_middleware(self):
         """Create auth middleware instance."""
-        app = MagicMock()
-        return AuthMiddleware(app)
+        return AuthMiddleware(ok_app)
     
     @pytest.mark.asyncio
-    async def test_excluded_paths_skip_auth(self, auth_middleware, mock_request, mock_response):
+    async def test_excluded_paths_skip_auth(self, auth_middleware):
         """Test that excluded paths skip authentication."""
-        mock_request.url.path = "/docs"
-        
-        async def mock_call_next(request):
-            return mock_response
+        scope = make_scope(path="/docs")
         
-        result = await auth_middleware.dispatch(mock_request, mock_call_next)
+        status_code, headers, body = await call(auth_middleware, scope)
         
-        assert result == mock_response
-        # For excluded paths, no authentication state should be set at all
-        # The middleware returns early without setting any state
+        assert status_code == 200
+        assert body == b"ok"
+        # For excluded paths the middleware returns early without
+        # verifying anything
+        assert scope["token_data"] is None
+        assert "X-Content-Type-Options" not in headers
     
     @pytest.mark.asyncio
-    async def test_valid_token_authentication(self, auth_middleware, mock_request, mock_response):
+    async def test_valid_token_authentication(self, auth_middleware):
         """Test successful authentication with valid token."""
         user_id = uuid4()
         token_data = TokenData(
@@ -71,87 +95,92 @@ class TestAuthMiddleware:
             exp=int(time.time()) + 3600
         )
         
-        mock_request.headers = {"Authorization": "Bearer valid-token"}
+        scope = make_scope(headers={"Authorization": "Bearer valid-token"})
         
-        async def mock_call_next(request):
-            return mock_response
-        
-        with patch("src.mandi_platform.auth.middleware.verify_token", return_value=token_data):
-            result = await auth_middleware.dispatch(mock_request, mock_call_next)
+        with patch("src.mandi_platform.auth.middleware.verify_token", return_value=token_data) as mock_verify:
+            status_code, headers, body = await call(auth_middleware, scope)
         
-        assert result == mock_response
-        assert mock_request.state.user_id == user_id
-        assert mock_request.state.user_type == "user"
-        assert mock_request.state.phone_number == "+919876543210"
-        assert mock_request.state.authenticated is True
+        assert status_code == 200
+        mock_verify.assert_called_once_with("valid-token")
+        assert scope["token_data"] is token_data
+        # The token is only visible while the request is being handled
+        assert get_current_token_data() is None
     
     @pytest.mark.asyncio
-    async def test_invalid_token_authentication(self, auth_middleware, mock_request, mock_response):
+    async def test_invalid_token_authentication(self, auth_middleware):
         """Test authentication failure with invalid token."""
-        mock_request.headers = {"Authorization": "Bearer invalid-token"}
-        mock_request.url.path = "/api/protected"
-        
-        async def mock_call_next(request):
-            return mock_response
+        scope = make_scope(path="/api/protected", headers={"Authorization": "Bearer invalid-token"})
         
         with patch("src.mandi_platform.auth.middleware.verify_token", 
                   side_effect=HTTPException(status_code=401, detail="Invalid token")):
-            result = await auth_middleware.dispatch(mock_request, mock_call_next)
+            status_code, headers, body = await call(auth_middleware, scope)
         
         # Should return 401 for API endpoints
-        assert result.status_code == status.HTTP_401_UNAUTHORIZED
-        assert "Authentication required" in result.body.decode()
+        assert status_code == status.HTTP_401_UNAUTHORIZED
+        assert "Authentication required" in body.decode()
+        assert headers["www-authenticate"] == "Bearer"
     
     @pytest.mark.asyncio
-    async def test_missing_authorization_header(self, auth_middleware, mock_request, mock_response):
-        """Test request without authorization header."""
-        mock_request.headers = {}
+    async def test_invalid_token_outside_api(self, auth_middleware):
+        """Test that non-API paths reach the handler unauthenticated."""
+        scope = make_scope(path="/products", headers={"Authorization": "Bearer invalid-token"})
+        
+        with patch("src.mandi_platform.auth.middleware.verify_token", 
+                  side_effect=HTTPException(status_code=401, detail="Invalid token")):
+            status_code, headers, body = await call(auth_middleware, scope)
         
-        async def mock_call_next(request):
-            return mock_response
+        assert status_code == 200
+        assert scope["token_data"] is None
+    
+    @pytest.mark.asyncio
+    async def test_missing_authorization_header(self, auth_middleware):
+        """Test request without authorization header."""
+        scope = make_scope()
         
-        result = await auth_middleware.dispatch(mock_request, mock_call_next)
+        status_code, headers, body = await call(auth_middleware, scope)
         
-        assert result == mock_response
-        assert mock_request.state.authenticated is False
+        assert status_code == 200
+        assert scope["token_data"] is None
     
     @pytest.mark.asyncio
-    async def test_malformed_authorization_header(self, auth_middleware, mock_request, mock_response):
+    async def test_malformed_authorization_header(self, auth_middleware):
         """Test request with malformed authorization header."""
-        mock_request.headers = {"Authorization": "InvalidFormat token"}
+        scope = make_scope(headers={"Authorization": "InvalidFormat token"})
         
-        async def mock_call_next(request):
-            return mock_response
+        status_code, headers, body = await call(auth_middleware, scope)
         
-        result = await auth_middleware.dispatch(mock_request, mock_call_next)
-        
-        assert result == mock_response
-        assert mock_request.state.authenticated is False
+        assert status_code == 200
+        assert scope["token_data"] is None
     
     @pytest.mark.asyncio
-    async def test_security_headers_added(self, auth_middleware, mock_request, mock_response):
+    async def test_security_headers_added(self, auth_middleware):
         """Test that security headers are added to response."""
-        async def mock_call_next(request):
-            return mock_response
-        
-        result = await auth_middleware.dispatch(mock_request, mock_call_next)
+        status_code, headers, body = await call(auth_middleware, make_scope())
         
-        assert result.headers["X-Content-Type-Options"] == "nosniff"
-        assert result.headers["X-Frame-Options"] == "DENY"
-        assert result.headers["X-XSS-Protection"] == "1; mode=block"
+        assert headers["x-content-type-options"] == "nosniff"
+        assert headers["x-frame-options"] == "DENY"
+        assert headers["x-xss-protection"] == "1; mode=block"
     
     @pytest.mark.asyncio
-    async def test_process_time_header_in_debug(self, auth_middleware, mock_request, mock_response):
+    async def test_process_time_header_in_debug(self, auth_middleware):
         """Test that process time header is added in debug mode."""
-        async def mock_call_next(request):
-            return mock_response
-        
         with patch("src.mandi_platform.auth.middleware.settings.debug", True):
-            result = await auth_middleware.dispatch(mock_request, mock_call_next)
+            status_code, headers, body = await call(auth_middleware, make_scope())
         
-        assert "X-Process-Time" in result.headers
+        assert "x-process-time" in headers
         # Should be a valid float string
-        float(result.headers["X-Process-Time"])
+        float(headers["x-process-time"])
+    
+    @pytest.mark.asyncio
+    async def test_non_http_scope_passes_through(self):
+        """Test that lifespan and websocket scopes are not touched."""
+        app = AsyncMock()
+        middleware = AuthMiddleware(app)
+        scope = {"type": "lifespan"}
+        
+        await middleware(scope, receive, AsyncMock())
+        
+        app.assert_awaited_once()
 
 
 class TestRateLimitMiddleware:
@@ -160,106 +189,95 @@ class TestRateLimitMiddleware:
     @pytest.fixture
     def rate_limit_middleware(self):
         """Create rate limit middleware instance."""
-        app = MagicMock()
-        return RateLimitMiddleware(app, requests_per_minute=5)  # Low limit for testing
-    
-    @pytest.fixture
-    def mock_request(self):
-        """Create a mock request object."""
-        request = MagicMock(spec=Request)
-        request.client.host = "127.0.0.1"
-        return request
-    
-    @pytest.fixture
-    def mock_response(self):
-        """Create a mock response object."""
-        response = MagicMock(spec=Response)
-        response.headers = {}
-        return response
+        return RateLimitMiddleware(ok_app, requests_per_minute=5)  # Low limit for testing
     
     @pytest.mark.asyncio
-    async def test_requests_within_limit(self, rate_limit_middleware, mock_request, mock_response):
+    async def test_requests_within_limit(self, rate_limit_middleware):
         """Test requests within rate limit are allowed."""
-        async def mock_call_next(request):
-            return mock_response
-        
         # Make requests within limit
         for i in range(3):
-            result = await rate_limit_middleware.dispatch(mock_request, mock_call_next)
-            assert result == mock_response
-            assert "X-RateLimit-Limit" in result.headers
-            assert "X-RateLimit-Remaining" in result.headers
+            status_code, headers, body = await call(rate_limit_middleware, make_scope())
+            assert status_code == 200
+            assert "x-ratelimit-limit" in headers
+            assert "x-ratelimit-remaining" in headers
     
     @pytest.mark.asyncio
-    async def test_rate_limit_exceeded(self, rate_limit_middleware, mock_request, mock_response):
+    async def test_rate_limit_exceeded(self, rate_limit_middleware):
         """Test rate limit enforcement."""
-        async def mock_call_next(request):
-            return mock_response
-        
         # Exhaust rate limit
         for i in range(5):
-            await rate_limit_middleware.dispatch(mock_request, mock_call_next)
+            await call(rate_limit_middleware, make_scope())
         
         # Next request should be rate limited
-        result = await rate_limit_middleware.dispatch(mock_request, mock_call_next)
+        status_code, headers, body = await call(rate_limit_middleware, make_scope())
         
-        assert result.status_code == status.HTTP_429_TOO_MANY_REQUESTS
-        assert "Rate limit exceeded" in result.body.decode()
-        assert result.headers["Retry-After"] == "60"
-        assert result.headers["X-RateLimit-Remaining"] == "0"
+        assert status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert "Rate limit exceeded" in body.decode()
+        assert headers["retry-after"] == "60"
+        assert headers["x-ratelimit-remaining"] == "0"
     
     @pytest.mark.asyncio
-    async def test_different_ips_separate_limits(self, rate_limit_middleware, mock_response):
+    async def test_different_ips_separate_limits(self, rate_limit_middleware):
         """Test that different IPs have separate rate limits."""
-        async def mock_call_next(request):
-            return mock_response
-        
-        # Create requests from different IPs
-        request1 = MagicMock(spec=Request)
-        request1.client.host = "127.0.0.1"
-        
-        request2 = MagicMock(spec=Request)
-        request2.client.host = "192.168.1.1"
-        
         # Exhaust limit for first IP
         for i in range(5):
-            await rate_limit_middleware.dispatch(request1, mock_call_next)
+            await call(rate_limit_middleware, make_scope(client=("127.0.0.1", 50000)))
         
         # First IP should be rate limited
-        result1 = await rate_limit_middleware.dispatch(request1, mock_call_next)
-        assert result1.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        status1, _, _ = await call(rate_limit_middleware, make_scope(client=("127.0.0.1", 50000)))
+        assert status1 == status.HTTP_429_TOO_MANY_REQUESTS
         
         # Second IP should still work
-        result2 = await rate_limit_middleware.dispatch(request2, mock_call_next)
-        assert result2 == mock_response
+        status2, _, _ = await call(rate_limit_middleware, make_scope(client=("192.168.1.1", 50000)))
+        assert status2 == 200
     
     @pytest.mark.asyncio
-    async def test_rate_limit_headers(self, rate_limit_middleware, mock_request, mock_response):
+    async def test_rate_limit_headers(self, rate_limit_middleware):
         """Test rate limit headers are correctly set."""
-        async def mock_call_next(request):
-            return mock_response
+        status_code, headers, body = await call(rate_limit_middleware, make_scope())
         
-        result = await rate_limit_middleware.dispatch(mock_request, mock_call_next)
-        
-        assert result.headers["X-RateLimit-Limit"] == "5"
-        assert "X-RateLimit-Remaining" in result.headers
+        assert headers["x-ratelimit-limit"] == "5"
+        assert headers["x-ratelimit-remaining"] == "4"
         
         # Remaining should decrease with each request
-        remaining = int(result.headers["X-RateLimit-Remaining"])
-        assert 0 <= remaining <= 5
+        status_code, headers, body = await call(rate_limit_middleware, make_scope())
+        assert headers["x-ratelimit-remaining"] == "3"
     
     @pytest.mark.asyncio
-    async def test_unknown_client_ip(self, rate_limit_middleware, mock_response):
+    async def test_unknown_client_ip(self, rate_limit_middleware):
         """Test handling of requests with unknown client IP."""
-        request = MagicMock(spec=Request)
-        request.client = None  # No client info
-        
-        async def mock_call_next(request):
-            return mock_response
+        scope = make_scope(client=None)  # No client info
         
         # Should not crash and should still apply rate limiting
-        result = await rate_limit_middleware.dispatch(request, mock_call_next)
-        assert result == mock_response
+        status_code, headers, body = await call(rate_limit_middleware, scope)
+        assert status_code == 200
+        assert rate_limit_middleware.request_counts["unknown"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_shared_counter_in_redis(self):
+        """Test that counts come from Redis when a manager is configured."""
+        redis_manager = AsyncMock()
+        redis_manager.increment_with_ttl.return_value = 6  # Other workers used the quota
+        middleware = RateLimitMiddleware(ok_app, requests_per_minute=5, redis_manager=redis_manager)
+        
+        status_code, headers, body = await call(middleware, make_scope())
+        
+        assert status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        key, ttl = redis_manager.increment_with_ttl.await_args.args
+        assert key.startswith("rl:127.0.0.1:")
+        assert ttl == 60
+    
+    @pytest.mark.asyncio
+    async def test_redis_failure_falls_back_to_local_counts(self):
+        """Test that an unreachable Redis does not block requests."""
+        redis_manager = AsyncMock()
+        redis_manager.increment_with_ttl.side_effect = ConnectionError("redis down")
+        middleware = RateLimitMiddleware(ok_app, requests_per_minute=5, redis_manager=redis_manager)
+        
+        status_code, headers, body = await call(middleware, make_scope())
+        
+        assert status_code == 200
+        assert headers["x-ratelimit-remaining"] == "4"
 
 
 class TestMiddlewareIntegration:
@@ -268,19 +286,11 @@ class TestMiddlewareIntegration:
     @pytest.mark.asyncio
     async def test_middleware_chain_execution(self):
         """Test that middleware chain executes in correct order."""
-        app = MagicMock()
-        auth_middleware = AuthMiddleware(app)
-        rate_limit_middleware = RateLimitMiddleware(app, requests_per_minute=10)
+        # Same nesting as main.py: rate limiting wraps authentication
+        auth_middleware = AuthMiddleware(ok_app)
+        rate_limit_middleware = RateLimitMiddleware(auth_middleware, requests_per_minute=10)
         
-        request = MagicMock(spec=Request)
-        request.url.path = "/api/test"
-        request.method = "GET"
-        request.headers = {"Authorization": "Bearer valid-token"}
-        request.client.host = "127.0.0.1"
-        request.state = MagicMock()
-        
-        response = MagicMock(spec=Response)
-        response.headers = {}
+        scope = make_scope(headers={"Authorization": "Bearer valid-token"})
         
         user_id = uuid4()
         token_data = TokenData(
@@ -290,44 +300,57 @@ class TestMiddlewareIntegration:
             exp=int(time.time()) + 3600
         )
         
-        async def mock_call_next(request):
-            return response
-        
-        # Test auth middleware first
         with patch("src.mandi_platform.auth.middleware.verify_token", return_value=token_data):
-            auth_result = await auth_middleware.dispatch(request, mock_call_next)
-        
-        # Then rate limit middleware
-        rate_result = await rate_limit_middleware.dispatch(request, mock_call_next)
+            status_code, headers, body = await call(rate_limit_middleware, scope)
         
         # Both should succeed
-        assert auth_result == response
-        assert rate_result == response
-        assert request.state.authenticated is True
-        assert "X-RateLimit-Limit" in rate_result.headers
+        assert status_code == 200
+        assert scope["token_data"] is token_data
+        assert "x-ratelimit-limit" in headers
+        assert headers["x-frame-options"] == "DENY"
     
     @pytest.mark.asyncio
     async def test_auth_failure_with_rate_limiting(self):
         """Test authentication failure combined with rate limiting."""
-        app = MagicMock()
-        auth_middleware = AuthMiddleware(app)
-        
-        request = MagicMock(spec=Request)
-        request.url.path = "/api/protected"
-        request.method = "POST"
-        request.headers = {"Authorization": "Bearer invalid-token"}
-        request.client.host = "127.0.0.1"
-        request.state = MagicMock()
+        auth_middleware = AuthMiddleware(ok_app)
+        rate_limit_middleware = RateLimitMiddleware(auth_middleware, requests_per_minute=10)
         
-        async def mock_call_next(request):
-            return MagicMock(spec=Response)
+        scope = make_scope(
+            path="/api/protected",
+            method="POST",
+            headers={"Authorization": "Bearer invalid-token"},
+        )
         
         with patch("src.mandi_platform.auth.middleware.verify_token", 
                   side_effect=HTTPException(status_code=401, detail="Invalid token")):
-            result = await auth_middleware.dispatch(request, mock_call_next)
+            status_code, headers, body = await call(rate_limit_middleware, scope)
+        
+        assert status_code == status.HTTP_401_UNAUTHORIZED
+        assert "Authentication required" in body.decode()
+        assert headers["x-ratelimit-remaining"] == "9"
+
+
+    def test_token_data_dependency(self):
+        """Test that route handlers receive the verified token through DI."""
+        app = FastAPI()
+        app.add_middleware(AuthMiddleware)
+        
+        @app.get("/api/me")
+        async def me(token_data=Depends(get_current_token_data)):
+            return {"user_type": token_data.user_type if token_data else None}
+        
+        token_data = TokenData(
+            user_id=uuid4(),
+            user_type="vendor",
+            phone_number="+919876543210",
+        )
+        
+        client = TestClient(app)
+        with patch("src.mandi_platform.auth.middleware.verify_token", return_value=token_data):
+            response = client.get("/api/me", headers={"Authorization": "Bearer valid-token"})
         
-        assert result.status_code == status.HTTP_401_UNAUTHORIZED
-        assert "Authentication required" in result.body.decode()
+        assert response.json() == {"user_type": "vendor"}
+        assert client.get("/api/me").json() == {"user_type": None}
 
 
 class TestMiddlewareErrorHandling:
@@ -336,35 +359,41 @@ class TestMiddlewareErrorHandling:
     @pytest.mark.asyncio
     async def test_auth_middleware_exception_handling(self):
         """Test auth middleware handles exceptions gracefully."""
-        app = MagicMock()
-        middleware = AuthMiddleware(app)
-        
-        request = MagicMock(spec=Request)
-        request.url.path = "/api/test"
-        request.headers = {"Authorization": "Bearer token"}
-        request.client.host = "127.0.0.1"
-        request.state = MagicMock()
+        middleware = AuthMiddleware(failing_app)
         
-        async def mock_call_next(request):
-            raise Exception("Unexpected error")
+        # A non-API path, so a rejected token still reaches the app
+        scope = make_scope(path="/products", headers={"Authorization": "Bearer token"})
         
         # The middleware should let the exception propagate
         # (it doesn't handle application-level exceptions)
         with pytest.raises(Exception, match="Unexpected error"):
-            await middleware.dispatch(request, mock_call_next)
+            await middleware(scope, receive, AsyncMock())
+    
+    @pytest.mark.asyncio
+    async def test_token_data_reset_when_app_raises(self):
+        """Test that a failing request does not leak its token data."""
+        middleware = AuthMiddleware(failing_app)
+        token_data = TokenData(
+            user_id=uuid4(),
+            user_type="user",
+            phone_number="+919876543210",
+        )
+        
+        with patch("src.mandi_platform.auth.middleware.verify_token", return_value=token_data):
+            with pytest.raises(Exception, match="Unexpected error"):
+                await middleware(
+                    make_scope(headers={"Authorization": "Bearer valid-token"}),
+                    receive,
+                    AsyncMock(),
+                )
+        
+        assert get_current_token_data() is None
     
     @pytest.mark.asyncio
     async def test_rate_limit_middleware_exception_handling(self):
         """Test rate limit middleware handles exceptions gracefully."""
-        app = MagicMock()
-        middleware = RateLimitMiddleware(app)
-        
-        request = MagicMock(spec=Request)
-        request.client.host = "127.0.0.1"
-        
-        async def mock_call_next(request):
-            raise Exception("Unexpected error")
+        middleware = RateLimitMiddleware(failing_app)
         
         # Should not crash the middleware
         with pytest.raises(Exception, match="Unexpected error"):
-            await middleware.dispatch(request, mock_call_next)
\ No newline at end of file
+            await middleware(make_scope(), receive, AsyncMock())
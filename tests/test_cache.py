@@ -0,0 +1,197 @@
+"""
+Unit tests for the Redis-backed response cache.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import orjson
+import pytest
+from pydantic import BaseModel
+
+from mandi_platform import cache
+
+
+@pytest.mark.unit
+class TestGetOrSet:
+    """Test cache.get_or_set behaviour on hits, misses and Redis errors."""
+    
+    @pytest.mark.asyncio
+    async def test_hit_skips_compute(self):
+        """A cached body is returned without calling compute."""
+        redis_manager = AsyncMock()
+        redis_manager.get.return_value = '{"cached": true}'
+        compute = AsyncMock()
+        
+        with patch.object(cache, "get_redis_manager", return_value=redis_manager):
+            body = await cache.get_or_set("product:1:v1", compute, ttl=300)
+        
+        assert body == '{"cached": true}'
+        compute.assert_not_awaited()
+        redis_manager.set.assert_not_awaited()
+    
+    @pytest.mark.asyncio
+    async def test_miss_computes_and_stores(self):
+        """A miss computes the payload and stores the serialized body."""
+        redis_manager = AsyncMock()
+        redis_manager.get.return_value = None
+        compute = AsyncMock(return_value={"id": "1", "names": {"en": "Tomato"}})
+        
+        with patch.object(cache, "get_redis_manager", return_value=redis_manager):
+            body = await cache.get_or_set("product:1:v1", compute, ttl=300)
+        
+        assert orjson.loads(body) == {"id": "1", "names": {"en": "Tomato"}}
+        redis_manager.set.assert_awaited_once_with("product:1:v1", body, ttl=300)
+    
+    @pytest.mark.asyncio
+    async def test_miss_serializes_models_with_pydantic(self):
+        """Pydantic models are serialized with model_dump_json."""
+        class Payload(BaseModel):
+            total: int
+        
+        redis_manager = AsyncMock()
+        redis_manager.get.return_value = None
+        compute = AsyncMock(return_value=Payload(total=3))
+        
+        with patch.object(cache, "get_redis_manager", return_value=redis_manager):
+            body = await cache.get_or_set("products:list:x", compute, ttl=120)
+        
+        assert body == '{"total":3}'
+    
+    @pytest.mark.asyncio
+    async def test_miss_stores_encoded_bytes_as_is(self):
+        """Pre-encoded JSON bytes are stored without re-serializing."""
+        redis_manager = AsyncMock()
+        redis_manager.get.return_value = None
+        compute = AsyncMock(return_value=b'[{"id":"1"}]')
+        
+        with patch.object(cache, "get_redis_manager", return_value=redis_manager):
+            body = await cache.get_or_set("products:featured:None:10", compute, ttl=120)
+        
+        assert body == '[{"id":"1"}]'
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_load(self):
+        """Concurrent misses for the same key run compute once."""
+        redis_manager = AsyncMock()
+        redis_manager.get.return_value = None
+        release = asyncio.Event()
+        calls = 0
+        
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return {"id": "1"}
+        
+        with patch.object(cache, "get_redis_manager", return_value=redis_manager):
+            tasks = [
+                asyncio.create_task(cache.get_or_set("product:1:v1", compute, ttl=300))
+                for _ in range(5)
+            ]
+            await asyncio.sleep(0)
+            release.set()
+            bodies = await asyncio.gather(*tasks)
+        
+        assert calls == 1
+        assert bodies == ['{"id":"1"}'] * 5
+        assert cache._in_flight == {}
+    
+    @pytest.mark.asyncio
+    async def test_redis_failure_falls_through(self):
+        """Redis errors do not fail the request."""
+        redis_manager = AsyncMock()
+        redis_manager.get.side_effect = ConnectionError("down")
+        redis_manager.set.side_effect = ConnectionError("down")
+        compute = AsyncMock(return_value=[])
+        
+        with patch.object(cache, "get_redis_manager", return_value=redis_manager):
+            body = await cache.get_or_set("products:featured:None:10", compute, ttl=120)
+        
+        assert body == "[]"
+        compute.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_compute_failure_is_not_cached(self):
+        """A failed compute propagates and nothing is stored."""
+        redis_manager = AsyncMock()
+        redis_manager.get.return_value = None
+        compute = AsyncMock(side_effect=ConnectionError("stream lost"))
+        
+        with patch.object(cache, "get_redis_manager", return_value=redis_manager):
+            with pytest.raises(ConnectionError):
+                await cache.get_or_set("products:featured:None:10", compute, ttl=120)
+        
+        redis_manager.set.assert_not_awaited()
+        assert cache._in_flight == {}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_invalidate_product_clears_related_keys():
+    """Invalidation removes the detail entry and any listing containing it."""
+    redis_manager = AsyncMock()
+    
+    with patch.object(cache, "get_redis_manager", return_value=redis_manager):
+        await cache.invalidate_product("p1", "v1", "c1")
+    
+    redis_manager.delete.assert_awaited_once_with("product:p1:v1")
+    patterns = [c.args[0] for c in redis_manager.delete_pattern.await_args_list]
+    assert patterns == [
+        "products:list:*v1*",
+        "products:list:*c1*",
+        "products:featured:*",
+    ]
+
+
+@pytest.mark.unit
+class TestETag:
+    """Test ETag generation and If-None-Match matching."""
+    
+    def test_etag_is_weak_and_tracks_body(self):
+        """The ETag is weak and changes whenever the body changes."""
+        etag = cache.etag_for('{"id": "1"}')
+        
+        assert etag.startswith('W/"')
+        assert etag == cache.etag_for('{"id": "1"}')
+        assert etag != cache.etag_for('{"id": "2"}')
+    
+    def test_etag_matches(self):
+        """If-None-Match uses weak comparison and accepts lists and wildcards."""
+        etag = cache.etag_for('{"id": "1"}')
+        strong = etag.removeprefix("W/")
+        
+        assert cache.etag_matches(etag, etag)
+        assert cache.etag_matches(strong, etag)
+        assert cache.etag_matches(f'"other", {etag}', etag)
+        assert cache.etag_matches("*", etag)
+        assert not cache.etag_matches(None, etag)
+        assert not cache.etag_matches('"other"', etag)
+
+
+
+@pytest.mark.unit
+class TestVendorWriteMarker:
+    """Test the read-your-writes marker for vendor searches."""
+    
+    @pytest.mark.asyncio
+    async def test_marker_round_trip(self):
+        """A marked vendor reports a recent write under the marker key."""
+        redis_manager = AsyncMock()
+        redis_manager.exists.return_value = True
+        
+        with patch.object(cache, "get_redis_manager", return_value=redis_manager):
+            await cache.mark_vendor_write("v1", ttl=2)
+            assert await cache.has_recent_vendor_write("v1")
+        
+        redis_manager.set.assert_awaited_once_with("search:vendor_write:v1", "1", ttl=2)
+        redis_manager.exists.assert_awaited_once_with("search:vendor_write:v1")
+    
+    @pytest.mark.asyncio
+    async def test_redis_failure_reports_no_write(self):
+        """Redis errors fall back to the search index rather than failing."""
+        redis_manager = AsyncMock()
+        redis_manager.exists.side_effect = ConnectionError("redis down")
+        
+        with patch.object(cache, "get_redis_manager", return_value=redis_manager):
+            assert await cache.has_recent_vendor_write("v1") is False
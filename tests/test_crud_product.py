@@ -7,6 +7,7 @@ This module tests the ProductCRUD, ProductCategoryCRUD, and PriceHistoryCRUD cla
 import pytest
 from decimal import Decimal
 from uuid import uuid4
+from unittest.mock import AsyncMock
 from datetime import datetime, timedelta
 
 from src.mandi_platform.crud.product import ProductCRUD, ProductCategoryCRUD, PriceHistoryCRUD
@@ -145,6 +146,51 @@ async def test_product_crud_update():
         assert updated_product.is_featured is True
 
 
+@pytest.mark.asyncio
+async def test_product_crud_update_as_vendor():
+    """Test vendor-scoped single-statement product update."""
+    async with get_test_db_session() as db:
+        # Create test data
+        vendor = await create_test_vendor(db)
+        
+        category_crud = ProductCategoryCRUD(db)
+        category = await category_crud.create_category(
+            category_enum=ProductCategory.FRUITS,
+            names={"en": "Fruits"}
+        )
+        
+        product_crud = ProductCRUD(db)
+        product = await product_crud.create_product(
+            vendor_id=vendor.id,
+            category_id=category.id,
+            names={"en": "Mangoes"},
+            descriptions={"en": "Alphonso mangoes"},
+            base_price=Decimal("120.00"),
+            unit=MeasurementUnit.KILOGRAM.value,
+            location={"city": "Ratnagiri"}
+        )
+        
+        # Another vendor cannot update the product
+        not_updated = await product_crud.update_product_as_vendor(
+            product.id, uuid4(), base_price=Decimal("1.00")
+        )
+        assert not_updated is None
+        
+        # The owner can, including the is_featured flag bit
+        updated_product = await product_crud.update_product_as_vendor(
+            product.id, vendor.id, base_price=Decimal("130.00"), is_featured=True
+        )
+        
+        assert updated_product is not None
+        assert updated_product.base_price == Decimal("130.00")
+        assert updated_product.is_featured is True
+        assert updated_product.is_active is True
+        
+        # Stock updates derive availability in the same statement
+        stocked = await product_crud.update_stock_as_vendor(product.id, vendor.id, Decimal("5"))
+        assert stocked.availability_status == AvailabilityStatus.LIMITED_STOCK
+
+
 @pytest.mark.asyncio
 async def test_product_crud_stock_update():
     """Test stock update via CRUD."""
@@ -241,6 +287,12 @@ async def test_product_crud_get_by_vendor():
         vendor2_products = await product_crud.get_products_by_vendor(vendor2.id)
         assert len(vendor2_products) == 1
         assert vendor2_products[0].get_name() == "Cheese"
+        
+        # Counts ignore pagination
+        assert await product_crud.count_products_by_vendor(vendor1.id) == 2
+        assert await product_crud.count_products_by_vendor(vendor2.id) == 1
+        assert len(await product_crud.get_products_by_vendor(vendor1.id, limit=1)) == 1
+        assert await product_crud.count_products_by_category(category.id) == 3
 
 
 @pytest.mark.asyncio
@@ -443,4 +495,120 @@ async def test_price_history_crud():
         # Get average price
         avg_price = await price_crud.get_average_price(product.id, days=7)
         assert avg_price is not None
-        assert avg_price == Decimal("14250.00")  # Average of 14500 and 14000
\ No newline at end of file
+        assert avg_price == Decimal("14250.00")  # Average of 14500 and 14000
+
+
+@pytest.mark.asyncio
+async def test_record_prices_batch():
+    """Test recording many price points in one batch."""
+    async with get_test_db_session() as db:
+        vendor = await create_test_vendor(db)
+        
+        category_crud = ProductCategoryCRUD(db)
+        category = await category_crud.create_category(
+            category_enum=ProductCategory.GRAINS,
+            names={"en": "Grains"}
+        )
+        
+        product_crud = ProductCRUD(db)
+        product = await product_crud.create_product(
+            vendor_id=vendor.id,
+            category_id=category.id,
+            names={"en": "Wheat"},
+            descriptions={"en": "Sharbati wheat"},
+            base_price=Decimal("30.00"),
+            unit=MeasurementUnit.KILOGRAM.value,
+            location={"city": "Indore"}
+        )
+        
+        price_crud = PriceHistoryCRUD(db)
+        rows = [
+            {
+                "product_id": product.id,
+                "price": Decimal(price),
+                "quality_grade": QualityGrade.STANDARD,
+                "location": {"city": "Indore"},
+                "source": PriceSource.MARKET_API,
+            }
+            for price in ("28.00", "30.00", "32.00")
+        ]
+        rows[0]["market_conditions"] = MarketConditions.HIGH_DEMAND
+        
+        assert await price_crud.record_prices(rows) == 3
+        assert await price_crud.record_prices([]) == 0
+        
+        history = await price_crud.get_price_history(product.id, days=1)
+        assert len(history) == 3
+        assert await price_crud.get_average_price(product.id, days=1) == Decimal("30.00")
+        
+        stats = await price_crud.get_price_stats(product.id, days=1)
+        assert stats["minimum"] == Decimal("28.00")
+        assert stats["maximum"] == Decimal("32.00")
+        assert stats["count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_low_stock_products_by_vendor():
+    """Test that low stock products are grouped by the requesting vendor."""
+    async with get_test_db_session() as db:
+        vendor1 = await create_test_vendor(db)
+        vendor2 = await create_test_vendor(db)
+        
+        category_crud = ProductCategoryCRUD(db)
+        category = await category_crud.create_category(
+            category_enum=ProductCategory.VEGETABLES,
+            names={"en": "Vegetables"}
+        )
+        
+        product_crud = ProductCRUD(db)
+        stock = {
+            (vendor1.id, "Onion"): Decimal("2"),
+            (vendor1.id, "Garlic"): Decimal("5"),
+            (vendor1.id, "Ginger"): Decimal("50"),
+            (vendor2.id, "Tomato"): Decimal("3"),
+            (vendor2.id, "Potato"): Decimal("0"),
+        }
+        for (vendor_id, name), quantity in stock.items():
+            await product_crud.create_product(
+                vendor_id=vendor_id,
+                category_id=category.id,
+                names={"en": name},
+                descriptions={"en": f"Fresh {name.lower()}"},
+                base_price=Decimal("20.00"),
+                unit=MeasurementUnit.KILOGRAM.value,
+                location={"city": "Nashik"},
+                stock_quantity=quantity
+            )
+        
+        # Each vendor sees only their own low stock, lowest first; well
+        # stocked and sold-out products are excluded
+        vendor1_low = [p async for p in product_crud.iter_low_stock_products(vendor_id=vendor1.id)]
+        assert [p.get_name() for p in vendor1_low] == ["Onion", "Garlic"]
+        
+        vendor2_low = await product_crud.get_low_stock_products(vendor_id=vendor2.id)
+        assert [p.get_name() for p in vendor2_low] == ["Tomato"]
+        
+        # Without a vendor filter both vendors' products are returned
+        all_low = [p async for p in product_crud.iter_low_stock_products()]
+        assert {(p.vendor_id, p.get_name()) for p in all_low} == {
+            (vendor1.id, "Onion"), (vendor1.id, "Garlic"), (vendor2.id, "Tomato"),
+        }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("method", ["iter_featured_products", "iter_low_stock_products"])
+async def test_product_streams_propagate_errors(method):
+    """Test that a stream failing partway raises instead of ending early."""
+    async def rows():
+        yield Product(names={"en": "First"})
+        raise ConnectionError("connection lost")
+    
+    db = AsyncMock()
+    db.stream_scalars.return_value = rows()
+    
+    streamed = []
+    with pytest.raises(ConnectionError):
+        async for product in getattr(ProductCRUD(db), method)():
+            streamed.append(product)
+    
+    assert len(streamed) == 1
@@ -6,10 +6,13 @@ creation, retrieval, updates, and specialized queries.
 """
 
 import pytest
+from datetime import datetime, timezone
 from decimal import Decimal
 from unittest.mock import AsyncMock, MagicMock
 from uuid import uuid4
 
+from sqlalchemy.dialects import postgresql
+
 from mandi_platform.crud.user import UserCRUD, VendorCRUD, user_crud, vendor_crud
 from mandi_platform.models.user import User, Vendor
 from mandi_platform.models.enums import (
@@ -124,6 +127,63 @@ class TestUserCRUD:
         assert result == [sample_user]
         mock_db_session.execute.assert_called_once()
     
+    @pytest.mark.asyncio
+    async def test_create_if_not_exists_created(self, mock_db_session, sample_user):
+        """Test creating a user with an unregistered phone number."""
+        mock_result = MagicMock()
+        mock_result.scalar_one_or_none.return_value = sample_user
+        mock_db_session.execute.return_value = mock_result
+        
+        crud = UserCRUD(User)
+        result = await crud.create_if_not_exists(
+            mock_db_session, {"phone_number": "+919876543210", "location": "Mumbai"}
+        )
+        
+        assert result == sample_user
+        mock_db_session.execute.assert_called_once()
+        mock_db_session.commit.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_create_if_not_exists_conflict(self, mock_db_session):
+        """Test that an already registered phone number returns None."""
+        mock_result = MagicMock()
+        mock_result.scalar_one_or_none.return_value = None
+        mock_db_session.execute.return_value = mock_result
+        
+        crud = UserCRUD(User)
+        result = await crud.create_if_not_exists(
+            mock_db_session, {"phone_number": "+919876543210", "location": "Mumbai"}
+        )
+        
+        assert result is None
+        mock_db_session.execute.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_bulk_update_last_active(self, mock_db_session):
+        """Test batching last_active updates into one statement."""
+        mock_result = MagicMock()
+        mock_result.rowcount = 2
+        mock_db_session.execute.return_value = mock_result
+        
+        now = datetime.now(timezone.utc)
+        crud = UserCRUD(User)
+        result = await crud.bulk_update_last_active(
+            mock_db_session, {uuid4(): now, uuid4(): now}
+        )
+        
+        assert result == 2
+        mock_db_session.execute.assert_called_once()
+        mock_db_session.commit.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_bulk_update_last_active_empty(self, mock_db_session):
+        """Test that an empty batch does not touch the database."""
+        crud = UserCRUD(User)
+        result = await crud.bulk_update_last_active(mock_db_session, {})
+        
+        assert result == 0
+        mock_db_session.execute.assert_not_called()
+    
     def test_global_user_crud_instance(self):
         """Test that global user_crud instance is properly initialized."""
         assert isinstance(user_crud, UserCRUD)
@@ -166,6 +226,66 @@ class TestVendorCRUD:
         crud = VendorCRUD(Vendor)
         assert crud.model == Vendor
     
+    @pytest.mark.asyncio
+    async def test_create_if_not_exists_binds_vendor_defaults(self, mock_db_session, sample_vendor):
+        """Test that the vendors INSERT binds every NOT NULL column the caller left out."""
+        mock_result = MagicMock()
+        mock_result.scalar_one_or_none.return_value = sample_vendor.id
+        mock_db_session.execute.return_value = mock_result
+        mock_db_session.get.return_value = sample_vendor
+        
+        crud = VendorCRUD(Vendor)
+        result = await crud.create_if_not_exists(
+            mock_db_session,
+            {
+                "phone_number": "+919876543210",
+                "location": "Chennai",
+                "user_type": "vendor",
+                "business_name": "Tamil Spices Co.",
+                "business_type": BusinessType.SMALL_BUSINESS,
+            }
+        )
+        
+        assert result == sample_vendor
+        mock_db_session.commit.assert_called_once()
+        
+        stmt = mock_db_session.execute.call_args.args[0]
+        compiled = stmt.compile(dialect=postgresql.dialect())
+        sql = compiled.string
+        vendor_columns = sql[sql.index("INSERT INTO vendors"):].split("(", 1)[1].split(")", 1)[0]
+        for column in Vendor.__table__.c:
+            if not column.nullable:
+                assert column.name in vendor_columns
+        
+        # Parameters not filled in at execution time must be bound up front
+        prefetched = {bind.key for bind in compiled.insert_prefetch}
+        unbound = [
+            key for key, value in compiled.construct_params().items()
+            if value is None and key not in prefetched
+        ]
+        assert unbound == []
+    
+    @pytest.mark.asyncio
+    async def test_create_if_not_exists_conflict(self, mock_db_session):
+        """Test vendor creation when the phone number is already registered."""
+        mock_result = MagicMock()
+        mock_result.scalar_one_or_none.return_value = None
+        mock_db_session.execute.return_value = mock_result
+        
+        crud = VendorCRUD(Vendor)
+        result = await crud.create_if_not_exists(
+            mock_db_session,
+            {
+                "phone_number": "+919876543210",
+                "location": "Chennai",
+                "business_name": "Tamil Spices Co.",
+                "business_type": BusinessType.SMALL_BUSINESS,
+            }
+        )
+        
+        assert result is None
+        mock_db_session.get.assert_not_called()
+    
     @pytest.mark.asyncio
     async def test_get_by_business_name(self, mock_db_session, sample_vendor):
         """Test getting vendor by business name."""
@@ -378,4 +498,72 @@ class TestCRUDIntegration:
         assert hasattr(vendor_crud, 'get')
         assert hasattr(vendor_crud, 'create')
         assert hasattr(vendor_crud, 'update')
-        assert hasattr(vendor_crud, 'remove')
\ No newline at end of file
+        assert hasattr(vendor_crud, 'remove')
+
+class TestCRUDBaseCount:
+    """Test estimated and exact record counts."""
+    
+    @staticmethod
+    def make_db(dialect, *scalars):
+        """Mock session on ``dialect`` whose queries return ``scalars`` in order."""
+        db = AsyncMock()
+        db.get_bind = MagicMock(return_value=MagicMock(**{"dialect.name": dialect}))
+        results = []
+        for value in scalars:
+            result = MagicMock()
+            result.scalar.return_value = value
+            results.append(result)
+        db.execute.side_effect = results
+        return db
+    
+    @pytest.mark.asyncio
+    async def test_count_uses_planner_estimate_on_postgres(self):
+        """Test that the default count reads pg_class instead of scanning."""
+        db = self.make_db("postgresql", 1234)
+        
+        assert await user_crud.count(db) == 1234
+        assert db.execute.call_count == 1
+        assert db.execute.call_args.args[1] == {"table": "users"}
+    
+    @pytest.mark.asyncio
+    async def test_count_exact(self):
+        """Test that exact=True always runs COUNT."""
+        db = self.make_db("postgresql", 42)
+        
+        assert await vendor_crud.count(db, exact=True) == 42
+        assert "count" in str(db.execute.call_args.args[0]).lower()
+    
+    @pytest.mark.asyncio
+    async def test_count_falls_back_when_table_never_analyzed(self):
+        """Test that a -1 estimate falls back to an exact count."""
+        db = self.make_db("postgresql", -1, 7)
+        
+        assert await vendor_crud.count(db) == 7
+        assert db.execute.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_count_exact_on_other_databases(self):
+        """Test that non-PostgreSQL databases get an exact count."""
+        db = self.make_db("sqlite", 3)
+        
+        assert await user_crud.count(db) == 3
+        assert db.execute.call_count == 1
+
+
+class TestCRUDBaseExists:
+    """Test record existence checks."""
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("found", [True, False])
+    async def test_exists_selects_exists(self, found):
+        """Test that exists() runs a single SELECT EXISTS query."""
+        db = AsyncMock()
+        result = MagicMock()
+        result.scalar.return_value = found
+        db.execute.return_value = result
+        user_id = uuid4()
+        
+        assert await user_crud.exists(db, user_id) is found
+        stmt, params = db.execute.call_args.args
+        assert "EXISTS" in str(stmt)
+        assert params == {"id": user_id}
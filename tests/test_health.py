@@ -9,6 +9,8 @@ import pytest
 from fastapi.testclient import TestClient
 from httpx import AsyncClient
 
+from mandi_platform.api.health import _check_component
+from mandi_platform.database import DatabaseManager
 from mandi_platform.main import app
 
 
@@ -73,4 +75,20 @@ async def test_health_with_dependencies(test_client: AsyncClient):
     services = data["services"]
     assert services["database"]["status"] == "healthy"
     assert services["redis"]["status"] == "healthy"
-    assert services["elasticsearch"]["status"] == "healthy"
\ No newline at end of file
+    assert services["elasticsearch"]["status"] == "healthy"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_database_ping_failure_reports_error(tmp_path):
+    """Test that a failed database ping surfaces its error in the component health."""
+    db_manager = DatabaseManager(f"sqlite+aiosqlite:///{tmp_path}/missing/mandi.db", test_mode=True)
+    
+    try:
+        name, health = await _check_component("database", db_manager.ping, {})
+    finally:
+        await db_manager.close()
+    
+    assert name == "database"
+    assert health.status == "unhealthy"
+    assert "unable to open database file" in health.details["error"]
@@ -6,10 +6,12 @@ validation, relationships, and business logic.
 """
 
 import pytest
+import time
 from decimal import Decimal
 from datetime import datetime
-from uuid import uuid4
+from uuid import RFC_4122, uuid4
 
+from mandi_platform.models.base import uuid7
 from mandi_platform.models.user import User, Vendor
 from mandi_platform.models.enums import (
     LanguageCode,
@@ -349,4 +351,24 @@ class TestEnums:
             PaymentMethod.BANK_TRANSFER, PaymentMethod.DIGITAL_WALLET
         }
         for method in key_methods:
-            assert method in PaymentMethod
\ No newline at end of file
+            assert method in PaymentMethod
+
+class TestUUID7:
+    """Test cases for time-ordered primary key generation."""
+    
+    def test_uuid7_version_and_variant(self):
+        """Test that generated UUIDs are RFC 9562 version 7."""
+        value = uuid7()
+        assert value.version == 7
+        assert value.variant == RFC_4122
+    
+    def test_uuid7_time_ordered(self):
+        """Test that UUIDs generated in later milliseconds sort later."""
+        first = uuid7()
+        time.sleep(0.002)
+        second = uuid7()
+        assert first < second
+    
+    def test_user_default_id_is_uuid7(self):
+        """Test that the primary key default uses uuid7."""
+        assert User.__table__.c.id.default.arg.__name__ == "uuid7"
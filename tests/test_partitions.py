@@ -0,0 +1,124 @@
+"""
+Unit tests for price_history partition maintenance.
+"""
+
+from contextlib import asynccontextmanager
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from mandi_platform import partitions
+
+
+def make_database(dialect, existing=()):
+    """Mock DatabaseManager whose engine reports ``existing`` partitions."""
+    conn = AsyncMock()
+    conn.scalar.side_effect = lambda stmt, params: params["name"] if params["name"] in existing else None
+    
+    @asynccontextmanager
+    async def begin():
+        yield conn
+    
+    engine = MagicMock()
+    engine.dialect.name = dialect
+    engine.begin = begin
+    
+    database_manager = MagicMock()
+    database_manager.engine = engine
+    return database_manager, conn
+
+
+def executed_sql(conn):
+    """SQL text of every statement run on ``conn``."""
+    return [str(c.args[0]) for c in conn.execute.call_args_list]
+
+
+class FixedDate(date):
+    """date whose today() is 2026-11-15."""
+    
+    @classmethod
+    def today(cls):
+        return cls(2026, 11, 15)
+
+
+@pytest.mark.unit
+class TestUpcomingMonths:
+    """Test the month range partitions are created for."""
+    
+    def test_starts_at_current_month(self):
+        """The month of ``start`` comes first."""
+        assert partitions.upcoming_months(date(2026, 5, 31), 0) == [(2026, 5)]
+    
+    def test_wraps_into_next_year(self):
+        """December is followed by January of the next year."""
+        assert partitions.upcoming_months(date(2026, 11, 1), 3) == [
+            (2026, 11), (2026, 12), (2027, 1), (2027, 2),
+        ]
+
+
+@pytest.mark.unit
+class TestEnsurePriceHistoryPartitions:
+    """Test ensure_price_history_partitions."""
+    
+    @pytest.mark.asyncio
+    async def test_skips_non_postgresql(self):
+        """Partitioning only exists on PostgreSQL."""
+        database_manager, conn = make_database("sqlite")
+        
+        with patch.object(partitions, "get_database_manager", return_value=database_manager):
+            assert await partitions.ensure_price_history_partitions(2) == []
+        
+        conn.execute.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_creates_only_missing_months(self):
+        """Existing partitions are left alone; missing ones are created and attached."""
+        database_manager, conn = make_database("postgresql", existing={"price_history_2026_11"})
+        
+        with patch.object(partitions, "get_database_manager", return_value=database_manager), \
+             patch.object(partitions, "date", FixedDate):
+            created = await partitions.ensure_price_history_partitions(2)
+        
+        assert created == ["price_history_2026_12", "price_history_2027_01"]
+        statements = executed_sql(conn)
+        assert not any("CREATE TABLE price_history_2026_11" in sql for sql in statements)
+        assert any(
+            "ATTACH PARTITION price_history_2026_12 FOR VALUES FROM ('2026-12-01') TO ('2027-01-01')" in sql
+            for sql in statements
+        )
+        assert any(
+            "ATTACH PARTITION price_history_2027_01 FOR VALUES FROM ('2027-01-01') TO ('2027-02-01')" in sql
+            for sql in statements
+        )
+    
+    @pytest.mark.asyncio
+    async def test_moves_default_rows_before_attaching(self):
+        """Rows already in the default partition move into the new one, under the lock."""
+        database_manager, conn = make_database("postgresql")
+        
+        with patch.object(partitions, "get_database_manager", return_value=database_manager), \
+             patch.object(partitions, "date", FixedDate):
+            await partitions.ensure_price_history_partitions(0)
+        
+        statements = executed_sql(conn)
+        assert "pg_advisory_xact_lock" in statements[0]
+        assert statements[1].startswith("CREATE TABLE price_history_2026_11 (LIKE price_history")
+        assert "DELETE FROM price_history_default" in statements[2]
+        assert "INSERT INTO price_history_2026_11" in statements[2]
+        assert "ATTACH PARTITION price_history_2026_11" in statements[3]
+        assert conn.execute.call_args_list[2].args[1] == {
+            "start": date(2026, 11, 1), "end": date(2026, 12, 1),
+        }
+    
+    @pytest.mark.asyncio
+    async def test_defaults_to_configured_months_ahead(self):
+        """Without an argument the configured horizon is used."""
+        database_manager, conn = make_database("postgresql")
+        
+        with patch.object(partitions, "get_database_manager", return_value=database_manager), \
+             patch.object(partitions, "date", FixedDate), \
+             patch.object(partitions.settings, "price_history_partitions_ahead", 1):
+            created = await partitions.ensure_price_history_partitions()
+        
+        assert created == ["price_history_2026_11", "price_history_2026_12"]
@@ -0,0 +1,91 @@
+"""
+Unit tests for product API routing.
+
+These tests mount the products router on its own app with the database and
+vendor dependencies overridden, so they exercise request routing and
+parameter handling without a database, Redis or Elasticsearch.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from mandi_platform.api import products as products_api
+from mandi_platform.auth.dependencies import require_vendor_auth
+from mandi_platform.database import get_db_session
+
+
+def empty_stream(*args, **kwargs):
+    """Async product stream yielding nothing."""
+    async def stream():
+        return
+        yield
+    return stream()
+
+
+async def uncached(key, compute, ttl):
+    """get_or_set stand-in that always computes."""
+    return await compute()
+
+
+@pytest.fixture
+def vendor():
+    """Authenticated vendor returned by require_vendor_auth."""
+    return MagicMock(id=uuid4())
+
+
+@pytest.fixture
+def client(vendor):
+    """Client for an app serving only the products router."""
+    app = FastAPI()
+    app.include_router(products_api.router, prefix="/api")
+    app.dependency_overrides[get_db_session] = lambda: AsyncMock()
+    app.dependency_overrides[require_vendor_auth] = lambda: vendor
+    return TestClient(app)
+
+
+@pytest.fixture
+def crud():
+    """ProductCRUD instance used by the endpoints, with empty streams."""
+    crud = MagicMock()
+    crud.iter_featured_products.side_effect = empty_stream
+    crud.iter_low_stock_products.side_effect = empty_stream
+    with patch.object(products_api, "ProductCRUD", return_value=crud):
+        yield crud
+
+
+@pytest.mark.unit
+class TestStaticProductRoutes:
+    """Static /products/... paths must not be captured by /products/{product_id}."""
+    
+    def test_featured_products(self, client, crud):
+        """/products/featured reaches the featured endpoint."""
+        category_id = uuid4()
+        
+        with patch.object(products_api, "get_or_set", side_effect=uncached):
+            response = client.get(
+                "/api/products/featured", params={"limit": 5, "category_id": str(category_id)}
+            )
+        
+        assert response.status_code == 200
+        assert response.json() == []
+        crud.iter_featured_products.assert_called_once_with(limit=5, category_id=category_id)
+    
+    def test_low_stock_products(self, client, crud, vendor):
+        """/products/low-stock reaches the vendor's low-stock endpoint."""
+        response = client.get("/api/products/low-stock", params={"threshold": "3"})
+        
+        assert response.status_code == 200
+        assert response.json() == []
+        crud.iter_low_stock_products.assert_called_once()
+        assert crud.iter_low_stock_products.call_args.kwargs["vendor_id"] == vendor.id
+        assert crud.iter_low_stock_products.call_args.kwargs["threshold"] == 3
+    
+    def test_product_id_still_validated(self, client, crud):
+        """Other non-UUID paths are still rejected by /products/{product_id}."""
+        response = client.get("/api/products/not-a-uuid")
+        
+        assert response.status_code == 422
@@ -161,18 +161,20 @@ class TranslationCacheFactory(factory.DictFactory):
 
 async def create_test_vendor(db_session) -> Any:
     """Create a test vendor in the database."""
-    from src.mandi_platform.models import Vendor, BusinessType, LanguageCode
-    from src.mandi_platform.crud.user import UserCRUD
+    from src.mandi_platform.models import BusinessType, LanguageCode
+    from src.mandi_platform.crud.user import vendor_crud
     
-    user_crud = UserCRUD(db_session)
     vendor_data = VendorDataFactory()
     
-    vendor = await user_crud.create_vendor(
-        phone_number=vendor_data['phone_number'],
-        preferred_language=LanguageCode(vendor_data['preferred_language']),
-        location=f"{vendor_data['location']['city']}, {vendor_data['location']['state']}",
-        business_name=vendor_data['business_name'],
-        business_type=BusinessType.SMALL_BUSINESS,
+    vendor = await vendor_crud.create(
+        db_session,
+        obj_in={
+            "phone_number": vendor_data['phone_number'],
+            "preferred_language": LanguageCode(vendor_data['preferred_language']),
+            "location": f"{vendor_data['location']['city']}, {vendor_data['location']['state']}",
+            "business_name": vendor_data['business_name'],
+            "business_type": BusinessType.SMALL_BUSINESS,
+        },
     )
     
     return vendor